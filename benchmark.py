@@ -0,0 +1,157 @@
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent_relations_manager import ConcurrentRelationsManager
+from employee_manager import EmployeeManager
+from org_generator import TEAM_SIZE_DISTRIBUTIONS, generate_org
+
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_SAMPLES = 10_000
+
+
+def _timed(name: str, size: int, operations: int, function) -> dict:
+    started = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - started
+
+    return {"benchmark": name, "size": size, "operations": operations, "seconds": seconds,
+            "ns_per_op": seconds / operations * 1e9 if operations else 0.0}
+
+
+def run_benchmarks(size: int, team_size: int = 8, distribution: str = "fixed", seed: int = 0,
+                   samples: int = DEFAULT_SAMPLES, payroll_limit: int = None) -> list:
+    relations_manager = generate_org(size, team_size, distribution, seed)
+    employee_manager = EmployeeManager(relations_manager)
+    employees = relations_manager.get_all_employees()
+
+    # Spread the sampled employees evenly over the org so leaders and members both show up.
+    step = max(1, size // samples) if samples else 1
+    sample = [employees[row] for row in range(0, size, step)][:samples]
+    leaders = [relations_manager.get_employee(leader_id) for leader_id in list(relations_manager.teams)[:samples]]
+    payroll = employees if payroll_limit is None else employees[:payroll_limit]
+
+    # Moves the first member of each sampled team to the next one; every move publishes a new version.
+    concurrent_manager = ConcurrentRelationsManager(relations_manager.copy())
+    moves = [(relations_manager.teams[a.id][0], b.id) for a, b in zip(leaders, leaders[1:])
+             if relations_manager.teams[a.id]]
+
+    def concurrent_writes():
+        for member_id, new_leader_id in moves:
+            concurrent_manager.move_team_member(member_id, new_leader_id)
+
+    def payroll_flow():
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for employee in payroll:
+                employee_manager.calculate_salary_and_send_email(employee)
+
+    return [
+        _timed("is_leader", size, len(sample), lambda: [relations_manager.is_leader(e) for e in sample]),
+        _timed("get_team_members", size, len(leaders), lambda: [relations_manager.get_team_members(e) for e in leaders]),
+        _timed("calculate_salary", size, len(sample), lambda: [employee_manager.calculate_salary(e) for e in sample]),
+        _timed("calculate_salaries", size, size, lambda: employee_manager.calculate_salaries(employees)),
+        _timed("payroll_flow", size, len(payroll), payroll_flow),
+        _timed("concurrent_move_team_member", size, len(moves), concurrent_writes),
+    ]
+
+
+def run_startup_benchmark(size: int, runs: int = 20, seed: int = 0) -> list:
+    # Cold start of `cli.py salary` against a snapshot of a generated org, next to the
+    # start-up time of a bare interpreter. Each run is a fresh process; bytecode goes to a
+    # private cache that an untimed first run fills, as it would be in a deployment.
+    cli = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "org.snap")
+        generate_org(size, seed=seed).save_snapshot(snapshot_path)
+        environment = {name: value for name, value in os.environ.items() if name != "PYTHONDONTWRITEBYTECODE"}
+        environment["PYTHONPYCACHEPREFIX"] = os.path.join(directory, "pycache")
+
+        def median_seconds(command):
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL, env=environment)
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                subprocess.run(command, check=True, stdout=subprocess.DEVNULL, env=environment)
+                timings.append(time.perf_counter() - started)
+            return statistics.median(timings)
+
+        interpreter = median_seconds([sys.executable, "-c", "pass"])
+        salary_lookup = median_seconds([sys.executable, cli, "salary", str(size // 2), "--snapshot", snapshot_path])
+
+    return [
+        {"benchmark": "interpreter_startup", "size": size, "operations": 1, "seconds": interpreter,
+         "ns_per_op": interpreter * 1e9},
+        {"benchmark": "cli_salary_startup", "size": size, "operations": 1, "seconds": salary_lookup,
+         "ns_per_op": salary_lookup * 1e9},
+    ]
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> list:
+    # Benchmarks whose ns_per_op grew by more than `threshold` (0.1 = 10%) against the baseline.
+    baseline_results = {(r["benchmark"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        previous = baseline_results.get((result["benchmark"], result["size"]))
+        if previous and previous["ns_per_op"] and result["ns_per_op"] > previous["ns_per_op"] * (1 + threshold):
+            regressions.append({"benchmark": result["benchmark"], "size": result["size"],
+                                "baseline_ns_per_op": previous["ns_per_op"], "ns_per_op": result["ns_per_op"],
+                                "ratio": result["ns_per_op"] / previous["ns_per_op"]})
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Payroll benchmarks on synthetic organisations.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--team-size", type=int, default=8)
+    parser.add_argument("--distribution", choices=TEAM_SIZE_DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument("--payroll-limit", type=int, default=None,
+                        help="only run the print based payroll flow for the first N employees")
+    parser.add_argument("--startup", action="store_true",
+                        help="also time cold starts of `cli.py salary` against a snapshot of each size")
+    parser.add_argument("--startup-runs", type=int, default=20)
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="report regressions against an earlier output file")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    report = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": {"team_size": args.team_size, "distribution": args.distribution, "seed": args.seed,
+                       "samples": args.samples, "payroll_limit": args.payroll_limit},
+        "results": [],
+    }
+    for size in args.sizes:
+        results = run_benchmarks(size, args.team_size, args.distribution, args.seed, args.samples, args.payroll_limit)
+        if args.startup:
+            results += run_startup_benchmark(size, args.startup_runs, args.seed)
+        for result in results:
+            report["results"].append(result)
+            print(f"{result['benchmark']:>20} {size:>10} {result['ns_per_op']:>14.1f} ns/op")
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(json.load(file), report, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['benchmark']} size={regression['size']}: {regression['ratio']:.2f}x slower")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
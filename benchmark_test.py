@@ -0,0 +1,61 @@
+import json
+
+import benchmark
+
+
+def test_run_benchmarks_reports_every_operation():
+    """
+    Test that a small benchmark run times every operation of the payroll flow.
+    """
+    results = benchmark.run_benchmarks(500, team_size=4, samples=100)
+
+    assert [r["benchmark"] for r in results] == [
+        "is_leader", "get_team_members", "calculate_salary", "calculate_salaries", "payroll_flow",
+        "concurrent_move_team_member"]
+    assert all(r["size"] == 500 and r["seconds"] >= 0 for r in results)
+    assert results[0]["operations"] == 100
+    assert results[-2]["operations"] == 500
+
+
+def test_main_writes_json_and_compares(tmp_path, capsys):
+    """
+    Test that the command line entry point writes a JSON report and reports
+    regressions against a baseline with a faster result.
+    """
+    output = tmp_path / "current.json"
+    assert benchmark.main(["--sizes", "200", "--samples", "50", "--output", str(output)]) == 0
+
+    report = json.loads(output.read_text())
+    assert report["parameters"]["samples"] == 50
+    assert len(report["results"]) == 6
+
+    baseline = tmp_path / "baseline.json"
+    for result in report["results"]:
+        result["ns_per_op"] /= 100
+    baseline.write_text(json.dumps(report))
+
+    assert benchmark.main(["--sizes", "200", "--samples", "50", "--output", str(output),
+                           "--compare", str(baseline)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+
+
+def test_compare_ignores_improvements():
+    """
+    Test that faster results and unknown benchmarks are not reported as regressions.
+    """
+    baseline = {"results": [{"benchmark": "is_leader", "size": 10, "ns_per_op": 100.0}]}
+    current = {"results": [{"benchmark": "is_leader", "size": 10, "ns_per_op": 105.0},
+                           {"benchmark": "payroll_flow", "size": 10, "ns_per_op": 1.0}]}
+
+    assert benchmark.compare(baseline, current) == []
+
+
+def test_run_startup_benchmark_times_the_cli():
+    """
+    Test that the startup benchmark times both a bare interpreter and a cold
+    `cli.py salary` lookup in fresh processes.
+    """
+    results = benchmark.run_startup_benchmark(100, runs=1)
+
+    assert [r["benchmark"] for r in results] == ["interpreter_startup", "cli_salary_startup"]
+    assert all(r["size"] == 100 and r["seconds"] > 0 for r in results)
@@ -0,0 +1,113 @@
+import argparse
+import sys
+
+# Only argparse and sys are imported up front. Every subcommand imports what it needs,
+# so a single salary lookup never loads NumPy, asyncio or SQLite.
+
+
+def _date(value: str):
+    import datetime
+    return datetime.date.fromisoformat(value)
+
+
+def _open_snapshot(path):
+    from relations_manager import RelationsManager
+    return RelationsManager.open_snapshot(path)
+
+
+def salary(args) -> int:
+    from employee_manager import EmployeeManager
+
+    relations_manager = _open_snapshot(args.snapshot)
+    employee = relations_manager.get_employee(args.employee_id)
+    if employee is None:
+        print(f"No employee with id {args.employee_id}", file=sys.stderr)
+        return 1
+
+    print(EmployeeManager(relations_manager).calculate_salary(employee, args.as_of))
+    return 0
+
+
+def payroll(args) -> int:
+    from employee_manager import EmployeeManager, resolve_evaluation_date
+
+    relations_manager = _open_snapshot(args.snapshot)
+    if args.checkpoint:
+        from payroll_checkpoint import CheckpointError, CheckpointedPayroll
+        try:
+            CheckpointedPayroll(EmployeeManager(relations_manager), args.checkpoint).run(as_of=args.as_of)
+        except CheckpointError as error:
+            print(error, file=sys.stderr)
+            return 1
+        return 0
+
+    as_of = resolve_evaluation_date(args.as_of)
+    if args.workers > 1:
+        from payroll_runner import PayrollRunner
+        runner = PayrollRunner(snapshot_path=args.snapshot, workers=args.workers)
+        salaries = ((relations_manager.get_employee(employee_id), salary) for employee_id, salary in runner.run(as_of))
+    else:
+        salaries = EmployeeManager(relations_manager).iter_salaries(relations_manager.iter_employees(), as_of=as_of)
+
+    for employee, salary in salaries:
+        print(EmployeeManager.salary_message(employee, salary))
+    return 0
+
+
+def export(args) -> int:
+    import payroll_export
+    from employee_manager import EmployeeManager
+
+    employee_manager = EmployeeManager(_open_snapshot(args.snapshot))
+    payroll_export.export(employee_manager, args.output, args.format, as_of=args.as_of)
+    return 0
+
+
+def snapshot(args) -> int:
+    from relations_manager import RelationsManager
+
+    if args.source.endswith(".jsonl"):
+        relations_manager = RelationsManager.from_jsonl(args.source)
+    else:
+        relations_manager = RelationsManager.from_csv(args.source)
+    relations_manager.save_snapshot(args.output)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="payroll", description="Employee salary and payroll tools.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    salary_parser = subcommands.add_parser("salary", help="print the salary of one employee")
+    salary_parser.add_argument("employee_id", type=int)
+    salary_parser.set_defaults(handler=salary)
+
+    payroll_parser = subcommands.add_parser("payroll", help="run payroll and print every salary notification")
+    payroll_parser.add_argument("--workers", type=int, default=1)
+    payroll_parser.add_argument("--checkpoint", help="resumable run: log completed employees here and skip them on restart")
+    payroll_parser.set_defaults(handler=payroll)
+
+    export_parser = subcommands.add_parser("export", help="write every payslip to a CSV or columnar file")
+    export_parser.add_argument("output")
+    export_parser.add_argument("--format", choices=("csv", "columnar"), default="csv")
+    export_parser.set_defaults(handler=export)
+
+    for subparser in (salary_parser, payroll_parser, export_parser):
+        subparser.add_argument("--snapshot", required=True, help="snapshot file written by the snapshot subcommand")
+        subparser.add_argument("--as-of", type=_date, default=None, help="evaluation date (YYYY-MM-DD)")
+
+    snapshot_parser = subcommands.add_parser("snapshot", help="build a snapshot from a CSV or JSON Lines export")
+    snapshot_parser.add_argument("source")
+    snapshot_parser.add_argument("output")
+    snapshot_parser.set_defaults(handler=snapshot)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import csv
+import datetime
+import os
+import subprocess
+import sys
+import pytest # type: ignore
+
+import benchmark
+import cli
+from employee_loader import write_csv
+from employee_manager import EmployeeManager
+from relations_manager import RelationsManager
+
+
+AS_OF = datetime.date(2025, 3, 15)
+
+# A salary lookup may take at most this many times as long as starting a bare interpreter.
+STARTUP_BUDGET = 6
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    """
+    Saves the default relations data to a snapshot file.
+
+    Returns:
+        str: The path of the snapshot file.
+    """
+    path = str(tmp_path / "org.snap")
+    RelationsManager().save_snapshot(path)
+    return path
+
+
+@pytest.fixture
+def expected_salaries():
+    """
+    Computes the salaries of the default relations data in memory.
+
+    Returns:
+        dict: Salaries keyed by employee id, evaluated on AS_OF.
+    """
+    relations_manager = RelationsManager()
+    employee_manager = EmployeeManager(relations_manager)
+    return {e.id: employee_manager.calculate_salary(e, AS_OF) for e in relations_manager.get_all_employees()}
+
+
+def test_salary_subcommand(snapshot_path, expected_salaries, capsys):
+    """
+    Test that the salary subcommand prints the salary of a single employee
+    and fails for an unknown id.
+    """
+    assert cli.main(["salary", "1", "--snapshot", snapshot_path, "--as-of", AS_OF.isoformat()]) == 0
+    assert capsys.readouterr().out.strip() == str(expected_salaries[1])
+
+    assert cli.main(["salary", "999", "--snapshot", snapshot_path]) == 1
+    assert "999" in capsys.readouterr().err
+
+
+def test_payroll_subcommand(snapshot_path, expected_salaries, capsys):
+    """
+    Test that the payroll subcommand prints one salary notification per employee.
+    """
+    assert cli.main(["payroll", "--snapshot", snapshot_path, "--as-of", AS_OF.isoformat()]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == len(expected_salaries)
+    assert lines[0] == EmployeeManager.salary_message(RelationsManager().get_employee(1), expected_salaries[1])
+
+
+def test_export_and_snapshot_subcommands(tmp_path, expected_salaries):
+    """
+    Test that a snapshot built from a CSV export by the snapshot subcommand
+    exports the same salaries as the in-memory data.
+    """
+    source = tmp_path / "org.csv"
+    snapshot_path = tmp_path / "org.snap"
+    output = tmp_path / "salaries.csv"
+    relations_manager = RelationsManager()
+    write_csv(source, relations_manager.get_all_employees(),
+              {member: leader for leader, members in relations_manager.teams.items() for member in members})
+
+    assert cli.main(["snapshot", str(source), str(snapshot_path)]) == 0
+    assert cli.main(["export", str(output), "--snapshot", str(snapshot_path), "--as-of", AS_OF.isoformat()]) == 0
+
+    with open(output, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert {int(row["id"]): int(row["salary"]) for row in rows} == expected_salaries
+
+
+def test_salary_lookup_does_not_import_heavy_modules(snapshot_path):
+    """
+    Test that a single salary lookup in a fresh interpreter never imports
+    NumPy, asyncio, SQLite, the loaders, the validator or the salary cache.
+    """
+    script = (
+        "import sys, cli\n"
+        f"cli.main(['salary', '1', '--snapshot', {snapshot_path!r}])\n"
+        "print(sorted(m for m in ('numpy', 'asyncio', 'sqlite3', 'csv', 'json', 'contextvars', 'employee_loader',\n"
+        "                         'team_validation', 'salary_cache') if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(cli.__file__)))
+
+    assert result.stdout.splitlines()[-1] == "[]"
+
+
+def test_salary_lookup_starts_within_budget():
+    """
+    Test that a cold `cli.py salary` lookup stays within STARTUP_BUDGET times
+    the start-up time of a bare interpreter, measured on the same machine.
+    """
+    results = {r["benchmark"]: r["seconds"] for r in benchmark.run_startup_benchmark(1_000, runs=7)}
+
+    assert results["cli_salary_startup"] < STARTUP_BUDGET * results["interpreter_startup"]
+
+
+def test_payroll_subcommand_refuses_finished_checkpoint(tmp_path, snapshot_path, capsys):
+    """
+    Test that a checkpointed payroll run prints every notification once and
+    that a rerun with the finished checkpoint is refused instead of silently
+    printing nothing.
+    """
+    checkpoint = str(tmp_path / "payroll.ckpt")
+    argv = ["payroll", "--snapshot", snapshot_path, "--as-of", AS_OF.isoformat(), "--checkpoint", checkpoint]
+
+    assert cli.main(argv) == 0
+    assert len(capsys.readouterr().out.splitlines()) == len(RelationsManager().get_all_employees())
+
+    assert cli.main(argv) == 1
+    output = capsys.readouterr()
+    assert output.out == ""
+    assert "finished payroll run" in output.err
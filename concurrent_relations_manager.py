@@ -0,0 +1,94 @@
+import contextlib
+import threading
+from employee import Employee
+from relations_manager import RelationsManager
+
+
+class ConcurrentRelationsManager:
+    # Copy-on-write wrapper for mixed read/write load. Readers use the currently published
+    # RelationsManager without taking a lock; writers are serialized, change a private copy
+    # and publish it with a single reference assignment, so a reader never sees teams and
+    # employee_list from different versions. Use snapshot() when several reads must agree,
+    # e.g. EmployeeManager(manager.snapshot()) for one salary request.
+    def __init__(self, relations_manager: RelationsManager = None):
+        self._current = relations_manager if relations_manager is not None else RelationsManager()
+        self._write_lock = threading.Lock()
+
+    def snapshot(self) -> RelationsManager:
+        return self._current
+
+    @contextlib.contextmanager
+    def batch(self):
+        # Applies several writes to one copy and publishes them together.
+        with self._write_lock:
+            working_copy = self._current.copy()
+            yield working_copy
+            self._current = working_copy
+
+    def _write(self, method: str, *args) -> None:
+        with self.batch() as working_copy:
+            getattr(working_copy, method)(*args)
+
+    @property
+    def teams(self) -> dict:
+        return self._current.teams
+
+    @property
+    def employee_list(self) -> list:
+        return self._current.employee_list
+
+    @property
+    def version(self) -> int:
+        return self._current.version
+
+    @property
+    def validation_report(self):
+        return self._current.validation_report
+
+    def is_leader(self, employee) -> bool:
+        return self._current.is_leader(employee)
+
+    def get_all_employees(self) -> list:
+        return self._current.get_all_employees()
+
+    def iter_employees(self):
+        return self._current.iter_employees()
+
+    def get_employee(self, employee_id: int) -> Employee:
+        return self._current.get_employee(employee_id)
+
+    def get_team_members(self, employee: Employee) -> list:
+        return self._current.get_team_members(employee)
+
+    def get_team_member_objects(self, leader: Employee) -> list:
+        return self._current.get_team_member_objects(leader)
+
+    def get_team_size(self, leader_id: int) -> int:
+        return self._current.get_team_size(leader_id)
+
+    def get_team_sizes(self) -> dict:
+        return self._current.get_team_sizes()
+
+    def team_version(self, leader_id: int) -> tuple:
+        return self._current.team_version(leader_id)
+
+    def changes_since(self, version: int):
+        return self._current.changes_since(version)
+
+    def add_employee(self, employee: Employee) -> None:
+        self._write("add_employee", employee)
+
+    def update_employee(self, employee: Employee) -> None:
+        self._write("update_employee", employee)
+
+    def remove_employee(self, employee_id: int) -> None:
+        self._write("remove_employee", employee_id)
+
+    def add_team_member(self, leader_id: int, member_id: int) -> None:
+        self._write("add_team_member", leader_id, member_id)
+
+    def remove_team_member(self, leader_id: int, member_id: int) -> None:
+        self._write("remove_team_member", leader_id, member_id)
+
+    def move_team_member(self, member_id: int, new_leader_id: int) -> None:
+        self._write("move_team_member", member_id, new_leader_id)
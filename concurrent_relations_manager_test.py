@@ -0,0 +1,143 @@
+import threading
+import pytest # type: ignore
+
+from concurrent_relations_manager import ConcurrentRelationsManager
+from employee_manager import EmployeeManager
+from relations_manager import RelationsManager
+
+
+@pytest.fixture
+def manager():
+    """
+    Creates a ConcurrentRelationsManager around the default RelationsManager data.
+
+    Returns:
+        ConcurrentRelationsManager: An instance of the ConcurrentRelationsManager class.
+    """
+    return ConcurrentRelationsManager(RelationsManager())
+
+
+def test_reads_delegate_to_current_version(manager):
+    """
+    Test that reads answer like a plain RelationsManager and that
+    EmployeeManager works on top of the concurrent manager.
+    """
+    leader = manager.get_employee(1)
+
+    assert manager.is_leader(leader) is True
+    assert manager.get_team_members(leader) == [2, 3]
+    assert len(manager.get_all_employees()) == 6
+    assert EmployeeManager(manager).calculate_salary(leader) == EmployeeManager(RelationsManager()).calculate_salary(leader)
+
+
+def test_snapshots_are_isolated_from_writes(manager):
+    """
+    Test that a snapshot taken before a write keeps seeing the old data while
+    new readers see the change.
+    """
+    before = manager.snapshot()
+
+    manager.move_team_member(2, 4)
+
+    assert before.teams == {1: [2, 3], 4: [5, 6]}
+    assert manager.teams == {1: [3], 4: [5, 6, 2]}
+    assert manager.changes_since(before.version) == {1, 2, 4}
+    assert manager.snapshot() is not before
+
+
+def test_batch_publishes_atomically_and_rolls_back(manager):
+    """
+    Test that batched writes are published together and that a failing batch
+    publishes nothing.
+    """
+    with manager.batch() as working_copy:
+        working_copy.remove_team_member(1, 2)
+        working_copy.add_team_member(4, 2)
+        assert manager.teams == {1: [2, 3], 4: [5, 6]}
+    assert manager.teams == {1: [3], 4: [5, 6, 2]}
+
+    with pytest.raises(KeyError):
+        with manager.batch() as working_copy:
+            working_copy.remove_team_member(1, 3)
+            working_copy.remove_team_member(1, 999)
+    assert manager.teams == {1: [3], 4: [5, 6, 2]}
+
+
+def test_no_torn_reads_under_concurrent_writes(manager):
+    """
+    Test that readers never see a torn state while writers keep moving members
+    between the two teams: in every snapshot, teams and the team member index
+    agree and every member belongs to exactly one team.
+    """
+    stop = threading.Event()
+    errors = []
+
+    def writer(member_id):
+        leaders = (1, 4)
+        moves = 0
+        while not stop.is_set() and moves < 300:
+            manager.move_team_member(member_id, leaders[moves % 2])
+            moves += 1
+
+    def reader():
+        for _ in range(2000):
+            snapshot = manager.snapshot()
+            members = [m for leader_id in (1, 4) for m in snapshot.get_team_members(snapshot.get_employee(leader_id))]
+            if sorted(members) != [2, 3, 5, 6] or sorted(sum(snapshot.teams.values(), [])) != [2, 3, 5, 6]:
+                errors.append(dict(snapshot.teams))
+
+    threads = [threading.Thread(target=writer, args=(member_id,)) for member_id in (2, 5)]
+    threads += [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads[2:]:
+        thread.join()
+    stop.set()
+    for thread in threads[:2]:
+        thread.join()
+
+    assert errors == []
+
+
+def test_writes_copy_only_what_they_touch():
+    """
+    Test that a published write shares every structure it did not change with
+    the previous version, so its cost does not grow with the org.
+
+    Verify:
+        - Untouched member lists, the employee list and the change log are shared.
+        - The two teams the member moved between were copied, and the old version
+          still sees them unchanged.
+        - A failed batch leaves the published change log usable.
+    """
+    from org_generator import generate_org
+
+    manager = ConcurrentRelationsManager(generate_org(2_000, team_size=5, seed=3))
+    before = manager.snapshot()
+    old_leader_id, new_leader_id, untouched_id = list(before.teams)[-3:]
+    member_id = next(m for m in before.teams[old_leader_id] if m not in before.teams)
+    old_members = list(before.teams[old_leader_id])
+
+    manager.move_team_member(member_id, new_leader_id)
+    after = manager.snapshot()
+
+    assert after.teams[untouched_id] is before.teams[untouched_id]
+    assert after._member_ids[untouched_id] is before._member_ids[untouched_id]
+    assert after.employee_list is before.employee_list
+    assert after._change_log is before._change_log
+    assert after.teams[old_leader_id] is not before.teams[old_leader_id]
+    assert before.teams[old_leader_id] == old_members
+    assert member_id not in before.teams[new_leader_id]
+    assert after.changes_since(before.version) == {member_id, old_leader_id, new_leader_id}
+
+    with pytest.raises(KeyError):
+        with manager.batch() as working_copy:
+            working_copy.remove_team_member(untouched_id, -1)
+            working_copy.update_employee(before.get_employee(-1))
+    with pytest.raises(KeyError):
+        with manager.batch() as working_copy:
+            working_copy.move_team_member(member_id, old_leader_id)
+            working_copy.remove_employee(-1)
+    manager.move_team_member(member_id, old_leader_id)
+    assert manager.changes_since(after.version) == {member_id, old_leader_id, new_leader_id}
+    assert after.changes_since(before.version) == {member_id, old_leader_id, new_leader_id}
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Employee:
     id: int
     first_name: str
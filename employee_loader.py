@@ -0,0 +1,105 @@
+import csv
+import datetime
+import itertools
+import json
+from employee import Employee
+
+
+# Column layout of HR exports; leader_id is empty for employees without a team lead.
+FIELDS = ("id", "first_name", "last_name", "birth_date", "base_salary", "hire_date", "leader_id")
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def parse_record(record: dict) -> tuple:
+    employee = Employee(
+        id=int(record["id"]),
+        first_name=record["first_name"],
+        last_name=record["last_name"],
+        birth_date=datetime.date.fromisoformat(record["birth_date"]),
+        base_salary=int(record["base_salary"]),
+        hire_date=datetime.date.fromisoformat(record["hire_date"]),
+    )
+    leader_id = record.get("leader_id")
+    leader_id = int(leader_id) if leader_id not in (None, "") else None
+
+    return employee, leader_id
+
+
+def chunked(iterable, chunk_size: int):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        yield chunk
+
+
+def iter_csv_records(path):
+    with open(path, newline="", encoding="utf-8") as file:
+        for record in csv.DictReader(file):
+            yield parse_record(record)
+
+
+def iter_jsonl_records(path):
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield parse_record(json.loads(line))
+
+
+def iter_csv_chunks(path, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    return chunked(iter_csv_records(path), chunk_size)
+
+
+def iter_jsonl_chunks(path, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    return chunked(iter_jsonl_records(path), chunk_size)
+
+
+def iter_records(path):
+    # Reads JSON Lines for .jsonl files and CSV for anything else.
+    return iter_jsonl_records(path) if str(path).endswith(".jsonl") else iter_csv_records(path)
+
+
+def count_team_sizes(records) -> dict:
+    # Leader id -> number of members, holding only one entry per leader.
+    team_sizes = {}
+    for _, leader_id in records:
+        if leader_id is not None:
+            team_sizes[leader_id] = team_sizes.get(leader_id, 0) + 1
+    return team_sizes
+
+
+def stream_salaries(path, chunk_size: int = DEFAULT_CHUNK_SIZE, as_of: datetime.date = None):
+    # Payroll straight from an export that does not fit in memory, in two passes over the
+    # file: the first counts team sizes, the second streams (employee, salary) pairs one
+    # chunk at a time. Memory grows with the number of leaders, not of employees.
+    from employee_manager import EmployeeManager
+    from relations_manager import RelationsManager
+
+    team_sizes = count_team_sizes(iter_records(path))
+    employees = (employee for employee, _ in iter_records(path))
+    return EmployeeManager(RelationsManager([], {})).iter_salaries(employees, chunk_size, as_of, team_sizes)
+
+
+def to_record(employee: Employee, leader_id=None) -> dict:
+    return {
+        "id": employee.id,
+        "first_name": employee.first_name,
+        "last_name": employee.last_name,
+        "birth_date": employee.birth_date.isoformat(),
+        "base_salary": employee.base_salary,
+        "hire_date": employee.hire_date.isoformat(),
+        "leader_id": leader_id,
+    }
+
+
+def write_csv(path, employees, leader_of: dict) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        for chunk in chunked(employees, DEFAULT_CHUNK_SIZE):
+            writer.writerows(to_record(e, leader_of.get(e.id, "")) for e in chunk)
+
+
+def write_jsonl(path, employees, leader_of: dict) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        for chunk in chunked(employees, DEFAULT_CHUNK_SIZE):
+            file.writelines(json.dumps(to_record(e, leader_of.get(e.id))) + "\n" for e in chunk)
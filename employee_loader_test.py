@@ -0,0 +1,158 @@
+import datetime
+import tracemalloc
+import pytest # type: ignore
+
+import employee_loader
+from employee import Employee
+from employee_manager import EmployeeManager
+from employee_table import EmployeeTable
+from relations_manager import RelationsManager
+
+
+def leader_of(teams):
+    """
+    Inverts a leader -> members mapping into a member -> leader mapping.
+
+    Args:
+        teams (dict): The teams mapping of a RelationsManager.
+
+    Returns:
+        dict: A mapping from member id to leader id.
+    """
+    return {member_id: leader_id for leader_id, member_ids in teams.items() for member_id in member_ids}
+
+
+def write_synthetic_csv(path, count):
+    """
+    Writes `count` synthetic employees to a CSV file, every tenth employee leading the next nine.
+
+    Args:
+        path: The file to write.
+        count (int): The number of employees.
+    """
+    employees = (
+        Employee(id=i, first_name=f"First{i % 50}", last_name=f"Last{i % 70}", base_salary=1000 + i % 500,
+                 birth_date=datetime.date(1970, 1, 1), hire_date=datetime.date(2000 + i % 20, 1, 1))
+        for i in range(count)
+    )
+    employee_loader.write_csv(path, employees, {i: i - i % 10 for i in range(count) if i % 10})
+
+
+@pytest.fixture
+def relations_manager():
+    """
+    Creates and returns an instance of the RelationsManager class.
+
+    Returns:
+        RelationsManager: An instance of the RelationsManager class.
+    """
+    return RelationsManager()
+
+
+@pytest.mark.parametrize("writer, loader", [
+    (employee_loader.write_csv, RelationsManager.from_csv),
+    (employee_loader.write_jsonl, RelationsManager.from_jsonl),
+])
+def test_round_trip(tmp_path, relations_manager, writer, loader):
+    """
+    Test that the default employees and teams survive a write and a load
+    through both the CSV and the JSON Lines format.
+
+    Verify:
+        - The loaded manager stores its employees in an EmployeeTable.
+        - Employees, teams and salaries match the original manager.
+    """
+    path = tmp_path / "employees"
+    writer(path, relations_manager.get_all_employees(), leader_of(relations_manager.teams))
+
+    loaded = loader(path, chunk_size=4)
+
+    assert isinstance(loaded.get_all_employees(), EmployeeTable)
+    assert list(loaded.iter_employees()) == relations_manager.get_all_employees()
+    assert loaded.teams == relations_manager.teams
+    assert (EmployeeManager(loaded).calculate_salaries(loaded.iter_employees())
+            == EmployeeManager(relations_manager).calculate_salaries(relations_manager.get_all_employees()))
+
+
+def test_iter_chunks_respects_chunk_size(tmp_path):
+    """
+    Test that the CSV reader yields chunks no larger than the requested size.
+    """
+    path = tmp_path / "employees.csv"
+    write_synthetic_csv(path, 25)
+
+    chunks = list(employee_loader.iter_csv_chunks(path, chunk_size=10))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert chunks[0][3][1] == 0  # employee 3 reports to leader 0
+
+
+def test_iter_salaries_streams_in_chunks(relations_manager):
+    """
+    Test that iter_salaries yields the same (employee, salary) pairs as the
+    scalar calculate_salary path, reading the input lazily.
+    """
+    employee_manager = EmployeeManager(relations_manager)
+
+    pairs = list(employee_manager.iter_salaries(relations_manager.iter_employees(), chunk_size=4))
+
+    assert [e for e, _ in pairs] == relations_manager.get_all_employees()
+    assert [s for _, s in pairs] == [employee_manager.calculate_salary(e) for e in relations_manager.get_all_employees()]
+
+
+def test_streaming_peak_memory_is_flat(tmp_path):
+    """
+    Test that two-pass payroll streaming straight from a file gives leaders
+    their team bonus and keeps peak memory flat.
+
+    Verify:
+        - Every streamed salary, leaders included, matches calculate_salary on
+          the fully loaded file.
+        - A file four times larger does not need noticeably more memory.
+    """
+    as_of = datetime.date(2025, 3, 15)
+
+    def peak_for(count):
+        path = tmp_path / f"employees_{count}.csv"
+        write_synthetic_csv(path, count)
+        loaded = RelationsManager.from_csv(path)
+        employee_manager = EmployeeManager(loaded)
+        expected = {e.id: employee_manager.calculate_salary(e, as_of) for e in loaded.iter_employees()}
+        # Also loads NumPy, so its one-time import does not count towards the first peak.
+        assert employee_manager.calculate_salaries(loaded.get_all_employees(), as_of=as_of) == list(expected.values())
+        leader_salaries = {leader_id: expected[leader_id] for leader_id in loaded.teams}
+        del loaded, employee_manager
+
+        tracemalloc.start()
+        try:
+            streamed = mismatches = leaders = 0
+            for employee, salary in employee_loader.stream_salaries(path, chunk_size=1000, as_of=as_of):
+                streamed += 1
+                mismatches += salary != expected[employee.id]
+                leaders += employee.id in leader_salaries
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert (streamed, mismatches, leaders) == (count, 0, count // 10)
+        return peak
+
+    small, large = peak_for(10_000), peak_for(40_000)
+    assert large < 1.5 * small
+
+
+def test_strict_load_rejects_dangling_leaders(tmp_path, relations_manager):
+    """
+    Test that a strict load raises TeamIntegrityError for rows pointing at an
+    unknown leader, while a lenient load keeps the data and reports the problem.
+    """
+    from team_validation import TeamIntegrityError
+
+    path = tmp_path / "employees.jsonl"
+    employee_loader.write_jsonl(path, relations_manager.get_all_employees(), {2: 1, 3: 1, 5: 42})
+
+    loaded = RelationsManager.from_jsonl(path)
+    assert loaded.validation_report.dangling_leaders == [42]
+
+    with pytest.raises(TeamIntegrityError):
+        RelationsManager.from_jsonl(path, strict=True)
@@ -1,19 +1,105 @@
+import contextlib
 import datetime
+from dataclasses import dataclass
 from employee import Employee
+from employee_table import EmployeeTable
 from relations_manager import RelationsManager
 
+# NumPy, asyncio, contextvars, the loaders and the notification pipeline are imported
+# where they are used, so single-salary lookups (e.g. from the command line) start
+# without loading them.
+
+
+# Holds the "evaluation_date" ContextVar once a date has been pinned; setdefault keeps a
+# single variable when threads race to create it.
+_CONTEXT_VARIABLES = {}
+
+# Ordinal of 1970-01-01, to turn stored date ordinals into numpy datetime64 days.
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+@contextlib.contextmanager
+def evaluation_date(as_of: datetime.date):
+    # Pins "today" for every salary computed in the block, so a run crossing midnight
+    # (or New Year's Eve) stays reproducible and historical payrolls can be rerun.
+    variable = _CONTEXT_VARIABLES.get("evaluation_date")
+    if variable is None:
+        import contextvars
+        variable = _CONTEXT_VARIABLES.setdefault("evaluation_date", contextvars.ContextVar("evaluation_date"))
+    token = variable.set(as_of)
+    try:
+        yield as_of
+    finally:
+        variable.reset(token)
+
+
+def resolve_evaluation_date(as_of: datetime.date = None) -> datetime.date:
+    if as_of is not None:
+        return as_of
+    variable = _CONTEXT_VARIABLES.get("evaluation_date")
+    pinned = variable.get(None) if variable is not None else None
+    return pinned if pinned is not None else datetime.date.today()
+
+
+@dataclass(frozen=True)
+class PayrollColumns:
+    # Date independent inputs of the salary formula, extracted once and reusable
+    # for any number of evaluation dates.
+    ids: "np.ndarray"
+    base_salaries: "np.ndarray"
+    hire_years: "np.ndarray"
+    team_members_counts: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+@dataclass(frozen=True)
+class SalaryComponents:
+    # Per-employee breakdown of the salary formula for one evaluation date.
+    ids: "np.ndarray"
+    base_salaries: "np.ndarray"
+    tenure_bonuses: "np.ndarray"
+    leader_bonuses: "np.ndarray"
+
+    @property
+    def salaries(self) -> "np.ndarray":
+        return self.base_salaries + self.tenure_bonuses + self.leader_bonuses
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
 
 class EmployeeManager:
     yearly_bonus = 100
     leader_bonus_per_member = 200
 
-    def __init__(self, relations_manager: RelationsManager):
+    def __init__(self, relations_manager: RelationsManager, salary_cache: "SalaryCache" = None):
         self.relations_manager = relations_manager
+        self.salary_cache = salary_cache
+
+    def _salary_fingerprint(self, employee: Employee, as_of: datetime.date) -> tuple:
+        # Everything calculate_salary depends on; any change makes the cached salary a miss.
+        return (employee.base_salary, employee.hire_date, self.relations_manager.team_version(employee.id),
+                EmployeeManager.yearly_bonus, EmployeeManager.leader_bonus_per_member, as_of.year)
+
+    def calculate_salary(self, employee: Employee, as_of: datetime.date = None) -> int:
+        as_of = resolve_evaluation_date(as_of)
+        if self.salary_cache is None:
+            return self._calculate_salary(employee, as_of)
+
+        fingerprint = self._salary_fingerprint(employee, as_of)
+        salary = self.salary_cache.get(employee.id, fingerprint)
+        if salary is None:
+            salary = self._calculate_salary(employee, as_of)
+            self.salary_cache.put(employee.id, fingerprint, salary)
+
+        return salary
 
-    def calculate_salary(self, employee: Employee) -> int:
+    def _calculate_salary(self, employee: Employee, as_of: datetime.date) -> int:
         salary = employee.base_salary
 
-        years_at_company = datetime.date.today().year - employee.hire_date.year
+        years_at_company = as_of.year - employee.hire_date.year
 
         salary += years_at_company * EmployeeManager.yearly_bonus
 
@@ -23,11 +109,112 @@ class EmployeeManager:
 
         return salary
 
-    def calculate_salary_and_send_email(self, employee: Employee) -> None:
-        salary = self.calculate_salary(employee)
+    def team_size_arrays(self, team_sizes: dict = None) -> tuple:
+        # Sorted leader ids and their team sizes. Chunked callers build this once and pass
+        # it as team_sizes, so the dict is not re-sorted for every chunk.
+        import numpy as np
+        if team_sizes is None:
+            team_sizes = self.relations_manager.get_team_sizes()
+        leader_ids = np.fromiter(team_sizes.keys(), dtype=np.int64, count=len(team_sizes))
+        sizes = np.fromiter(team_sizes.values(), dtype=np.int64, count=len(team_sizes))
+        order = np.argsort(leader_ids)
+        return leader_ids[order], sizes[order]
+
+    def payroll_columns(self, employees, team_sizes=None) -> PayrollColumns:
+        if isinstance(employees, PayrollColumns):
+            return employees
+        import numpy as np
+
+        if isinstance(employees, EmployeeTable):
+            # Zero-copy views of the table columns; hire years come straight from the ordinals.
+            ids = np.frombuffer(employees.ids, dtype=np.int64)
+            base_salaries = np.frombuffer(employees.base_salaries, dtype=np.int64)
+            hire_days = np.frombuffer(employees.hire_dates, dtype=np.int32).astype(np.int64) - _EPOCH_ORDINAL
+            hire_years = hire_days.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+        else:
+            employees = list(employees)
+            count = len(employees)
+            ids = np.fromiter((e.id for e in employees), dtype=np.int64, count=count)
+            base_salaries = np.fromiter((e.base_salary for e in employees), dtype=np.int64, count=count)
+            hire_years = np.fromiter((e.hire_date.year for e in employees), dtype=np.int64, count=count)
+
+        # Team sizes are looked up with one sorted search instead of a dict lookup per employee.
+        leader_ids, sizes = team_sizes if isinstance(team_sizes, tuple) else self.team_size_arrays(team_sizes)
+        team_members_counts = np.zeros(len(ids), dtype=np.int64)
+        if len(leader_ids):
+            positions = np.minimum(np.searchsorted(leader_ids, ids), len(leader_ids) - 1)
+            is_leader = leader_ids[positions] == ids
+            team_members_counts[is_leader] = sizes[positions[is_leader]]
+
+        return PayrollColumns(ids, base_salaries, hire_years, team_members_counts)
+
+    def salary_components(self, employees, team_sizes=None, as_of: datetime.date = None) -> SalaryComponents:
+        # Same formula as calculate_salary, evaluated column-wise for the whole batch.
+        # Callers running many batches can pass team_size_arrays() once as team_sizes, or
+        # pass the PayrollColumns of an earlier payroll_columns() call as employees.
+        columns = self.payroll_columns(employees, team_sizes)
+        years_at_company = resolve_evaluation_date(as_of).year - columns.hire_years
+
+        return SalaryComponents(columns.ids, columns.base_salaries,
+                                years_at_company * EmployeeManager.yearly_bonus,
+                                columns.team_members_counts * EmployeeManager.leader_bonus_per_member)
+
+    def calculate_salaries(self, employees, team_sizes=None, as_of: datetime.date = None) -> list:
+        return self.salary_components(employees, team_sizes, as_of).salaries.tolist()
+
+    def calculate_salaries_for_dates(self, employees, dates) -> list:
+        # One row of salaries per evaluation date, broadcast from a single column extraction.
+        import numpy as np
+        columns = self.payroll_columns(employees)
+        years = np.fromiter((as_of.year for as_of in dates), dtype=np.int64)
+        fixed = columns.base_salaries + columns.team_members_counts * EmployeeManager.leader_bonus_per_member
+        salaries = fixed + (years[:, None] - columns.hire_years) * EmployeeManager.yearly_bonus
+
+        return salaries.tolist()
 
-        print(f"{employee.first_name} {employee.last_name} your salary: {salary} has been transferred to you.")
+    def recalculate_since(self, version: int, as_of: datetime.date = None) -> dict:
+        # Salaries of the employees touched by RelationsManager changes after `version`.
+        changed_ids = self.relations_manager.changes_since(version)
+        if changed_ids is None:
+            columns = self.payroll_columns(self.relations_manager.get_all_employees())
+            return dict(zip(columns.ids.tolist(), self.calculate_salaries(columns, as_of=as_of)))
+
+        employees = (self.relations_manager.get_employee(employee_id) for employee_id in sorted(changed_ids))
+        return {e.id: self.calculate_salary(e, as_of) for e in employees if e is not None}
+
+    def iter_salaries(self, employees, chunk_size: int = None, as_of: datetime.date = None,
+                      team_sizes: dict = None):
+        # Streams (employee, salary) pairs, holding only one chunk of employees at a time
+        # (employee_loader.DEFAULT_CHUNK_SIZE by default). The evaluation date and team sizes
+        # are fixed up front so every chunk uses the same ones; pass team_sizes (leader id ->
+        # member count) when the employees do not come from the relations manager.
+        from employee_loader import DEFAULT_CHUNK_SIZE, chunked
+
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        as_of = resolve_evaluation_date(as_of)
+        team_sizes = self.team_size_arrays(team_sizes)
+        for chunk in chunked(employees, chunk_size):
+            yield from zip(chunk, self.calculate_salaries(chunk, team_sizes, as_of))
+
+    @staticmethod
+    def salary_message(employee: Employee, salary: int) -> str:
+        return f"{employee.first_name} {employee.last_name} your salary: {salary} has been transferred to you."
+
+    def calculate_salary_and_send_email(self, employee: Employee, as_of: datetime.date = None) -> None:
+        salary = self.calculate_salary(employee, as_of)
+
+        print(self.salary_message(employee, salary))
         pass
+
+    def send_salary_notifications(self, employees, pipeline: "NotificationPipeline",
+                                  as_of: datetime.date = None) -> "PipelineStats":
+        import asyncio
+        from notifications import Notification
+
+        notifications = (Notification(recipient=employee.id, body=self.salary_message(employee, salary))
+                         for employee, salary in self.iter_salaries(employees, as_of=as_of))
+
+        return asyncio.run(pipeline.run(notifications))
     
 def main():
     rm = RelationsManager()
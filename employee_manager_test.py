@@ -345,8 +345,8 @@ class TestEmployeeManager:
         years_at_company = 40
         expected_salary = old_employee.base_salary + (years_at_company * EmployeeManager.yearly_bonus)
 
-        # Execute
-        actual_salary = employee_manager.calculate_salary(old_employee)
+        # Execute (evaluated in 2025, when the employee had 40 years at the company)
+        actual_salary = employee_manager.calculate_salary(old_employee, as_of=datetime.date(2025, 3, 15))
 
         # Verify
         assert actual_salary == expected_salary
@@ -361,4 +361,219 @@ class TestEmployeeManager:
         """
         main()
         # Check that print was called at least once
-        assert mock_print.call_count > 0
\ No newline at end of file
+        assert mock_print.call_count > 0
+
+class TestBulkSalaryCalculation:
+    """
+    Test suite for the batch salary API of the EmployeeManager class.
+    This test suite includes the following tests:
+    - test_calculate_salaries_matches_scalar_path: Compares the batch results with calculate_salary.
+    - test_calculate_salaries_empty: Verifies that an empty batch returns an empty list.
+    Fixtures:
+    - employee_manager: An EmployeeManager backed by a real RelationsManager.
+    """
+
+    @pytest.fixture
+    def employee_manager(self):
+        """
+        Creates an EmployeeManager instance backed by the default RelationsManager data.
+
+        Returns:
+            EmployeeManager: An instance of the EmployeeManager class.
+        """
+        return EmployeeManager(RelationsManager())
+
+    def test_calculate_salaries_matches_scalar_path(self, employee_manager):
+        """
+        Test that calculate_salaries returns the same salaries, in the same order,
+        as calling calculate_salary for every employee one by one.
+        Args:
+            employee_manager (EmployeeManager): The employee manager instance.
+        Verify:
+            - The batch result equals the scalar results for leaders and non-leaders.
+            - The returned values are plain ints.
+        """
+        employees = employee_manager.relations_manager.get_all_employees()
+
+        salaries = employee_manager.calculate_salaries(employees)
+
+        assert salaries == [employee_manager.calculate_salary(e) for e in employees]
+        assert all(type(salary) is int for salary in salaries)
+
+    def test_calculate_salaries_empty(self, employee_manager):
+        """
+        Test that calculate_salaries handles an empty batch.
+        Args:
+            employee_manager (EmployeeManager): The employee manager instance.
+        """
+        assert employee_manager.calculate_salaries([]) == []
+
+
+class TestIncrementalRecalculation:
+    """
+    Test suite for EmployeeManager.recalculate_since.
+    This test suite includes the following tests:
+    - test_recalculate_only_affected_employees: A team move recalculates only the touched employees.
+    - test_recalculate_after_reindex: An unknown change recalculates everyone.
+    Fixtures:
+    - relations_manager: A real RelationsManager instance.
+    - employee_manager: An EmployeeManager backed by relations_manager.
+    """
+
+    @pytest.fixture
+    def relations_manager(self):
+        """
+        Creates and returns an instance of the RelationsManager class.
+
+        Returns:
+            RelationsManager: An instance of the RelationsManager class.
+        """
+        return RelationsManager()
+
+    @pytest.fixture
+    def employee_manager(self, relations_manager):
+        """
+        Creates an EmployeeManager backed by the relations_manager fixture.
+
+        Returns:
+            EmployeeManager: An instance of the EmployeeManager class.
+        """
+        return EmployeeManager(relations_manager)
+
+    def test_recalculate_only_affected_employees(self, employee_manager, relations_manager):
+        """
+        Test that moving a member between teams recalculates the old leader,
+        the new leader and the moved member, with up to date salaries.
+        Args:
+            employee_manager (EmployeeManager): The employee manager instance.
+            relations_manager (RelationsManager): The relations manager instance.
+        """
+        version = relations_manager.version
+        relations_manager.move_team_member(3, 4)
+
+        salaries = employee_manager.recalculate_since(version)
+
+        assert sorted(salaries) == [1, 3, 4]
+        assert salaries == {i: employee_manager.calculate_salary(relations_manager.get_employee(i)) for i in (1, 3, 4)}
+        assert employee_manager.recalculate_since(relations_manager.version) == {}
+
+    def test_recalculate_after_reindex(self, employee_manager, relations_manager):
+        """
+        Test that a reindex after direct edits recalculates every employee,
+        and that removed employees are left out of the result.
+        Args:
+            employee_manager (EmployeeManager): The employee manager instance.
+            relations_manager (RelationsManager): The relations manager instance.
+        """
+        version = relations_manager.version
+        relations_manager.remove_employee(6)
+        relations_manager.teams[1].append(5)
+        relations_manager.reindex()
+
+        salaries = employee_manager.recalculate_since(version)
+
+        assert sorted(salaries) == [1, 2, 3, 4, 5]
+        assert salaries[1] == employee_manager.calculate_salary(relations_manager.get_employee(1))
+
+
+class TestEvaluationDate:
+    """
+    Test suite for the explicit evaluation date of the salary APIs.
+    This test suite includes the following tests:
+    - test_as_of_parameter: Salaries are evaluated for the given date instead of today.
+    - test_evaluation_date_context: The context pins the date for every call in the block.
+    - test_payroll_columns_reused_for_many_dates: Many dates are evaluated from one column extraction.
+    - test_table_fast_path: EmployeeTable storage gives the same results as Employee objects.
+    Fixtures:
+    - relations_manager: A real RelationsManager instance.
+    - employee_manager: An EmployeeManager backed by relations_manager.
+    """
+
+    @pytest.fixture
+    def relations_manager(self):
+        """
+        Creates and returns an instance of the RelationsManager class.
+
+        Returns:
+            RelationsManager: An instance of the RelationsManager class.
+        """
+        return RelationsManager()
+
+    @pytest.fixture
+    def employee_manager(self, relations_manager):
+        """
+        Creates an EmployeeManager backed by the relations_manager fixture.
+
+        Returns:
+            EmployeeManager: An instance of the EmployeeManager class.
+        """
+        return EmployeeManager(relations_manager)
+
+    def test_as_of_parameter(self, employee_manager, relations_manager):
+        """
+        Test that as_of replaces today's date in the scalar and batch paths.
+        Args:
+            employee_manager (EmployeeManager): The employee manager instance.
+            relations_manager (RelationsManager): The relations manager instance.
+        """
+        john = relations_manager.get_employee(1)  # hired 1990, leads 2 members
+        as_of = datetime.date(2000, 12, 31)
+        expected = 3000 + 10 * EmployeeManager.yearly_bonus + 2 * EmployeeManager.leader_bonus_per_member
+
+        assert employee_manager.calculate_salary(john, as_of=as_of) == expected
+        assert employee_manager.calculate_salaries([john], as_of=as_of) == [expected]
+        assert employee_manager.recalculate_since(0, as_of=as_of) == {}
+
+    def test_evaluation_date_context(self, employee_manager, relations_manager):
+        """
+        Test that the evaluation_date context pins the date for every salary API
+        inside the block and is restored afterwards.
+        Args:
+            employee_manager (EmployeeManager): The employee manager instance.
+            relations_manager (RelationsManager): The relations manager instance.
+        """
+        from employee_manager import evaluation_date
+
+        employees = relations_manager.get_all_employees()
+        as_of = datetime.date(2010, 6, 1)
+        expected = [employee_manager.calculate_salary(e, as_of=as_of) for e in employees]
+
+        with evaluation_date(as_of):
+            assert [employee_manager.calculate_salary(e) for e in employees] == expected
+            assert [s for _, s in employee_manager.iter_salaries(employees)] == expected
+
+        assert [employee_manager.calculate_salary(e) for e in employees] != expected
+
+    def test_payroll_columns_reused_for_many_dates(self, employee_manager, relations_manager):
+        """
+        Test that precomputed payroll columns can be evaluated for many dates
+        in one pass with the same results as the scalar path.
+        Args:
+            employee_manager (EmployeeManager): The employee manager instance.
+            relations_manager (RelationsManager): The relations manager instance.
+        """
+        employees = relations_manager.get_all_employees()
+        columns = employee_manager.payroll_columns(employees)
+        dates = [datetime.date(year, 1, 1) for year in (2000, 2015, 2030)]
+
+        salaries = employee_manager.calculate_salaries_for_dates(columns, dates)
+
+        assert len(columns) == 6
+        assert salaries == [[employee_manager.calculate_salary(e, as_of=d) for e in employees] for d in dates]
+        assert employee_manager.calculate_salaries(columns, as_of=dates[1]) == salaries[1]
+
+    def test_table_fast_path(self, relations_manager):
+        """
+        Test that salaries computed straight from EmployeeTable columns match
+        the ones computed from Employee objects.
+        Args:
+            relations_manager (RelationsManager): The relations manager instance.
+        """
+        from employee_table import EmployeeTable
+
+        employees = relations_manager.get_all_employees()
+        table_manager = RelationsManager(EmployeeTable(employees), relations_manager.teams)
+        as_of = datetime.date(2024, 2, 29)
+
+        assert (EmployeeManager(table_manager).calculate_salaries(table_manager.get_all_employees(), as_of=as_of)
+                == EmployeeManager(relations_manager).calculate_salaries(employees, as_of=as_of))
@@ -0,0 +1,163 @@
+import array
+import datetime
+from employee import Employee
+
+
+class StringPool:
+    def __init__(self):
+        self._strings = []
+        self._indexes = {}
+
+    def add(self, value: str) -> int:
+        index = self._indexes.get(value)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(value)
+            self._indexes[value] = index
+        return index
+
+    def __getitem__(self, index: int) -> str:
+        return self._strings[index]
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+class EmployeeView:
+    # A read-only Employee look-alike that points at one row of an EmployeeTable.
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "EmployeeTable", row: int):
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return self._table.ids[self._row]
+
+    @property
+    def first_name(self) -> str:
+        return self._table.names[self._table.first_names[self._row]]
+
+    @property
+    def last_name(self) -> str:
+        return self._table.names[self._table.last_names[self._row]]
+
+    @property
+    def birth_date(self) -> datetime.date:
+        return datetime.date.fromordinal(self._table.birth_dates[self._row])
+
+    @property
+    def base_salary(self) -> int:
+        return self._table.base_salaries[self._row]
+
+    @property
+    def hire_date(self) -> datetime.date:
+        return datetime.date.fromordinal(self._table.hire_dates[self._row])
+
+    def to_employee(self) -> Employee:
+        return Employee(id=self.id, first_name=self.first_name, last_name=self.last_name,
+                        birth_date=self.birth_date, base_salary=self.base_salary, hire_date=self.hire_date)
+
+    def _astuple(self) -> tuple:
+        return (self.id, self.first_name, self.last_name, self.birth_date, self.base_salary, self.hire_date)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (EmployeeView, Employee)):
+            return self._astuple() == (other.id, other.first_name, other.last_name,
+                                       other.birth_date, other.base_salary, other.hire_date)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(self.to_employee())
+
+
+class EmployeeTable:
+    # Struct-of-arrays employee storage: one typed array per field, dates as
+    # proleptic Gregorian ordinals and names as indexes into a shared StringPool.
+    def __init__(self, employees=()):
+        self.ids = array.array("q")
+        self.first_names = array.array("I")
+        self.last_names = array.array("I")
+        self.birth_dates = array.array("i")
+        self.base_salaries = array.array("q")
+        self.hire_dates = array.array("i")
+        self.names = StringPool()
+
+        self.extend(employees)
+
+    @classmethod
+    def from_columns(cls, ids, first_names, last_names, birth_dates, base_salaries, hire_dates, names) -> "EmployeeTable":
+        # Wraps existing column buffers (e.g. memoryviews over a snapshot) without copying them.
+        table = cls.__new__(cls)
+        table.ids = ids
+        table.first_names = first_names
+        table.last_names = last_names
+        table.birth_dates = birth_dates
+        table.base_salaries = base_salaries
+        table.hire_dates = hire_dates
+        table.names = names
+        return table
+
+    def copy(self) -> "EmployeeTable":
+        # Columns are copied; the append-only string pool is shared between the copies.
+        return EmployeeTable.from_columns(*(column[:] for column in self._columns()), names=self.names)
+
+    def append(self, employee) -> None:
+        self.ids.append(employee.id)
+        self.first_names.append(self.names.add(employee.first_name))
+        self.last_names.append(self.names.add(employee.last_name))
+        self.birth_dates.append(employee.birth_date.toordinal())
+        self.base_salaries.append(employee.base_salary)
+        self.hire_dates.append(employee.hire_date.toordinal())
+
+    def extend(self, employees) -> None:
+        for employee in employees:
+            self.append(employee)
+
+    def _columns(self) -> tuple:
+        return (self.ids, self.first_names, self.last_names, self.birth_dates, self.base_salaries, self.hire_dates)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [EmployeeView(self, i) for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("EmployeeTable index out of range")
+        return EmployeeView(self, row)
+
+    def __setitem__(self, row: int, employee) -> None:
+        self.ids[row] = employee.id
+        self.first_names[row] = self.names.add(employee.first_name)
+        self.last_names[row] = self.names.add(employee.last_name)
+        self.birth_dates[row] = employee.birth_date.toordinal()
+        self.base_salaries[row] = employee.base_salary
+        self.hire_dates[row] = employee.hire_date.toordinal()
+
+    def __delitem__(self, row: int) -> None:
+        for column in self._columns():
+            del column[row]
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield EmployeeView(self, row)
+
+    def remove(self, employee) -> None:
+        for row, employee_id in enumerate(self.ids):
+            if employee_id == employee.id:
+                del self[row]
+                return
+        raise ValueError(f"Employee with id {employee.id} not in table")
+
+    def nbytes(self) -> int:
+        # Size of the column buffers; the string pool is shared and reported separately.
+        return sum(column.itemsize * len(column) for column in self._columns())
+
+    def __repr__(self) -> str:
+        return f"EmployeeTable({len(self)} employees)"
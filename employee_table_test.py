@@ -0,0 +1,164 @@
+import datetime
+import tracemalloc
+import pytest # type: ignore
+
+from employee import Employee
+from employee_table import EmployeeTable, EmployeeView, StringPool
+from relations_manager import RelationsManager
+from employee_manager import EmployeeManager
+
+
+FIRST_NAMES = ["John", "Myrta", "Jettie", "Gretchen", "Tomas", "Scotty", "Ada", "Alan"]
+LAST_NAMES = ["Doe", "Torkelson", "Lynch", "Watford", "Andre", "Bomba", "Lovelace", "Turing"]
+
+
+def make_employees(count):
+    """
+    Generates `count` employees with realistic, repeating names.
+
+    Args:
+        count (int): The number of employees to generate.
+
+    Returns:
+        list: A list of freshly constructed Employee objects.
+    """
+    return [
+        Employee(
+            id=i,
+            # Copies, as a parser would produce, so names are not shared objects
+            first_name="".join(FIRST_NAMES[i % len(FIRST_NAMES)]),
+            last_name="".join(LAST_NAMES[i % len(LAST_NAMES)]),
+            base_salary=1000 + i,
+            birth_date=datetime.date(1960 + i % 40, 1 + i % 12, 1 + i % 28),
+            hire_date=datetime.date(1990 + i % 30, 1 + i % 12, 1 + i % 28),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def employees():
+    """
+    Creates a small list of employees.
+
+    Returns:
+        list: A list of 20 Employee objects.
+    """
+    return make_employees(20)
+
+
+@pytest.fixture
+def table(employees):
+    """
+    Creates an EmployeeTable holding the `employees` fixture.
+
+    Returns:
+        EmployeeTable: A table with 20 rows.
+    """
+    return EmployeeTable(employees)
+
+
+def test_string_pool_interns_values():
+    """
+    Test that the StringPool stores every distinct string once.
+    """
+    pool = StringPool()
+
+    assert pool.add("Doe") == pool.add("Doe")
+    assert pool.add("Lynch") == 1
+    assert len(pool) == 2
+    assert pool[1] == "Lynch"
+
+
+def test_table_views_round_trip(employees, table):
+    """
+    Test that the views handed out by the table expose the same data as the
+    original Employee objects.
+
+    Verify:
+        - Length, indexing and iteration match the source list.
+        - Views compare equal to the Employee objects and convert back to them.
+        - Negative indexes work and out of range indexes raise IndexError.
+    """
+    assert len(table) == len(employees)
+    assert list(table) == employees
+    assert isinstance(table[3], EmployeeView)
+    assert table[3].to_employee() == employees[3]
+    assert table[-1].id == employees[-1].id
+    assert table[3].hire_date == employees[3].hire_date
+
+    with pytest.raises(IndexError):
+        table[len(employees)]
+
+
+def test_table_remove(employees, table):
+    """
+    Test that removing an employee deletes its row from every column.
+    """
+    table.remove(employees[5])
+
+    assert len(table) == len(employees) - 1
+    assert [e.id for e in table] == [e.id for e in employees if e.id != 5]
+
+    with pytest.raises(ValueError):
+        table.remove(employees[5])
+
+
+def test_relations_manager_with_table_storage(employees, table):
+    """
+    Test that RelationsManager works on top of an EmployeeTable and that
+    salaries computed from it match the ones computed from plain Employee objects.
+    """
+    teams = {0: [1, 2, 3], 10: [11]}
+    table_manager = RelationsManager(table, teams)
+    list_manager = RelationsManager(employees, teams)
+
+    leader = table_manager.get_employee(0)
+    assert table_manager.is_leader(leader) is True
+    assert table_manager.get_team_members(leader) == [1, 2, 3]
+    assert [e.first_name for e in table_manager.get_team_member_objects(leader)] == ["Myrta", "Jettie", "Gretchen"]
+
+    table_manager.remove_employee(2)
+    list_manager.remove_employee(2)
+    assert table_manager.get_employee(3) == list_manager.get_employee(3)
+
+    table_salaries = EmployeeManager(table_manager).calculate_salaries(table_manager.get_all_employees())
+    list_salaries = EmployeeManager(list_manager).calculate_salaries(list_manager.get_all_employees())
+    assert table_salaries == list_salaries
+
+
+def test_memory_per_employee_drops_at_least_5x():
+    """
+    Benchmark the memory footprint of a list of Employee dataclasses against
+    an EmployeeTable holding the same rows.
+
+    Verify:
+        - The table uses at least 5 times less memory per employee.
+    """
+    count = 20_000
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        employee_list = make_employees(count)
+        list_bytes = tracemalloc.get_traced_memory()[0] - before
+
+        before = tracemalloc.get_traced_memory()[0]
+        table = EmployeeTable(employee_list)
+        table_bytes = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert len(table) == count
+    assert list_bytes / count >= 5 * (table_bytes / count)
+
+
+def test_table_copy_is_independent(employees, table):
+    """
+    Test that a copied table does not see rows removed from the original.
+    """
+    copy = table.copy()
+    table.remove(employees[0])
+
+    assert len(copy) == len(employees)
+    assert copy[0] == employees[0]
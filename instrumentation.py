@@ -0,0 +1,181 @@
+import bisect
+import contextlib
+import cProfile
+import functools
+import io
+import os
+import pstats
+import time
+from employee_manager import EmployeeManager
+from relations_manager import RelationsManager
+
+
+# Upper bounds of the latency histogram buckets, in seconds; the last bucket is +Inf.
+DEFAULT_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 1.0)
+
+DEFAULT_TARGETS = {
+    EmployeeManager: ("calculate_salary", "calculate_salary_and_send_email"),
+    RelationsManager: ("is_leader", "get_team_members"),
+}
+
+# Functions whose result tells whether the lookup found a leader: None or False is a miss.
+LOOKUP_FUNCTIONS = ("is_leader", "get_team_members")
+
+# (class, method name) -> the Instrumentation whose wrapper is installed there. Wrappers
+# patch the classes for the whole process, so every method has at most one owner.
+_installed = {}
+
+
+class FunctionStats:
+    __slots__ = ("calls", "total_seconds", "bucket_counts", "hits", "misses")
+
+    def __init__(self, bucket_count: int):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.bucket_counts = [0] * (bucket_count + 1)
+        self.hits = 0
+        self.misses = 0
+
+
+class Instrumentation:
+    # Wraps the hot-path methods only while enabled. Disabling puts the original
+    # functions back on the classes, so the disabled cost is exactly zero.
+    def __init__(self, targets: dict = None, buckets: tuple = DEFAULT_BUCKETS):
+        self.targets = targets if targets is not None else DEFAULT_TARGETS
+        self.buckets = tuple(buckets)
+        self._originals = {}
+        self._caches = {}
+        self.reset()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def reset(self) -> None:
+        self.stats = {name: FunctionStats(len(self.buckets))
+                      for names in self.targets.values() for name in names}
+
+    def register_cache(self, name: str, cache) -> None:
+        # Anything with a stats() dict, e.g. a SalaryCache, is exported alongside the call metrics.
+        self._caches[name] = cache
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+        targets = [(cls, name) for cls, names in self.targets.items() for name in names]
+        taken = [f"{cls.__name__}.{name}" for cls, name in targets if (cls, name) in _installed]
+        if taken:
+            raise RuntimeError(f"{', '.join(taken)} already instrumented by another Instrumentation; disable it first")
+        for cls, name in targets:
+            original = cls.__dict__[name]
+            self._originals[(cls, name)] = original
+            _installed[(cls, name)] = self
+            setattr(cls, name, self._wrap(name, original))
+
+    def disable(self) -> None:
+        for (cls, name), original in self._originals.items():
+            setattr(cls, name, original)
+            del _installed[(cls, name)]
+        self._originals.clear()
+
+    def _wrap(self, name: str, function):
+        stats = self.stats[name]
+        buckets = self.buckets
+        is_lookup = name in LOOKUP_FUNCTIONS
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = function(*args, **kwargs)
+            elapsed = time.perf_counter() - started
+
+            stats.calls += 1
+            stats.total_seconds += elapsed
+            stats.bucket_counts[bisect.bisect_left(buckets, elapsed)] += 1
+            if is_lookup:
+                if result is None or result is False:
+                    stats.misses += 1
+                else:
+                    stats.hits += 1
+            return result
+
+        return wrapper
+
+    def snapshot(self) -> dict:
+        return {
+            "functions": {name: {"calls": s.calls, "total_seconds": s.total_seconds,
+                                 "buckets": dict(zip((*self.buckets, float("inf")), s.bucket_counts)),
+                                 "hits": s.hits, "misses": s.misses}
+                          for name, s in self.stats.items()},
+            "caches": {name: cache.stats() for name, cache in self._caches.items()},
+        }
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP payroll_calls_total Number of calls of an instrumented function.",
+            "# TYPE payroll_calls_total counter",
+        ]
+        lines += [f'payroll_calls_total{{function="{name}"}} {s.calls}' for name, s in self.stats.items()]
+
+        lines += [
+            "# HELP payroll_call_duration_seconds Latency of an instrumented function.",
+            "# TYPE payroll_call_duration_seconds histogram",
+        ]
+        for name, s in self.stats.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), s.bucket_counts):
+                cumulative += count
+                lines.append(f'payroll_call_duration_seconds_bucket{{function="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'payroll_call_duration_seconds_sum{{function="{name}"}} {s.total_seconds!r}')
+            lines.append(f'payroll_call_duration_seconds_count{{function="{name}"}} {s.calls}')
+
+        lines += [
+            "# HELP payroll_lookups_total Leader lookups by outcome.",
+            "# TYPE payroll_lookups_total counter",
+        ]
+        for name in LOOKUP_FUNCTIONS:
+            if name in self.stats:
+                lines.append(f'payroll_lookups_total{{function="{name}",result="hit"}} {self.stats[name].hits}')
+                lines.append(f'payroll_lookups_total{{function="{name}",result="miss"}} {self.stats[name].misses}')
+
+        if self._caches:
+            lines += [
+                "# HELP payroll_cache_events_total Cache hits, misses and evictions.",
+                "# TYPE payroll_cache_events_total counter",
+            ]
+            for cache_name, cache in self._caches.items():
+                cache_stats = cache.stats()
+                for event in ("hits", "misses", "evictions"):
+                    if event in cache_stats:
+                        lines.append(f'payroll_cache_events_total{{cache="{cache_name}",event="{event}"}} {cache_stats[event]}')
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path) -> None:
+        # Written to a temporary file and renamed, so the textfile collector never reads a partial file.
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w") as file:
+            file.write(self.to_prometheus())
+        os.replace(temporary_path, path)
+
+
+instrumentation = Instrumentation()
+
+
+@contextlib.contextmanager
+def profiled(path=None, sort_by: str = "cumulative"):
+    # Captures a cProfile of the block, e.g. one payroll run. The yielded dict receives
+    # the pstats.Stats and its printed report when the block ends.
+    profile = cProfile.Profile()
+    result = {}
+    profile.enable()
+    try:
+        yield result
+    finally:
+        profile.disable()
+        if path is not None:
+            profile.dump_stats(path)
+        report = io.StringIO()
+        result["stats"] = pstats.Stats(profile, stream=report).sort_stats(sort_by)
+        result["stats"].print_stats(20)
+        result["report"] = report.getvalue()
@@ -0,0 +1,144 @@
+import pstats
+import pytest # type: ignore
+from unittest.mock import patch
+
+from employee_manager import EmployeeManager
+from instrumentation import Instrumentation, profiled
+from relations_manager import RelationsManager
+from salary_cache import SalaryCache
+
+
+@pytest.fixture
+def instrumentation():
+    """
+    Creates an Instrumentation instance and makes sure it is disabled afterwards.
+
+    Yields:
+        Instrumentation: An instance of the Instrumentation class.
+    """
+    instrumentation = Instrumentation()
+    yield instrumentation
+    instrumentation.disable()
+
+
+@pytest.fixture
+def relations_manager():
+    """
+    Creates and returns an instance of the RelationsManager class.
+
+    Returns:
+        RelationsManager: An instance of the RelationsManager class.
+    """
+    return RelationsManager()
+
+
+def test_disabled_instrumentation_leaves_methods_untouched(instrumentation):
+    """
+    Test that enabling wraps the hot-path methods and disabling restores the
+    original functions, so there is no overhead while disabled.
+    """
+    original = RelationsManager.__dict__["is_leader"]
+
+    instrumentation.enable()
+    assert RelationsManager.__dict__["is_leader"] is not original
+    assert instrumentation.enabled is True
+
+    instrumentation.disable()
+    assert RelationsManager.__dict__["is_leader"] is original
+    assert instrumentation.enabled is False
+
+
+def test_only_one_instance_can_be_enabled(instrumentation, relations_manager):
+    """
+    Test that a second Instrumentation cannot wrap methods another one already
+    wraps, so disabling both in any order restores the originals and a
+    disabled instance stops counting.
+    """
+    original = RelationsManager.__dict__["is_leader"]
+    other = Instrumentation(targets={RelationsManager: ("is_leader",)})
+
+    instrumentation.enable()
+    with pytest.raises(RuntimeError):
+        other.enable()
+    assert other.enabled is False
+
+    instrumentation.disable()
+    other.enable()
+    other.disable()
+    assert RelationsManager.__dict__["is_leader"] is original
+
+    relations_manager.is_leader(relations_manager.get_employee(1))
+    assert instrumentation.stats["is_leader"].calls == 0
+    assert other.stats["is_leader"].calls == 0
+
+
+def test_counts_latencies_and_lookups(instrumentation, relations_manager):
+    """
+    Test that call counts, latency histograms and lookup outcomes are recorded.
+    """
+    instrumentation.enable()
+    employee_manager = EmployeeManager(relations_manager)
+    with patch("builtins.print"):
+        for employee in relations_manager.get_all_employees():
+            employee_manager.calculate_salary_and_send_email(employee)
+
+    stats = instrumentation.snapshot()["functions"]
+    assert stats["calculate_salary_and_send_email"]["calls"] == 6
+    assert stats["calculate_salary"]["calls"] == 6
+    assert stats["is_leader"]["calls"] == 6 + 2  # get_team_members asks is_leader too
+    assert stats["is_leader"]["hits"] == 4
+    assert stats["is_leader"]["misses"] == 4
+    assert stats["get_team_members"]["hits"] == 2
+    assert sum(stats["calculate_salary"]["buckets"].values()) == 6
+    assert stats["calculate_salary"]["total_seconds"] > 0
+
+
+def test_prometheus_export(tmp_path, instrumentation, relations_manager):
+    """
+    Test that the Prometheus text export contains cumulative histogram buckets,
+    call counters and registered cache statistics.
+    """
+    cache = SalaryCache()
+    instrumentation.register_cache("salary", cache)
+    instrumentation.enable()
+    employee_manager = EmployeeManager(relations_manager, salary_cache=cache)
+    leader = relations_manager.get_employee(1)
+    employee_manager.calculate_salary(leader)
+    employee_manager.calculate_salary(leader)
+
+    path = tmp_path / "payroll.prom"
+    instrumentation.write_prometheus(path)
+    text = path.read_text()
+
+    assert 'payroll_calls_total{function="calculate_salary"} 2' in text
+    assert 'payroll_call_duration_seconds_bucket{function="calculate_salary",le="+Inf"} 2' in text
+    assert 'payroll_call_duration_seconds_count{function="get_team_members"} 1' in text
+    assert 'payroll_cache_events_total{cache="salary",event="hits"} 1' in text
+    assert "# TYPE payroll_call_duration_seconds histogram" in text
+
+
+def test_reset_clears_metrics(instrumentation, relations_manager):
+    """
+    Test that reset drops the collected metrics.
+    """
+    instrumentation.enable()
+    relations_manager.is_leader(relations_manager.get_employee(1))
+    instrumentation.disable()
+
+    instrumentation.reset()
+
+    assert instrumentation.snapshot()["functions"]["is_leader"]["calls"] == 0
+
+
+def test_profiled_run(tmp_path, relations_manager):
+    """
+    Test that the cProfile capture mode writes a pstats file and a readable report.
+    """
+    path = tmp_path / "payroll.pstats"
+    employee_manager = EmployeeManager(relations_manager)
+
+    with profiled(path) as profile:
+        employee_manager.calculate_salaries(relations_manager.get_all_employees())
+
+    assert "calculate_salaries" in profile["report"]
+    assert pstats.Stats(str(path)).total_calls > 0
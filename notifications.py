@@ -0,0 +1,142 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class Notification:
+    recipient: int
+    body: str
+
+
+@dataclass
+class PipelineStats:
+    sent: int = 0
+    batches: int = 0
+    retries: int = 0
+    failed: list = field(default_factory=list)
+
+
+class TransportError(Exception):
+    pass
+
+
+class InMemoryTransport:
+    # Fake SMTP relay for tests and offline benchmarks: keeps every delivered message,
+    # can simulate per-batch network latency and fail the first `failures` batches.
+    def __init__(self, latency: float = 0.0, failures: int = 0):
+        self.latency = latency
+        self.failures = failures
+        self.sent = []
+        self.batch_sizes = []
+
+    async def send_batch(self, notifications: list) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failures > 0:
+            self.failures -= 1
+            raise TransportError("Simulated relay failure")
+        self.sent.extend(notifications)
+        self.batch_sizes.append(len(notifications))
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1) -> None:
+        if tokens > self.capacity:
+            raise ValueError("Cannot acquire more tokens than the bucket capacity")
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class NotificationPipeline:
+    def __init__(self, transport, senders: int = 4, batch_size: int = 50, queue_size: int = 1000,
+                 rate: float = None, max_retries: int = 3, backoff: float = 0.1):
+        if senders < 1 or batch_size < 1 or queue_size < 1:
+            raise ValueError("senders, batch_size and queue_size must be positive")
+        self.transport = transport
+        self.senders = senders
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        if rate and rate < 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    async def run(self, notifications) -> PipelineStats:
+        stats = PipelineStats()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        # A fresh bucket per run: its lock belongs to the running event loop, and every
+        # asyncio.run() (e.g. each send_salary_notifications call) starts a new one.
+        # Rate is in messages per second; the bucket must hold at least one full batch.
+        rate_limit = TokenBucket(self.rate, max(self.rate, self.batch_size)) if self.rate else None
+        senders = [asyncio.create_task(self._sender(queue, stats, rate_limit)) for _ in range(self.senders)]
+        producer = asyncio.create_task(self._produce(notifications, queue))
+
+        # Waiting on the producer and the senders together means a sender that dies
+        # raises here instead of leaving the producer blocked on a full queue.
+        try:
+            done, _ = await asyncio.wait([producer, *senders], return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in (producer, *senders):
+                task.cancel()
+
+        return stats
+
+    async def _produce(self, notifications, queue: asyncio.Queue) -> None:
+        for notification in notifications:
+            await queue.put(notification)
+        for _ in range(self.senders):
+            await queue.put(None)
+
+    async def _sender(self, queue: asyncio.Queue, stats: PipelineStats, rate_limit: TokenBucket) -> None:
+        done = False
+        while not done:
+            batch = []
+            notification = await queue.get()
+            while notification is not None:
+                batch.append(notification)
+                if len(batch) == self.batch_size or queue.empty():
+                    break
+                notification = queue.get_nowait()
+            done = notification is None
+
+            if batch:
+                await self._send_with_retry(batch, stats, rate_limit)
+
+    async def _send_with_retry(self, batch: list, stats: PipelineStats, rate_limit: TokenBucket) -> None:
+        for attempt in range(self.max_retries + 1):
+            if rate_limit is not None:
+                await rate_limit.acquire(len(batch))
+            try:
+                await self.transport.send_batch(batch)
+            except Exception:
+                # Real relays raise smtplib.SMTPException or OSError as well as TransportError;
+                # all of them count as a failed attempt.
+                if attempt == self.max_retries:
+                    stats.failed.extend(batch)
+                    return
+                stats.retries += 1
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+            else:
+                stats.sent += len(batch)
+                stats.batches += 1
+                return
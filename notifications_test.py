@@ -0,0 +1,178 @@
+import asyncio
+import time
+import pytest # type: ignore
+
+from employee_manager import EmployeeManager
+from notifications import InMemoryTransport, Notification, NotificationPipeline, TokenBucket
+from relations_manager import RelationsManager
+
+
+def make_notifications(count):
+    """
+    Creates `count` numbered notifications.
+
+    Returns:
+        list: A list of Notification objects.
+    """
+    return [Notification(recipient=i, body=f"message {i}") for i in range(count)]
+
+
+def test_pipeline_delivers_every_message_in_batches():
+    """
+    Test that the pipeline delivers every notification exactly once and never
+    sends a batch larger than batch_size.
+    """
+    transport = InMemoryTransport(latency=0.001)
+    pipeline = NotificationPipeline(transport, senders=4, batch_size=25, queue_size=100)
+
+    stats = asyncio.run(pipeline.run(make_notifications(1000)))
+
+    assert stats.sent == 1000
+    assert stats.failed == []
+    assert sorted(n.recipient for n in transport.sent) == list(range(1000))
+    assert max(transport.batch_sizes) <= 25
+    assert stats.batches == len(transport.batch_sizes)
+
+
+def test_concurrent_senders_overlap_latency():
+    """
+    Benchmark style test: with a slow relay, concurrent senders must finish
+    much faster than sending the batches one after another would.
+    """
+    transport = InMemoryTransport(latency=0.02)
+    pipeline = NotificationPipeline(transport, senders=10, batch_size=10)
+
+    started = time.perf_counter()
+    stats = asyncio.run(pipeline.run(make_notifications(500)))
+    elapsed = time.perf_counter() - started
+
+    serial_time = stats.batches * transport.latency
+    assert stats.sent == 500
+    assert elapsed < serial_time / 2
+
+
+def test_pipeline_retries_with_backoff():
+    """
+    Test that failed batches are retried and eventually delivered.
+    """
+    transport = InMemoryTransport(failures=2)
+    pipeline = NotificationPipeline(transport, senders=1, batch_size=10, max_retries=3, backoff=0.001)
+
+    stats = asyncio.run(pipeline.run(make_notifications(10)))
+
+    assert stats.retries == 2
+    assert stats.sent == 10
+    assert len(transport.sent) == 10
+
+
+def test_pipeline_reports_failures_after_max_retries():
+    """
+    Test that a batch is reported as failed once the retries are exhausted.
+    """
+    transport = InMemoryTransport(failures=10)
+    pipeline = NotificationPipeline(transport, senders=1, batch_size=5, max_retries=1, backoff=0.001)
+
+    stats = asyncio.run(pipeline.run(make_notifications(5)))
+
+    assert stats.sent == 0
+    assert [n.recipient for n in stats.failed] == [0, 1, 2, 3, 4]
+
+
+class BrokenRelay:
+    """
+    Transport whose connection always fails with an OSError, as a real SMTP
+    relay does when it is unreachable.
+    """
+    def __init__(self):
+        self.attempts = 0
+
+    async def send_batch(self, notifications):
+        self.attempts += 1
+        raise OSError("Connection refused")
+
+
+def test_pipeline_survives_non_transport_errors():
+    """
+    Test that exceptions other than TransportError are retried and reported as
+    failed instead of killing the senders and hanging the producer.
+    """
+    transport = BrokenRelay()
+    pipeline = NotificationPipeline(transport, senders=2, batch_size=5, queue_size=2, max_retries=1, backoff=0.001)
+
+    stats = asyncio.run(asyncio.wait_for(pipeline.run(make_notifications(100)), timeout=10))
+
+    assert stats.sent == 0
+    assert len(stats.failed) == 100
+    assert stats.retries == transport.attempts // 2
+
+
+def test_pipeline_raises_when_a_sender_dies():
+    """
+    Test that a sender crashing outside the transport makes run() raise
+    instead of waiting forever on a full queue.
+    """
+    pipeline = NotificationPipeline(InMemoryTransport(), senders=1, queue_size=1)
+
+    async def crash(*args):
+        raise RuntimeError("sender bug")
+    pipeline._sender = crash
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(asyncio.wait_for(pipeline.run(make_notifications(100)), timeout=10))
+
+
+def test_token_bucket_limits_rate():
+    """
+    Test that the rate limit slows the pipeline down to the configured rate.
+    """
+    transport = InMemoryTransport()
+    pipeline = NotificationPipeline(transport, senders=4, batch_size=10, rate=200)
+
+    started = time.perf_counter()
+    asyncio.run(pipeline.run(make_notifications(400)))
+    elapsed = time.perf_counter() - started
+
+    # The first 200 messages fit in the full bucket, the other 200 take about a second.
+    assert elapsed >= 0.9
+    assert len(transport.sent) == 400
+
+
+def test_token_bucket_rejects_oversized_requests():
+    """
+    Test that acquiring more tokens than the bucket can hold raises ValueError.
+    """
+    with pytest.raises(ValueError):
+        asyncio.run(TokenBucket(rate=5).acquire(10))
+
+
+def test_send_salary_notifications():
+    """
+    Test that EmployeeManager sends one salary notification per employee with
+    the same text calculate_salary_and_send_email prints.
+    """
+    relations_manager = RelationsManager()
+    employee_manager = EmployeeManager(relations_manager)
+    transport = InMemoryTransport()
+
+    stats = employee_manager.send_salary_notifications(relations_manager.get_all_employees(),
+                                                       NotificationPipeline(transport, senders=2, batch_size=4))
+
+    john = relations_manager.get_employee(1)
+    expected = EmployeeManager.salary_message(john, employee_manager.calculate_salary(john))
+    assert stats.sent == 6
+    assert [n.body for n in transport.sent if n.recipient == 1] == [expected]
+
+
+def test_rate_limited_pipeline_can_be_reused():
+    """
+    Test that a rate-limited pipeline runs again in a new event loop, as it
+    does for every send_salary_notifications call, after senders queued up
+    on the rate limit in the previous loop.
+    """
+    transport = InMemoryTransport()
+    pipeline = NotificationPipeline(transport, senders=4, batch_size=10, rate=100)
+
+    for _ in range(2):
+        stats = asyncio.run(pipeline.run(make_notifications(130)))
+        assert stats.sent == 130
+    assert len(transport.sent) == 260
@@ -0,0 +1,62 @@
+import array
+import datetime
+import random
+from employee_table import EmployeeTable
+from relations_manager import RelationsManager
+
+
+FIRST_NAMES = ("John", "Myrta", "Jettie", "Gretchen", "Tomas", "Scotty", "Ada", "Alan", "Grace", "Linus",
+               "Margaret", "Dennis", "Barbara", "Ken", "Frances", "Edsger")
+LAST_NAMES = ("Doe", "Torkelson", "Lynch", "Watford", "Andre", "Bomba", "Lovelace", "Turing", "Hopper",
+              "Torvalds", "Hamilton", "Ritchie", "Liskov", "Thompson", "Allen", "Dijkstra")
+
+TEAM_SIZE_DISTRIBUTIONS = ("fixed", "uniform", "pareto")
+
+_BIRTH_RANGE = (datetime.date(1955, 1, 1).toordinal(), datetime.date(2000, 12, 31).toordinal())
+_HIRE_RANGE = (datetime.date(1985, 1, 1).toordinal(), datetime.date(2024, 12, 31).toordinal())
+
+
+def team_sizes(count: int, team_size: int, distribution: str, rng: random.Random):
+    # Yields member counts (leader excluded) whose teams, leaders included, cover `count` employees.
+    if distribution not in TEAM_SIZE_DISTRIBUTIONS:
+        raise ValueError(f"Unknown team size distribution {distribution!r}")
+    remaining = count
+    while remaining > 0:
+        if distribution == "fixed":
+            size = team_size
+        elif distribution == "uniform":
+            size = rng.randint(0, 2 * team_size)
+        else:
+            # Heavy-tailed: most teams are small, a few are very large; the mean stays near team_size.
+            size = int(rng.paretovariate(1.5) * team_size / 3)
+        size = min(size, remaining - 1)
+        yield size
+        remaining -= size + 1
+
+
+def generate_org(count: int, team_size: int = 8, distribution: str = "fixed", seed: int = 0) -> RelationsManager:
+    # Deterministic for a given (count, team_size, distribution, seed). Ids run 0..count-1;
+    # every team is a leader followed by its members, and columns are filled directly so
+    # 10M-row orgs do not build 10M Employee objects.
+    if count < 0 or team_size < 0:
+        raise ValueError("count and team_size must not be negative")
+    rng = random.Random(seed)
+
+    table = EmployeeTable()
+    first_names = [table.names.add(name) for name in FIRST_NAMES]
+    last_names = [table.names.add(name) for name in LAST_NAMES]
+    table.ids = array.array("q", range(count))
+    table.first_names = array.array("I", (rng.choice(first_names) for _ in range(count)))
+    table.last_names = array.array("I", (rng.choice(last_names) for _ in range(count)))
+    table.birth_dates = array.array("i", (rng.randint(*_BIRTH_RANGE) for _ in range(count)))
+    table.base_salaries = array.array("q", (rng.randrange(1000, 6000, 50) for _ in range(count)))
+    table.hire_dates = array.array("i", (rng.randint(*_HIRE_RANGE) for _ in range(count)))
+
+    teams = {}
+    leader_id = 0
+    for size in team_sizes(count, team_size, distribution, rng):
+        if size:
+            teams[leader_id] = list(range(leader_id + 1, leader_id + 1 + size))
+        leader_id += size + 1
+
+    return RelationsManager(table, teams)
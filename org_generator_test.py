@@ -0,0 +1,67 @@
+import pytest # type: ignore
+
+from employee_manager import EmployeeManager
+from org_generator import TEAM_SIZE_DISTRIBUTIONS, generate_org
+
+
+@pytest.mark.parametrize("distribution", TEAM_SIZE_DISTRIBUTIONS)
+def test_generate_org_covers_every_employee_once(distribution):
+    """
+    Test that every generated employee is either a leader or the member of
+    exactly one team, for every team size distribution.
+    """
+    relations_manager = generate_org(5_000, team_size=6, distribution=distribution, seed=3)
+
+    members = [member_id for member_ids in relations_manager.teams.values() for member_id in member_ids]
+    assert len(relations_manager.get_all_employees()) == 5_000
+    assert len(members) == len(set(members))
+    assert len(members) + len(relations_manager.teams) <= 5_000
+    assert set(members).isdisjoint(relations_manager.teams)
+    assert max(members) < 5_000
+
+
+def test_generate_org_is_deterministic():
+    """
+    Test that the same parameters generate the same organisation and a
+    different seed generates a different one.
+    """
+    first = generate_org(1_000, distribution="uniform", seed=7)
+    second = generate_org(1_000, distribution="uniform", seed=7)
+    other = generate_org(1_000, distribution="uniform", seed=8)
+
+    assert list(first.iter_employees()) == list(second.iter_employees())
+    assert first.teams == second.teams
+    assert first.teams != other.teams
+
+
+def test_fixed_team_size():
+    """
+    Test that the fixed distribution produces teams of exactly team_size members.
+    """
+    relations_manager = generate_org(90, team_size=8, distribution="fixed")
+
+    assert relations_manager.teams[0] == list(range(1, 9))
+    assert {len(member_ids) for member_ids in relations_manager.teams.values()} == {8}
+    assert relations_manager.get_team_sizes()[9] == 8
+
+
+def test_generated_org_supports_payroll():
+    """
+    Test that salaries of a generated organisation can be computed with both
+    the scalar and the batch path, with the same results.
+    """
+    relations_manager = generate_org(200, team_size=4, distribution="pareto", seed=1)
+    employee_manager = EmployeeManager(relations_manager)
+    employees = relations_manager.get_all_employees()
+
+    assert employee_manager.calculate_salaries(employees) == [employee_manager.calculate_salary(e) for e in employees]
+
+
+def test_invalid_parameters():
+    """
+    Test that unknown distributions and negative sizes are rejected.
+    """
+    with pytest.raises(ValueError):
+        generate_org(10, distribution="normal")
+    with pytest.raises(ValueError):
+        generate_org(-1)
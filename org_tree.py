@@ -0,0 +1,123 @@
+from employee_manager import EmployeeManager
+
+
+class OrgTree:
+    # Multi-level hierarchy over RelationsManager.teams, where a team member can lead a
+    # team of their own. Every node caches the headcount and payroll cost of its subtree,
+    # so aggregate queries are O(1) and an edge change only walks the affected ancestors.
+    def __init__(self, employee_manager: EmployeeManager):
+        self.employee_manager = employee_manager
+        relations_manager = employee_manager.relations_manager
+        employees = relations_manager.get_all_employees()
+
+        self._salary = dict(zip((e.id for e in employees), employee_manager.calculate_salaries(employees)))
+        self._parent = {}
+        self._children = {employee_id: [] for employee_id in self._salary}
+
+        for leader_id, member_ids in relations_manager.teams.items():
+            if leader_id not in self._salary:
+                continue
+            for member_id in member_ids:
+                if member_id not in self._salary:
+                    continue
+                if member_id in self._parent and self._parent[member_id] != leader_id:
+                    raise ValueError(f"Employee {member_id} belongs to more than one team")
+                if member_id not in self._parent:
+                    self._parent[member_id] = leader_id
+                    self._children[leader_id].append(member_id)
+
+        self._headcount = {}
+        self._payroll_cost = {}
+        for root_id in self.roots():
+            self._aggregate(root_id)
+        if len(self._headcount) != len(self._salary):
+            raise ValueError("The team hierarchy contains a leadership cycle")
+
+    def _aggregate(self, root_id: int) -> None:
+        # Iterative post-order walk, so deep hierarchies do not hit the recursion limit.
+        stack = [(root_id, False)]
+        while stack:
+            employee_id, children_done = stack.pop()
+            if children_done:
+                children = self._children[employee_id]
+                self._headcount[employee_id] = 1 + sum(self._headcount[c] for c in children)
+                self._payroll_cost[employee_id] = self._salary[employee_id] + sum(self._payroll_cost[c] for c in children)
+            else:
+                stack.append((employee_id, True))
+                stack.extend((child_id, False) for child_id in self._children[employee_id])
+
+    def roots(self) -> list:
+        return [employee_id for employee_id in self._salary if employee_id not in self._parent]
+
+    def parent(self, employee_id: int):
+        return self._parent.get(employee_id)
+
+    def ancestors(self, employee_id: int):
+        parent_id = self._parent.get(employee_id)
+        while parent_id is not None:
+            yield parent_id
+            parent_id = self._parent.get(parent_id)
+
+    def headcount(self, employee_id: int) -> int:
+        # Size of the subtree rooted at employee_id, the employee included.
+        return self._headcount[employee_id]
+
+    def payroll_cost(self, employee_id: int) -> int:
+        # Total salary of the subtree rooted at employee_id, the employee included.
+        return self._payroll_cost[employee_id]
+
+    def salary(self, employee_id: int) -> int:
+        return self._salary[employee_id]
+
+    def reports(self, employee_id: int) -> list:
+        # All transitive reports in pre-order; O(k) for k reports.
+        reports = []
+        stack = list(reversed(self._children[employee_id]))
+        while stack:
+            report_id = stack.pop()
+            reports.append(report_id)
+            stack.extend(reversed(self._children[report_id]))
+        return reports
+
+    def _add_to_path(self, employee_id: int, headcount: int, payroll_cost: int) -> None:
+        # Applies a delta to employee_id and every ancestor above it.
+        node_id = employee_id
+        while node_id is not None:
+            self._headcount[node_id] += headcount
+            self._payroll_cost[node_id] += payroll_cost
+            node_id = self._parent.get(node_id)
+
+    def refresh_salary(self, employee_id: int) -> None:
+        # Recomputes one salary, e.g. after a raise, and propagates the difference upwards.
+        employee = self.employee_manager.relations_manager.get_employee(employee_id)
+        delta = self.employee_manager.calculate_salary(employee) - self._salary[employee_id]
+        self._salary[employee_id] += delta
+        self._add_to_path(employee_id, 0, delta)
+
+    def move(self, employee_id: int, new_leader_id: int) -> None:
+        # Moves employee_id and their whole subtree under new_leader_id, in the
+        # RelationsManager as well; only the old and new ancestor chains are updated.
+        # Everything is checked, and the RelationsManager changed, before the tree is touched.
+        for node_id in (employee_id, new_leader_id):
+            if node_id not in self._children:
+                raise ValueError(f"Unknown employee id {node_id}")
+        if employee_id == new_leader_id or employee_id in self.ancestors(new_leader_id):
+            raise ValueError(f"Moving {employee_id} under {new_leader_id} would create a cycle")
+
+        old_leader_id = self._parent.get(employee_id)
+        if old_leader_id == new_leader_id:
+            return
+        self.employee_manager.relations_manager.move_team_member(employee_id, new_leader_id)
+        headcount, payroll_cost = self._headcount[employee_id], self._payroll_cost[employee_id]
+
+        if old_leader_id is not None:
+            self._add_to_path(old_leader_id, -headcount, -payroll_cost)
+            self._children[old_leader_id].remove(employee_id)
+        self._parent[employee_id] = new_leader_id
+        self._children[new_leader_id].append(employee_id)
+        self._add_to_path(new_leader_id, headcount, payroll_cost)
+
+        # Team sizes changed, so the leader bonus of both leaders changes too.
+        for leader_id in (old_leader_id, new_leader_id):
+            if leader_id is not None:
+                self.refresh_salary(leader_id)
@@ -0,0 +1,138 @@
+import dataclasses
+import pytest # type: ignore
+
+from employee_manager import EmployeeManager
+from org_tree import OrgTree
+from relations_manager import RelationsManager
+
+
+@pytest.fixture
+def relations_manager():
+    """
+    Creates a RelationsManager with a three level hierarchy:
+    1 leads 2 and 3, 2 leads 4, and 4 leads 5 and 6.
+
+    Returns:
+        RelationsManager: An instance of the RelationsManager class.
+    """
+    relations_manager = RelationsManager()
+    relations_manager.teams[2] = [4]
+    relations_manager.reindex()
+    return relations_manager
+
+
+@pytest.fixture
+def org_tree(relations_manager):
+    """
+    Builds an OrgTree over the relations_manager fixture.
+
+    Returns:
+        OrgTree: An instance of the OrgTree class.
+    """
+    return OrgTree(EmployeeManager(relations_manager))
+
+
+def brute_force_cost(relations_manager, employee_id):
+    """
+    Recomputes the payroll cost of a subtree with a recursive walk.
+
+    Returns:
+        int: The total salary of employee_id and all transitive reports.
+    """
+    employee_manager = EmployeeManager(relations_manager)
+    cost = employee_manager.calculate_salary(relations_manager.get_employee(employee_id))
+    for member_id in relations_manager.teams.get(employee_id, []):
+        cost += brute_force_cost(relations_manager, member_id)
+    return cost
+
+
+def test_subtree_queries(org_tree, relations_manager):
+    """
+    Test headcount, payroll cost and transitive report queries on a multi level tree.
+    """
+    assert org_tree.roots() == [1]
+    assert org_tree.reports(1) == [2, 4, 5, 6, 3]
+    assert org_tree.reports(4) == [5, 6]
+    assert org_tree.reports(3) == []
+    assert org_tree.headcount(1) == 6
+    assert org_tree.headcount(2) == 4
+    assert list(org_tree.ancestors(6)) == [4, 2, 1]
+    for employee_id in range(1, 7):
+        assert org_tree.payroll_cost(employee_id) == brute_force_cost(relations_manager, employee_id)
+
+
+def test_move_updates_aggregates(org_tree, relations_manager):
+    """
+    Test that moving a subtree updates headcounts, payroll costs, leader
+    salaries and the underlying RelationsManager teams.
+    """
+    org_tree.move(4, 3)
+
+    assert relations_manager.teams[2] == []
+    assert relations_manager.teams[3] == [4]
+    assert org_tree.parent(4) == 3
+    assert org_tree.headcount(2) == 1
+    assert org_tree.headcount(3) == 4
+    assert org_tree.headcount(1) == 6
+    for employee_id in range(1, 7):
+        assert org_tree.payroll_cost(employee_id) == brute_force_cost(relations_manager, employee_id)
+
+
+def test_refresh_salary_propagates_to_ancestors(org_tree, relations_manager):
+    """
+    Test that a raise is reflected in the payroll cost of every ancestor.
+    """
+    before = org_tree.payroll_cost(1)
+    employee = relations_manager.get_employee(5)
+    relations_manager.update_employee(dataclasses.replace(employee, base_salary=employee.base_salary + 250))
+
+    org_tree.refresh_salary(5)
+
+    assert org_tree.payroll_cost(1) == before + 250
+    assert org_tree.payroll_cost(4) == brute_force_cost(relations_manager, 4)
+
+
+def test_move_rejects_cycles(org_tree):
+    """
+    Test that a leader cannot be moved under one of their own reports.
+    """
+    with pytest.raises(ValueError):
+        org_tree.move(2, 5)
+    with pytest.raises(ValueError):
+        org_tree.move(4, 4)
+
+
+def test_move_rejects_unknown_ids_without_changes(org_tree, relations_manager):
+    """
+    Test that moving an unknown employee, or under an unknown leader, raises
+    ValueError and leaves both the tree and the RelationsManager unchanged.
+    """
+    teams = {leader_id: list(member_ids) for leader_id, member_ids in relations_manager.teams.items()}
+    totals = {employee_id: (org_tree.headcount(employee_id), org_tree.payroll_cost(employee_id))
+              for employee_id in org_tree._salary}
+
+    with pytest.raises(ValueError):
+        org_tree.move(2, 999)
+    with pytest.raises(ValueError):
+        org_tree.move(999, 1)
+
+    assert relations_manager.teams == teams
+    assert {employee_id: (org_tree.headcount(employee_id), org_tree.payroll_cost(employee_id))
+            for employee_id in org_tree._salary} == totals
+    assert 2 in org_tree.reports(1)
+
+
+def test_invalid_hierarchies(relations_manager):
+    """
+    Test that an employee in two teams or a leadership cycle is rejected.
+    """
+    relations_manager.teams[3] = [5]
+    relations_manager.reindex()
+    with pytest.raises(ValueError):
+        OrgTree(EmployeeManager(relations_manager))
+
+    relations_manager.teams[3] = []
+    relations_manager.teams[6] = [1]
+    relations_manager.reindex()
+    with pytest.raises(ValueError):
+        OrgTree(EmployeeManager(relations_manager))
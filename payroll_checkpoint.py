@@ -0,0 +1,177 @@
+import array
+import datetime
+import itertools
+import os
+import struct
+import sys
+from employee_loader import DEFAULT_CHUNK_SIZE, chunked
+from employee_manager import EmployeeManager, resolve_evaluation_date
+
+
+# Log layout (native little-endian): header (magic, version, flags, evaluation date), then
+# one (employee id q, salary q) record per processed employee in the order they completed.
+# A crash can only leave a partial record at the end, which is cut off when the log is
+# reopened. The FINISHED flag is set once the whole run went through.
+MAGIC = b"PAYCKPT\0"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIIq")
+FLAGS_OFFSET = 12
+FLAGS = struct.Struct("<I")
+RECORD_SIZE = 16
+FINISHED = 1
+
+DEFAULT_FLUSH_EVERY = 1_000
+
+
+class CheckpointError(ValueError):
+    pass
+
+
+class CheckpointLog:
+    # Append-only log of completed employees. Records are buffered and written, flushed
+    # and fsynced once per `flush_every` records, so at most that many completed
+    # employees are redone after a crash. A finished log cannot be reopened, so a new
+    # payroll run never silently reuses the results and date of an old one.
+    def __init__(self, path, as_of: datetime.date, flush_every: int = DEFAULT_FLUSH_EVERY, fsync: bool = True):
+        if sys.byteorder != "little":
+            raise CheckpointError("Payroll checkpoints can only be written on little-endian machines")
+        if flush_every < 1:
+            raise ValueError("flush_every must be positive")
+        self.path = path
+        self.flush_every = flush_every
+        self.fsync = fsync
+        self.completed = {}
+        self._buffer = array.array("q")
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._file = open(path, "r+b")
+            try:
+                self.as_of = self._load()
+            except CheckpointError:
+                self._file.close()
+                raise
+            if as_of is not None and as_of != self.as_of:
+                self._file.close()
+                raise CheckpointError(f"{path} belongs to a payroll evaluated on {self.as_of}, not {as_of}")
+        else:
+            self._file = open(path, "wb")
+            self.as_of = resolve_evaluation_date(as_of)
+            self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, self.as_of.toordinal()))
+            self._sync()
+
+    def _load(self) -> datetime.date:
+        header = self._file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise CheckpointError(f"{self.path} is too small to be a payroll checkpoint")
+        magic, version, flags, as_of = HEADER.unpack(header)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise CheckpointError(f"{self.path} is not a version {FORMAT_VERSION} payroll checkpoint")
+        if flags & FINISHED:
+            raise CheckpointError(f"{self.path} belongs to a finished payroll run for {datetime.date.fromordinal(as_of)}; "
+                                  f"remove it to run the payroll again")
+
+        data = self._file.read()
+        complete = len(data) - len(data) % RECORD_SIZE
+        records = array.array("q")
+        records.frombytes(data[:complete])
+        self.completed = dict(zip(records[0::2], records[1::2]))
+
+        # Drop a half-written trailing record and append after the last complete one.
+        self._file.truncate(HEADER.size + complete)
+        self._file.seek(HEADER.size + complete)
+        return datetime.date.fromordinal(as_of)
+
+    def record(self, employee_id: int, salary: int) -> None:
+        self.record_many((employee_id,), (salary,))
+
+    def record_many(self, employee_ids, salaries) -> None:
+        employee_ids, salaries = list(employee_ids), list(salaries)
+        self.completed.update(zip(employee_ids, salaries))
+        self._buffer.extend(itertools.chain.from_iterable(zip(employee_ids, salaries)))
+        if len(self._buffer) >= 2 * self.flush_every:
+            self.flush()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write(self._buffer.tobytes())
+            self._buffer = array.array("q")
+        self._sync()
+
+    def finish(self) -> None:
+        # Marks the run as complete once every record is on disk.
+        self.flush()
+        self._file.seek(FLAGS_OFFSET)
+        self._file.write(FLAGS.pack(FINISHED))
+        self._file.seek(0, os.SEEK_END)
+        self._sync()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "CheckpointLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _print_salary_message(employee, salary: int) -> None:
+    print(EmployeeManager.salary_message(employee, salary))
+
+
+class CheckpointedPayroll:
+    # Payroll run that can be restarted after a crash. Each employee is logged only once
+    # its notification went out, so a resumed run skips both the calculation and the
+    # notification of everyone in the log. Only the last unflushed batch (at most
+    # flush_every employees) can be notified twice after a hard crash.
+    def __init__(self, employee_manager: EmployeeManager, checkpoint_path,
+                 flush_every: int = DEFAULT_FLUSH_EVERY, fsync: bool = True):
+        self.employee_manager = employee_manager
+        self.checkpoint_path = checkpoint_path
+        self.flush_every = flush_every
+        self.fsync = fsync
+        self.skipped = 0
+        self.processed = 0
+
+    def run(self, employees=None, notify=None, as_of: datetime.date = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+        # Returns the salaries of every completed employee, from this and earlier attempts.
+        # A resumed run reuses the evaluation date stored in the checkpoint; once every
+        # employee went through, the checkpoint is marked finished and cannot be resumed.
+        if employees is None:
+            employees = self.employee_manager.relations_manager.iter_employees()
+        notify = notify or _print_salary_message
+        self.skipped = self.processed = 0
+
+        with CheckpointLog(self.checkpoint_path, as_of, self.flush_every, self.fsync) as log:
+            completed = log.completed
+
+            def pending():
+                for employee in employees:
+                    if employee.id in completed:
+                        self.skipped += 1
+                    else:
+                        yield employee
+
+            salaries = self.employee_manager.iter_salaries(pending() if completed else employees, chunk_size, log.as_of)
+            for batch in chunked(salaries, self.flush_every):
+                # Logged per batch, but only up to the last notification that went out.
+                notified = 0
+                try:
+                    for employee, salary in batch:
+                        notify(employee, salary)
+                        notified += 1
+                finally:
+                    log.record_many((employee.id for employee, _ in batch[:notified]),
+                                    (salary for _, salary in batch[:notified]))
+                    self.processed += notified
+
+            log.finish()
+            return completed
@@ -0,0 +1,121 @@
+import datetime
+import pytest # type: ignore
+
+from employee_manager import EmployeeManager
+from org_generator import generate_org
+from payroll_checkpoint import CheckpointError, CheckpointLog, CheckpointedPayroll, HEADER, RECORD_SIZE
+
+
+AS_OF = datetime.date(2025, 3, 15)
+
+
+class Crash(Exception):
+    pass
+
+
+@pytest.fixture
+def employee_manager():
+    """
+    Creates an EmployeeManager over a generated organisation of 500 employees.
+
+    Returns:
+        EmployeeManager: The manager the payroll runs on.
+    """
+    return EmployeeManager(generate_org(500, team_size=5, seed=5))
+
+
+@pytest.fixture
+def expected_salaries(employee_manager):
+    """
+    Computes every salary without checkpoints.
+
+    Returns:
+        dict: Salaries keyed by employee id, evaluated on AS_OF.
+    """
+    return {e.id: employee_manager.calculate_salary(e, AS_OF)
+            for e in employee_manager.relations_manager.get_all_employees()}
+
+
+def crashing_notifier(sent, crash_after=None):
+    """
+    Builds a notify callback that records every notification and raises Crash
+    once `crash_after` notifications went out.
+
+    Returns:
+        callable: The notify callback.
+    """
+    def notify(employee, salary):
+        if crash_after is not None and len(sent) == crash_after:
+            raise Crash()
+        sent.append(employee.id)
+    return notify
+
+
+def test_resume_skips_completed_work(tmp_path, employee_manager, expected_salaries):
+    """
+    Test that a run interrupted by a crash resumes from its checkpoint.
+
+    Verify:
+        - The crashed run logged exactly the employees it had notified.
+        - The resumed run notifies only the remaining employees, once each.
+        - The combined salaries match an uninterrupted run.
+        - The finished checkpoint cannot be run again, so nobody is silently skipped.
+    """
+    path = tmp_path / "payroll.ckpt"
+    sent = []
+    payroll = CheckpointedPayroll(employee_manager, path, flush_every=64)
+
+    with pytest.raises(Crash):
+        payroll.run(notify=crashing_notifier(sent, crash_after=450), as_of=AS_OF, chunk_size=100)
+    assert payroll.processed == 450
+    assert (path.stat().st_size - HEADER.size) // RECORD_SIZE == 450
+
+    salaries = payroll.run(notify=crashing_notifier(sent))
+    assert payroll.skipped == 450
+    assert payroll.processed == 50
+    assert sorted(sent) == sorted(expected_salaries)
+    assert salaries == expected_salaries
+
+    with pytest.raises(CheckpointError, match="finished"):
+        payroll.run(notify=crashing_notifier(sent))
+    with pytest.raises(CheckpointError, match="finished"):
+        payroll.run(notify=crashing_notifier(sent), as_of=AS_OF)
+    assert len(sent) == 500
+
+
+def test_partial_trailing_record_is_dropped(tmp_path):
+    """
+    Test that a half-written record left by a hard crash is cut off on reopen
+    and that later records are appended after the last complete one.
+    """
+    path = tmp_path / "payroll.ckpt"
+    with CheckpointLog(path, AS_OF, flush_every=2) as log:
+        log.record_many([1, 2, 3], [100, 200, 300])
+    with open(path, "ab") as file:
+        file.write(b"\x04\x00\x00")
+
+    with CheckpointLog(path, None) as log:
+        assert log.as_of == AS_OF
+        assert log.completed == {1: 100, 2: 200, 3: 300}
+        log.record(4, 400)
+
+    with CheckpointLog(path, AS_OF) as log:
+        assert log.completed == {1: 100, 2: 200, 3: 300, 4: 400}
+
+
+def test_checkpoint_rejects_other_dates_and_files(tmp_path):
+    """
+    Test that a checkpoint cannot be resumed with another evaluation date and
+    that foreign files are rejected.
+    """
+    path = tmp_path / "payroll.ckpt"
+    CheckpointLog(path, AS_OF).close()
+    with pytest.raises(CheckpointError):
+        CheckpointLog(path, datetime.date(2026, 1, 1))
+
+    foreign = tmp_path / "foreign.ckpt"
+    foreign.write_bytes(b"x" * 64)
+    with pytest.raises(CheckpointError):
+        CheckpointLog(foreign, AS_OF)
+    with pytest.raises(ValueError):
+        CheckpointLog(tmp_path / "other.ckpt", AS_OF, flush_every=0)
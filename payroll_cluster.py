@@ -0,0 +1,327 @@
+import argparse
+import collections
+import datetime
+import hmac
+import json
+import multiprocessing
+import os
+import secrets
+import socket
+import struct
+import sys
+import threading
+import time
+from employee_loader import parse_record, to_record
+from employee_manager import EmployeeManager, resolve_evaluation_date
+from relations_manager import RelationsManager
+
+
+DEFAULT_SHARD_SIZE = 50_000
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_SHARD_TIMEOUT = 600.0
+TOKEN_VARIABLE = "PAYROLL_CLUSTER_TOKEN"
+
+# Wire protocol: every message is a JSON object preceded by its length (4 bytes, big-endian).
+#   worker -> coordinator: {"type": "ready", "token"} once, then {"type": "result", "shard_id", "salaries"}
+#                          or {"type": "error", "shard_id", "error"}
+#   coordinator -> worker: {"type": "shard", "shard_id", "as_of", "employees", "team_sizes"} or {"type": "done"}
+# Every result or error doubles as the request for the next shard. Connections whose
+# token does not match the coordinator's are closed without being answered.
+FRAME = struct.Struct(">I")
+
+
+def send_message(connection: socket.socket, message: dict) -> None:
+    data = json.dumps(message).encode("utf-8")
+    connection.sendall(FRAME.pack(len(data)) + data)
+
+
+def _receive_exactly(connection: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+
+def receive_message(connection: socket.socket) -> dict:
+    # Returns None once the peer has closed the connection.
+    header = _receive_exactly(connection, FRAME.size)
+    if header is None:
+        return None
+    data = _receive_exactly(connection, FRAME.unpack(header)[0])
+    if data is None:
+        return None
+    return json.loads(data)
+
+
+def partition_employees(relations_manager: RelationsManager, shard_size: int = DEFAULT_SHARD_SIZE) -> list:
+    # Employee ids in shards of shard_size, in employee_list order. Teams may be split
+    # across shards: a leader's salary needs only its team size, which travels with the
+    # shard, so nested hierarchies never force everyone onto one worker.
+    if shard_size < 1:
+        raise ValueError("shard_size must be positive")
+    employee_ids = [employee.id for employee in relations_manager.iter_employees()]
+    return [employee_ids[start:start + shard_size] for start in range(0, len(employee_ids), shard_size)]
+
+
+class PayrollClusterError(RuntimeError):
+    pass
+
+
+def compute_shard(message: dict) -> list:
+    # Salaries of one shard, computed from its own employees and the team sizes of its leaders.
+    employees = [parse_record(record)[0] for record in message["employees"]]
+    team_sizes = {leader_id: size for leader_id, size in message["team_sizes"]}
+    salaries = EmployeeManager(RelationsManager(employees, {})).calculate_salaries(
+        employees, team_sizes, datetime.date.fromisoformat(message["as_of"]))
+
+    return [[employee.id, salary] for employee, salary in zip(employees, salaries)]
+
+
+def run_worker(host: str, port: int, token: str) -> int:
+    # Computes shards handed out by the coordinator until it answers "done".
+    shard_count = 0
+    with socket.create_connection((host, port)) as connection:
+        send_message(connection, {"type": "ready", "token": token})
+        while (message := receive_message(connection)) is not None and message["type"] == "shard":
+            try:
+                salaries = compute_shard(message)
+            except Exception as error:
+                # Reported instead of crashing, so the coordinator can count the attempt.
+                send_message(connection, {"type": "error", "shard_id": message["shard_id"], "error": repr(error)})
+                continue
+            send_message(connection, {"type": "result", "shard_id": message["shard_id"], "salaries": salaries})
+            shard_count += 1
+    return shard_count
+
+
+class PayrollCoordinator:
+    # Hands the team shards out to every worker that connects and merges their results.
+    # A shard whose worker disconnects or reports an error before answering goes back to
+    # the queue, up to max_attempts dispatches; finished shards are kept and never
+    # dispatched again. Workers must present `token` (a random one by default) to get shards,
+    # and answer each shard within shard_timeout seconds or lose it to the next worker.
+    def __init__(self, relations_manager: RelationsManager, shard_size: int = DEFAULT_SHARD_SIZE,
+                 as_of: datetime.date = None, host: str = "127.0.0.1", port: int = 0,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, token: str = None,
+                 shard_timeout: float = DEFAULT_SHARD_TIMEOUT):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be positive")
+        self.relations_manager = relations_manager
+        self.as_of = resolve_evaluation_date(as_of)
+        self.shards = partition_employees(relations_manager, shard_size)
+        self.team_sizes = relations_manager.get_team_sizes()
+        self.max_attempts = max_attempts
+        self.shard_timeout = shard_timeout
+        self.token = token or secrets.token_hex(16)
+        self.dispatches = 0
+
+        self._pending = collections.deque(range(len(self.shards)))
+        self._attempts = collections.Counter()
+        self._results = {}
+        self._failed = {}
+        self._closed = False
+        self._condition = threading.Condition()
+        self._server = socket.create_server((host, port))
+
+    @property
+    def address(self) -> tuple:
+        return self._server.getsockname()[:2]
+
+    def start(self) -> "PayrollCoordinator":
+        threading.Thread(target=self._accept_workers, daemon=True).start()
+        return self
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._server.close()
+
+    def __enter__(self) -> "PayrollCoordinator":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _finished(self) -> bool:
+        return len(self._results) == len(self.shards)
+
+    @property
+    def pending_shards(self) -> int:
+        with self._condition:
+            return len(self.shards) - len(self._results)
+
+    def _accept_workers(self) -> None:
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve_worker, args=(connection,), daemon=True).start()
+
+    def _next_shard(self):
+        # Blocks while every unfinished shard is out with a worker: one of them may still crash.
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending or self._finished() or self._failed or self._closed)
+            if not self._pending or self._failed:
+                return None
+            shard_id = self._pending.popleft()
+            self.dispatches += 1
+            self._attempts[shard_id] += 1
+            return shard_id
+
+    def _requeue(self, shard_id: int, error: str) -> None:
+        # A shard that keeps failing is reported instead of being bounced between workers.
+        with self._condition:
+            if shard_id in self._results:
+                return
+            if self._attempts[shard_id] >= self.max_attempts:
+                self._failed[shard_id] = error
+            else:
+                self._pending.appendleft(shard_id)
+            self._condition.notify_all()
+
+    def _shard_message(self, shard_id: int) -> dict:
+        employee_ids = self.shards[shard_id]
+        return {
+            "type": "shard",
+            "shard_id": shard_id,
+            "as_of": self.as_of.isoformat(),
+            "employees": [to_record(self.relations_manager.get_employee(employee_id)) for employee_id in employee_ids],
+            "team_sizes": [[employee_id, self.team_sizes[employee_id]] for employee_id in employee_ids
+                           if employee_id in self.team_sizes],
+        }
+
+    def _authenticated(self, message: dict) -> bool:
+        token = message.get("token") if isinstance(message, dict) and message.get("type") == "ready" else None
+        return isinstance(token, str) and hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8"))
+
+    def _valid_result(self, shard_id: int, salaries) -> bool:
+        # Exactly one [id, salary] pair for every employee of the dispatched shard.
+        if not isinstance(salaries, list) or len(salaries) != len(self.shards[shard_id]):
+            return False
+        if not all(isinstance(pair, list) and len(pair) == 2 and type(pair[1]) is int for pair in salaries):
+            return False
+        return {pair[0] for pair in salaries} == set(self.shards[shard_id])
+
+    def _serve_worker(self, connection: socket.socket) -> None:
+        shard_id = None
+        error = "worker disconnected"
+        try:
+            with connection:
+                # A worker host that vanishes without closing the connection times out
+                # instead of holding its shard forever.
+                connection.settimeout(self.shard_timeout)
+                if not self._authenticated(receive_message(connection)):
+                    return
+                message = None
+                while True:
+                    if shard_id is not None:
+                        # Anything but an answer to the outstanding shard drops the worker;
+                        # the finally clause hands the shard to the next one.
+                        if not (isinstance(message, dict) and message.get("shard_id") == shard_id
+                                and message.get("type") in ("result", "error")):
+                            error = f"unexpected reply to shard {shard_id}"
+                            return
+                        if message["type"] == "error":
+                            self._requeue(shard_id, str(message.get("error", "worker error")))
+                        else:
+                            if not self._valid_result(shard_id, message.get("salaries")):
+                                error = f"worker returned salaries for other employees than shard {shard_id}"
+                                return
+                            with self._condition:
+                                self._results[shard_id] = message["salaries"]
+                                self._condition.notify_all()
+                        shard_id = None
+                    shard_id = self._next_shard()
+                    if shard_id is None:
+                        send_message(connection, {"type": "done"})
+                        return
+                    send_message(connection, self._shard_message(shard_id))
+                    if (message := receive_message(connection)) is None:
+                        return
+        except (OSError, ValueError) as exception:
+            error = repr(exception)
+        finally:
+            if shard_id is not None:
+                self._requeue(shard_id, error)
+
+    def wait(self, timeout: float = None) -> dict:
+        # Salaries keyed by employee id, in id order, once every shard has been computed.
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._finished() or self._failed, timeout):
+                raise TimeoutError(f"{len(self._results)} of {len(self.shards)} shards finished")
+            if self._failed:
+                raise PayrollClusterError(f"Shards failed after {self.max_attempts} attempts: {self._failed}")
+            pairs = [pair for salaries in self._results.values() for pair in salaries]
+
+        return dict(sorted(pairs))
+
+
+def run_local(relations_manager: RelationsManager, workers: int = None, shard_size: int = DEFAULT_SHARD_SIZE,
+              as_of: datetime.date = None, timeout: float = None) -> dict:
+    # Coordinator plus worker processes on this machine, talking over localhost sockets.
+    with PayrollCoordinator(relations_manager, shard_size, as_of) as coordinator:
+        processes = [multiprocessing.Process(target=run_worker, args=(*coordinator.address, coordinator.token),
+                                             daemon=True)
+                     for _ in range(min(workers or os.cpu_count() or 1, max(1, len(coordinator.shards))))]
+        for process in processes:
+            process.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                try:
+                    return coordinator.wait(0.1 if deadline is None else min(0.1, max(0.0, deadline - time.monotonic())))
+                except TimeoutError:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise
+                # Workers only exit on "done" or when they crash; with shards left, nobody will finish them.
+                if not any(process.is_alive() for process in processes) and coordinator.pending_shards:
+                    raise PayrollClusterError(f"All workers exited with {coordinator.pending_shards} shards pending")
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Distributed payroll coordinator and worker.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    coordinator_parser = subcommands.add_parser("coordinator", help="serve the shards of a snapshot to workers")
+    coordinator_parser.add_argument("--snapshot", required=True)
+    coordinator_parser.add_argument("--host", default="127.0.0.1",
+                                    help="interface to listen on; only expose it on trusted networks")
+    coordinator_parser.add_argument("--port", type=int, default=5555)
+    coordinator_parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    coordinator_parser.add_argument("--as-of", type=datetime.date.fromisoformat, default=None)
+
+    worker_parser = subcommands.add_parser("worker", help="compute shards for a coordinator")
+    worker_parser.add_argument("host")
+    worker_parser.add_argument("port", type=int)
+    args = parser.parse_args(argv)
+    # Shared secret of coordinator and workers, taken from the environment so it stays out of `ps`.
+    token = os.environ.get(TOKEN_VARIABLE)
+
+    if args.command == "worker":
+        if not token:
+            parser.error(f"{TOKEN_VARIABLE} must be set to the coordinator's token")
+        run_worker(args.host, args.port, token)
+        return 0
+
+    relations_manager = RelationsManager.open_snapshot(args.snapshot)
+    with PayrollCoordinator(relations_manager, args.shard_size, args.as_of, args.host, args.port,
+                            token=token) as coordinator:
+        print(f"Serving {len(coordinator.shards)} shards on {coordinator.address[0]}:{coordinator.address[1]}",
+              file=sys.stderr)
+        if not token:
+            print(f"Workers need {TOKEN_VARIABLE}={coordinator.token}", file=sys.stderr)
+        for employee_id, salary in coordinator.wait().items():
+            print(f"{employee_id},{salary}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
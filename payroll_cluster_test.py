@@ -0,0 +1,208 @@
+import datetime
+import socket
+import pytest # type: ignore
+
+import payroll_cluster
+from employee import Employee
+from employee_manager import EmployeeManager
+from org_generator import generate_org
+from relations_manager import RelationsManager
+
+
+AS_OF = datetime.date(2025, 3, 15)
+
+
+@pytest.fixture
+def relations_manager():
+    """
+    Creates a RelationsManager over a generated organisation of 300 employees,
+    with one nested team: a leader who is also a member of another team.
+
+    Returns:
+        RelationsManager: An instance of the RelationsManager class.
+    """
+    relations_manager = generate_org(300, team_size=5, seed=11)
+    leaders = list(relations_manager.teams)
+    relations_manager.add_team_member(leaders[0], leaders[-1])
+    return relations_manager
+
+
+def expected_salaries(relations_manager):
+    """
+    Computes every salary on a single machine.
+
+    Returns:
+        dict: Salaries keyed by employee id, in id order.
+    """
+    employee_manager = EmployeeManager(relations_manager)
+    return dict(sorted((e.id, employee_manager.calculate_salary(e, AS_OF))
+                       for e in relations_manager.get_all_employees()))
+
+
+def test_partition_balances_nested_hierarchies():
+    """
+    Test that a connected hierarchy (a leader above sub-leaders above members)
+    is still split into shards of shard_size, covering every employee once.
+    """
+    relations_manager = generate_org(1_000, team_size=9, seed=4)
+    top_leader, *sub_leaders = list(relations_manager.teams)
+    for leader_id in sub_leaders:
+        relations_manager.add_team_member(top_leader, leader_id)
+
+    shards = payroll_cluster.partition_employees(relations_manager, shard_size=100)
+
+    assert [len(shard) for shard in shards] == [100] * 10
+    assert sorted(sum(shards, [])) == sorted(e.id for e in relations_manager.get_all_employees())
+
+    with pytest.raises(ValueError):
+        payroll_cluster.partition_employees(relations_manager, shard_size=0)
+
+
+def test_run_local_matches_single_machine(relations_manager):
+    """
+    Test that a coordinator with local worker processes computes the same
+    salaries as a single machine.
+    """
+    salaries = payroll_cluster.run_local(relations_manager, workers=3, shard_size=40, as_of=AS_OF, timeout=60)
+
+    assert salaries == expected_salaries(relations_manager)
+
+
+def test_crashed_worker_shard_is_reassigned(relations_manager):
+    """
+    Test that the shard of a worker that disconnects mid-shard is handed to the
+    next worker, while the shard it finished earlier is not computed again.
+
+    Verify:
+        - The merged salaries are complete and correct.
+        - Only the abandoned shard was dispatched twice.
+    """
+    with payroll_cluster.PayrollCoordinator(relations_manager, shard_size=40, as_of=AS_OF) as coordinator:
+        with socket.create_connection(coordinator.address) as connection:
+            payroll_cluster.send_message(connection, {"type": "ready", "token": coordinator.token})
+            first = payroll_cluster.receive_message(connection)
+            payroll_cluster.send_message(connection, {"type": "result", "shard_id": first["shard_id"],
+                                                      "salaries": payroll_cluster.compute_shard(first)})
+            abandoned = payroll_cluster.receive_message(connection)
+        assert abandoned["type"] == "shard"
+
+        assert payroll_cluster.run_worker(*coordinator.address, coordinator.token) == len(coordinator.shards) - 1
+        assert coordinator.wait(timeout=10) == expected_salaries(relations_manager)
+        assert coordinator.dispatches == len(coordinator.shards) + 1
+
+
+def test_wait_times_out_without_workers():
+    """
+    Test that waiting without any connected worker raises TimeoutError.
+    """
+    with payroll_cluster.PayrollCoordinator(RelationsManager(), as_of=AS_OF) as coordinator:
+        with pytest.raises(TimeoutError):
+            coordinator.wait(timeout=0.1)
+
+
+def test_poison_shard_is_reported(relations_manager):
+    """
+    Test that a shard every worker fails on is given up after max_attempts
+    dispatches instead of being handed out forever.
+
+    Verify:
+        - wait raises PayrollClusterError naming the shard and the worker's error.
+        - The shard was dispatched exactly max_attempts times.
+    """
+    with payroll_cluster.PayrollCoordinator(relations_manager, shard_size=1000, as_of=AS_OF,
+                                            max_attempts=2) as coordinator:
+        with socket.create_connection(coordinator.address) as connection:
+            payroll_cluster.send_message(connection, {"type": "ready", "token": coordinator.token})
+            while (message := payroll_cluster.receive_message(connection))["type"] == "shard":
+                payroll_cluster.send_message(connection, {"type": "error", "shard_id": message["shard_id"],
+                                                          "error": "ZeroDivisionError()"})
+
+        with pytest.raises(payroll_cluster.PayrollClusterError, match="ZeroDivisionError"):
+            coordinator.wait(timeout=10)
+        assert coordinator.dispatches == 2
+
+
+def exit_immediately(*args):
+    pass
+
+
+def test_run_local_raises_when_all_workers_exit(relations_manager, monkeypatch):
+    """
+    Test that run_local raises instead of waiting forever once every worker
+    process has exited with shards still pending.
+    """
+    monkeypatch.setattr(payroll_cluster, "run_worker", exit_immediately)
+
+    with pytest.raises(payroll_cluster.PayrollClusterError, match="shards pending"):
+        payroll_cluster.run_local(relations_manager, workers=2, shard_size=40, as_of=AS_OF)
+
+
+@pytest.mark.parametrize("ready", [{"type": "ready"}, {"type": "ready", "token": "guess"}, {"type": "result"}])
+def test_worker_without_token_is_rejected(relations_manager, ready):
+    """
+    Test that a connection without the coordinator's token is closed without
+    being handed any shard.
+    """
+    with payroll_cluster.PayrollCoordinator(relations_manager, shard_size=40, as_of=AS_OF) as coordinator:
+        with socket.create_connection(coordinator.address) as connection:
+            payroll_cluster.send_message(connection, ready)
+            assert payroll_cluster.receive_message(connection) is None
+        assert coordinator.dispatches == 0
+
+
+def test_result_for_other_employees_is_rejected(relations_manager):
+    """
+    Test that a result whose employee ids differ from the dispatched shard is
+    dropped, the connection closed and the shard handed to the next worker.
+    """
+    with payroll_cluster.PayrollCoordinator(relations_manager, shard_size=40, as_of=AS_OF) as coordinator:
+        with socket.create_connection(coordinator.address) as connection:
+            payroll_cluster.send_message(connection, {"type": "ready", "token": coordinator.token})
+            shard = payroll_cluster.receive_message(connection)
+            salaries = payroll_cluster.compute_shard(shard)
+            salaries[0][0] = -1
+            payroll_cluster.send_message(connection, {"type": "result", "shard_id": shard["shard_id"],
+                                                      "salaries": salaries})
+            assert payroll_cluster.receive_message(connection) is None
+
+        payroll_cluster.run_worker(*coordinator.address, coordinator.token)
+        assert coordinator.wait(timeout=10) == expected_salaries(relations_manager)
+        assert coordinator.dispatches == len(coordinator.shards) + 1
+
+
+@pytest.mark.parametrize("reply", [
+    {"type": "result", "shard_id": -1, "salaries": []},
+    {"type": "ready"},
+    [1, 2, 3],
+])
+def test_unexpected_reply_requeues_the_shard(relations_manager, reply):
+    """
+    Test that a reply which does not answer the outstanding shard closes the
+    connection and hands that shard to the next worker instead of losing it.
+    """
+    with payroll_cluster.PayrollCoordinator(relations_manager, shard_size=40, as_of=AS_OF) as coordinator:
+        with socket.create_connection(coordinator.address) as connection:
+            payroll_cluster.send_message(connection, {"type": "ready", "token": coordinator.token})
+            assert payroll_cluster.receive_message(connection)["type"] == "shard"
+            payroll_cluster.send_message(connection, reply)
+            assert payroll_cluster.receive_message(connection) is None
+
+        payroll_cluster.run_worker(*coordinator.address, coordinator.token)
+        assert coordinator.wait(timeout=10) == expected_salaries(relations_manager)
+        assert coordinator.dispatches == len(coordinator.shards) + 1
+
+
+def test_silent_worker_times_out(relations_manager):
+    """
+    Test that a worker which holds a shard without answering or closing the
+    connection loses it after shard_timeout seconds.
+    """
+    with payroll_cluster.PayrollCoordinator(relations_manager, shard_size=40, as_of=AS_OF,
+                                            shard_timeout=0.2) as coordinator:
+        with socket.create_connection(coordinator.address) as connection:
+            payroll_cluster.send_message(connection, {"type": "ready", "token": coordinator.token})
+            assert payroll_cluster.receive_message(connection)["type"] == "shard"
+
+            payroll_cluster.run_worker(*coordinator.address, coordinator.token)
+            assert coordinator.wait(timeout=10) == expected_salaries(relations_manager)
+            assert coordinator.dispatches == len(coordinator.shards) + 1
@@ -0,0 +1,167 @@
+import csv
+import datetime
+import struct
+from dataclasses import dataclass
+import numpy as np
+from employee_loader import DEFAULT_CHUNK_SIZE, chunked
+from employee_manager import EmployeeManager, resolve_evaluation_date
+from employee_table import EmployeeTable
+
+
+CSV_FIELDS = ("id", "first_name", "last_name", "base_salary", "tenure_bonus", "leader_bonus", "salary")
+
+# Writes go through a large buffer, so every chunk reaches the OS in a few big writes.
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Columnar payslip file layout (all sections 8-byte aligned, little-endian):
+#   header
+#   row groups, one per exported chunk, until the end of the file:
+#     group header:    rows, dictionary size, dictionary blob size
+#     numeric columns: ids q, base_salaries q, tenure_bonuses q, leader_bonuses q
+#     name columns:    first name codes I, last name codes I (indexes into the dictionary)
+#     name dictionary: offsets Q (dictionary size + 1), UTF-8 blob
+MAGIC = b"PAYSLIP\0"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sII")
+GROUP_HEADER = struct.Struct("<3Q")
+NUMERIC_COLUMNS = ("ids", "base_salaries", "tenure_bonuses", "leader_bonuses")
+
+
+class PayslipFormatError(ValueError):
+    pass
+
+
+@dataclass
+class PayslipChunk:
+    ids: np.ndarray
+    first_names: list
+    last_names: list
+    base_salaries: np.ndarray
+    tenure_bonuses: np.ndarray
+    leader_bonuses: np.ndarray
+
+    @property
+    def salaries(self) -> np.ndarray:
+        return self.base_salaries + self.tenure_bonuses + self.leader_bonuses
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _employee_chunks(employees, chunk_size: int):
+    if isinstance(employees, EmployeeTable):
+        # Column slices keep the table fast path of payroll_columns and never build views per row.
+        for start in range(0, len(employees), chunk_size):
+            columns = (column[start:start + chunk_size] for column in employees._columns())
+            yield EmployeeTable.from_columns(*columns, names=employees.names)
+    else:
+        yield from chunked(employees, chunk_size)
+
+
+def _names(chunk) -> tuple:
+    if isinstance(chunk, EmployeeTable):
+        names = chunk.names
+        return [names[i] for i in chunk.first_names], [names[i] for i in chunk.last_names]
+    return [e.first_name for e in chunk], [e.last_name for e in chunk]
+
+
+def iter_payslip_chunks(employee_manager: EmployeeManager, employees=None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        as_of: datetime.date = None):
+    # Salary breakdowns of `employees` (all of them by default), one chunk at a time.
+    # Team sizes and the evaluation date are fixed once for the whole export.
+    if employees is None:
+        employees = employee_manager.relations_manager.get_all_employees()
+    as_of = resolve_evaluation_date(as_of)
+    team_sizes = employee_manager.team_size_arrays()
+
+    for chunk in _employee_chunks(employees, chunk_size):
+        components = employee_manager.salary_components(chunk, team_sizes, as_of)
+        first_names, last_names = _names(chunk)
+        yield PayslipChunk(components.ids, first_names, last_names, components.base_salaries,
+                           components.tenure_bonuses, components.leader_bonuses)
+
+
+def write_csv(path, chunks) -> int:
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_FIELDS)
+        for chunk in chunks:
+            writer.writerows(zip(chunk.ids.tolist(), chunk.first_names, chunk.last_names,
+                                 chunk.base_salaries.tolist(), chunk.tenure_bonuses.tolist(),
+                                 chunk.leader_bonuses.tolist(), chunk.salaries.tolist()))
+            rows += len(chunk)
+    return rows
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % 8)
+
+
+def _dictionary_encode(first_names: list, last_names: list) -> tuple:
+    # Names repeat heavily, so each row group stores every distinct name once.
+    dictionary = {}
+    first_codes = np.fromiter((dictionary.setdefault(name, len(dictionary)) for name in first_names),
+                              dtype="<u4", count=len(first_names))
+    last_codes = np.fromiter((dictionary.setdefault(name, len(dictionary)) for name in last_names),
+                             dtype="<u4", count=len(last_names))
+
+    encoded = [name.encode("utf-8") for name in dictionary]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.uint64, count=len(encoded)), out=offsets[1:])
+    return first_codes, last_codes, offsets, b"".join(encoded)
+
+
+def write_columnar(path, chunks) -> int:
+    rows = 0
+    with open(path, "wb", buffering=WRITE_BUFFER_SIZE) as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0))
+        for chunk in chunks:
+            first_codes, last_codes, offsets, blob = _dictionary_encode(chunk.first_names, chunk.last_names)
+            file.write(GROUP_HEADER.pack(len(chunk), len(offsets) - 1, len(blob)))
+            for name in NUMERIC_COLUMNS:
+                file.write(np.ascontiguousarray(getattr(chunk, name), dtype="<i8").tobytes())
+            for data in (first_codes.tobytes(), last_codes.tobytes(), offsets.tobytes(), blob):
+                file.write(data + _padding(len(data)))
+            rows += len(chunk)
+    return rows
+
+
+def iter_columnar(path):
+    # Reads a columnar payslip file back one row group (exported chunk) at a time.
+    with open(path, "rb") as file:
+        header = file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise PayslipFormatError(f"{path} is too small to be a payslip file")
+        magic, version, _ = HEADER.unpack(header)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise PayslipFormatError(f"{path} is not a version {FORMAT_VERSION} payslip file")
+
+        def section(size: int) -> bytes:
+            data = file.read(size + len(_padding(size)))
+            if len(data) < size:
+                raise PayslipFormatError(f"{path} is truncated")
+            return data[:size]
+
+        while group_header := file.read(GROUP_HEADER.size):
+            if len(group_header) != GROUP_HEADER.size:
+                raise PayslipFormatError(f"{path} is truncated")
+            rows, dictionary_size, blob_size = GROUP_HEADER.unpack(group_header)
+            numeric = {name: np.frombuffer(section(8 * rows), dtype="<i8") for name in NUMERIC_COLUMNS}
+            first_codes = np.frombuffer(section(4 * rows), dtype="<u4").tolist()
+            last_codes = np.frombuffer(section(4 * rows), dtype="<u4").tolist()
+            bounds = np.frombuffer(section(8 * (dictionary_size + 1)), dtype="<u8").tolist()
+            blob = section(blob_size)
+            dictionary = [blob[start:stop].decode("utf-8") for start, stop in zip(bounds, bounds[1:])]
+            yield PayslipChunk(first_names=[dictionary[code] for code in first_codes],
+                               last_names=[dictionary[code] for code in last_codes], **numeric)
+
+
+def export(employee_manager: EmployeeManager, path, format: str = "csv", employees=None,
+           chunk_size: int = DEFAULT_CHUNK_SIZE, as_of: datetime.date = None) -> int:
+    # Streams the payslips of `employees` to `path`; returns the number of rows written.
+    writers = {"csv": write_csv, "columnar": write_columnar}
+    if format not in writers:
+        raise ValueError(f"Unknown export format {format!r}, expected one of {sorted(writers)}")
+
+    return writers[format](path, iter_payslip_chunks(employee_manager, employees, chunk_size, as_of))
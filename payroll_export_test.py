@@ -0,0 +1,126 @@
+import csv
+import datetime
+import pytest # type: ignore
+
+import payroll_export
+from employee import Employee
+from employee_manager import EmployeeManager
+from org_generator import generate_org
+from relations_manager import RelationsManager
+
+
+AS_OF = datetime.date(2025, 3, 15)
+
+
+@pytest.fixture
+def employee_manager():
+    """
+    Creates an EmployeeManager over a generated organisation of 1 000 employees.
+
+    Returns:
+        EmployeeManager: The manager used for the exports.
+    """
+    return EmployeeManager(generate_org(1_000, team_size=6, seed=3))
+
+
+@pytest.fixture
+def expected_salaries(employee_manager):
+    """
+    Computes every salary one employee at a time.
+
+    Returns:
+        dict: Salaries keyed by employee id, evaluated on AS_OF.
+    """
+    return {e.id: employee_manager.calculate_salary(e, AS_OF)
+            for e in employee_manager.relations_manager.get_all_employees()}
+
+
+def test_payslip_chunks_break_down_the_salary(employee_manager, expected_salaries):
+    """
+    Test that the streamed chunks are bounded by chunk_size and that base salary,
+    tenure bonus and leader bonus add up to the salary of calculate_salary.
+    """
+    chunks = list(payroll_export.iter_payslip_chunks(employee_manager, chunk_size=300, as_of=AS_OF))
+
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+    salaries = {i: s for chunk in chunks for i, s in zip(chunk.ids.tolist(), chunk.salaries.tolist())}
+    assert salaries == expected_salaries
+
+    leader = next(iter(employee_manager.relations_manager.teams))
+    chunk = next(c for c in chunks if leader in c.ids)
+    row = chunk.ids.tolist().index(leader)
+    assert chunk.leader_bonuses[row] > 0
+    assert chunk.tenure_bonuses[row] == (AS_OF.year - employee_manager.relations_manager.get_employee(leader).hire_date.year) * 100
+
+
+def test_csv_export(employee_manager, expected_salaries, tmp_path):
+    """
+    Test that the CSV export writes one row per employee with the full breakdown.
+    """
+    path = tmp_path / "payslips.csv"
+
+    assert payroll_export.export(employee_manager, path, "csv", chunk_size=256, as_of=AS_OF) == 1_000
+
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert tuple(rows[0]) == payroll_export.CSV_FIELDS
+    assert {int(r["id"]): int(r["salary"]) for r in rows} == expected_salaries
+    assert all(int(r["base_salary"]) + int(r["tenure_bonus"]) + int(r["leader_bonus"]) == int(r["salary"]) for r in rows)
+
+
+def test_columnar_export_round_trip(employee_manager, tmp_path):
+    """
+    Test that the columnar export reads back with the same values and names as
+    the chunks it was written from, including non-ASCII names.
+    """
+    path = tmp_path / "payslips.bin"
+    employee_manager.relations_manager.update_employee(Employee(
+        id=0, first_name="Zoë", last_name="Ångström", base_salary=1234,
+        birth_date=datetime.date(1980, 1, 1), hire_date=datetime.date(2000, 1, 1)))
+
+    assert payroll_export.export(employee_manager, path, "columnar", chunk_size=333, as_of=AS_OF) == 1_000
+
+    written = list(payroll_export.iter_payslip_chunks(employee_manager, chunk_size=333, as_of=AS_OF))
+    read = list(payroll_export.iter_columnar(path))
+    assert [len(c) for c in read] == [len(c) for c in written]
+    for expected, actual in zip(written, read):
+        assert actual.ids.tolist() == expected.ids.tolist()
+        assert actual.first_names == expected.first_names
+        assert actual.last_names == expected.last_names
+        assert actual.salaries.tolist() == expected.salaries.tolist()
+    assert "Zoë" in read[0].first_names
+
+
+def test_export_from_snapshot_and_list_storage(tmp_path):
+    """
+    Test that exporting from a memory-mapped snapshot gives the same file as
+    exporting from the in-memory relations data.
+    """
+    snapshot_path = tmp_path / "org.snap"
+    RelationsManager().save_snapshot(snapshot_path)
+
+    payroll_export.export(EmployeeManager(RelationsManager()), tmp_path / "list.bin", "columnar", as_of=AS_OF)
+    payroll_export.export(EmployeeManager(RelationsManager.open_snapshot(snapshot_path)), tmp_path / "snap.bin",
+                          "columnar", as_of=AS_OF)
+
+    assert (tmp_path / "list.bin").read_bytes() == (tmp_path / "snap.bin").read_bytes()
+
+
+def test_columnar_rejects_bad_files(employee_manager, tmp_path):
+    """
+    Test that foreign and truncated files raise PayslipFormatError and that
+    unknown export formats are rejected.
+    """
+    foreign = tmp_path / "foreign.bin"
+    foreign.write_bytes(b"not a payslip file")
+    with pytest.raises(payroll_export.PayslipFormatError):
+        list(payroll_export.iter_columnar(foreign))
+
+    path = tmp_path / "payslips.bin"
+    payroll_export.export(employee_manager, path, "columnar", as_of=AS_OF)
+    path.write_bytes(path.read_bytes()[:-100])
+    with pytest.raises(payroll_export.PayslipFormatError):
+        list(payroll_export.iter_columnar(path))
+
+    with pytest.raises(ValueError):
+        payroll_export.export(employee_manager, path, "parquet")
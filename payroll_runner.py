@@ -0,0 +1,99 @@
+import datetime
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from employee_manager import EmployeeManager, resolve_evaluation_date
+from employee_table import EmployeeTable
+from relations_manager import RelationsManager
+from snapshot import MappedIdIndex
+
+
+DEFAULT_SHARD_SIZE = 50_000
+
+# Per-process state, set up once by _init_worker and reused by every shard.
+_employee_manager = None
+_team_sizes = None
+_employees_by_id = None
+
+
+def _sorted_by_id(relations_manager: RelationsManager):
+    # Employees in id order. A table is gathered column by column into an id-ordered
+    # table, so shards are column slices that take the vectorised table path; a
+    # snapshot's id index already lists the rows in id order.
+    employees = relations_manager.get_all_employees()
+    if not isinstance(employees, EmployeeTable):
+        return sorted(employees, key=lambda employee: employee.id)
+    if isinstance(relations_manager._positions, MappedIdIndex):
+        rows = np.asarray(relations_manager._positions.rows)
+    else:
+        rows = np.argsort(np.asarray(employees.ids), kind="stable")
+    return EmployeeTable.from_columns(*(np.asarray(column)[rows] for column in employees._columns()),
+                                      names=employees.names)
+
+
+def _init_worker(relations_manager: RelationsManager, snapshot_path) -> None:
+    global _employee_manager, _team_sizes, _employees_by_id
+
+    if snapshot_path is not None:
+        relations_manager = RelationsManager.open_snapshot(snapshot_path)
+
+    _employee_manager = EmployeeManager(relations_manager)
+    _team_sizes = _employee_manager.team_size_arrays()
+    _employees_by_id = _sorted_by_id(relations_manager)
+
+
+def _run_shard(start: int, stop: int, as_of: datetime.date) -> list:
+    if isinstance(_employees_by_id, EmployeeTable):
+        shard = EmployeeTable.from_columns(*(column[start:stop] for column in _employees_by_id._columns()),
+                                           names=_employees_by_id.names)
+        ids = shard.ids.tolist()
+    else:
+        shard = _employees_by_id[start:stop]
+        ids = [employee.id for employee in shard]
+    salaries = _employee_manager.calculate_salaries(shard, _team_sizes, as_of)
+
+    return list(zip(ids, salaries))
+
+
+class PayrollRunner:
+    # Computes every salary on a process pool. Workers receive the relations data once,
+    # either pickled into the pool initializer or by opening a shared snapshot file,
+    # so each task only carries a (start, stop) range over the id-sorted employees.
+    def __init__(self, relations_manager: RelationsManager = None, snapshot_path=None,
+                 workers: int = None, shard_size: int = DEFAULT_SHARD_SIZE):
+        if (relations_manager is None) == (snapshot_path is None):
+            raise ValueError("Pass either a relations_manager or a snapshot_path")
+        if shard_size < 1:
+            raise ValueError("shard_size must be positive")
+
+        self.relations_manager = relations_manager
+        self.snapshot_path = snapshot_path
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+
+    def _employee_count(self) -> int:
+        if self.relations_manager is not None:
+            return len(self.relations_manager.get_all_employees())
+        return len(RelationsManager.open_snapshot(self.snapshot_path).get_all_employees())
+
+    def shards(self) -> list:
+        count = self._employee_count()
+        return [(start, min(start + self.shard_size, count)) for start in range(0, count, self.shard_size)]
+
+    def run(self, as_of: datetime.date = None):
+        # Yields (employee id, salary) pairs in id order while later shards are still running.
+        # The evaluation date is resolved here, so every worker uses the same one.
+        as_of = resolve_evaluation_date(as_of)
+        shards = self.shards()
+        if not shards:
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(shards)), initializer=_init_worker,
+                                 initargs=(self.relations_manager, self.snapshot_path)) as executor:
+            starts, stops = zip(*shards)
+            for results in executor.map(_run_shard, starts, stops, itertools.repeat(as_of)):
+                yield from results
+
+    def run_to_dict(self, as_of: datetime.date = None) -> dict:
+        return dict(self.run(as_of))
@@ -0,0 +1,103 @@
+import datetime
+import pytest # type: ignore
+
+from employee import Employee
+from employee_manager import EmployeeManager
+from payroll_runner import PayrollRunner
+from relations_manager import RelationsManager
+
+
+@pytest.fixture
+def relations_manager():
+    """
+    Creates a RelationsManager with 50 employees stored out of id order,
+    every fifth employee leading the next four.
+
+    Returns:
+        RelationsManager: An instance of the RelationsManager class.
+    """
+    employees = [
+        Employee(id=i, first_name=f"First{i}", last_name=f"Last{i}", base_salary=1000 + 10 * i,
+                 birth_date=datetime.date(1980, 1, 1), hire_date=datetime.date(2000 + i % 20, 1, 1))
+        for i in reversed(range(50))
+    ]
+    teams = {i: [i + 1, i + 2, i + 3, i + 4] for i in range(0, 50, 5)}
+    return RelationsManager(employees, teams)
+
+
+def expected_salaries(relations_manager):
+    """
+    Computes the expected salaries with the scalar calculate_salary path.
+
+    Returns:
+        list: (employee id, salary) pairs sorted by employee id.
+    """
+    employee_manager = EmployeeManager(relations_manager)
+    return sorted((e.id, employee_manager.calculate_salary(e)) for e in relations_manager.get_all_employees())
+
+
+def test_run_matches_scalar_path_in_id_order(relations_manager):
+    """
+    Test that a sharded parallel run yields every salary once, in id order,
+    with the same values as the scalar calculate_salary path.
+    """
+    runner = PayrollRunner(relations_manager, workers=2, shard_size=7)
+
+    assert len(runner.shards()) == 8
+    assert list(runner.run()) == expected_salaries(relations_manager)
+
+
+def test_run_on_table_out_of_id_order(relations_manager):
+    """
+    Test that a table-backed manager stored out of id order is gathered into id
+    order for the vectorised shards and yields the same salaries.
+    """
+    from employee_table import EmployeeTable
+
+    table_backed = RelationsManager(EmployeeTable(relations_manager.get_all_employees()), relations_manager.teams)
+    runner = PayrollRunner(table_backed, workers=2, shard_size=7)
+
+    assert list(runner.run()) == expected_salaries(relations_manager)
+
+
+def test_run_from_snapshot(tmp_path, relations_manager):
+    """
+    Test that workers can load their data from a snapshot file instead of
+    receiving a pickled RelationsManager.
+    """
+    path = tmp_path / "employees.snap"
+    relations_manager.save_snapshot(path)
+
+    runner = PayrollRunner(snapshot_path=path, workers=2, shard_size=16)
+
+    assert runner.run_to_dict() == dict(expected_salaries(relations_manager))
+
+
+def test_run_without_employees():
+    """
+    Test that running payroll on an empty organisation yields nothing.
+    """
+    assert list(PayrollRunner(RelationsManager([], {}), workers=2).run()) == []
+
+
+def test_invalid_arguments(relations_manager):
+    """
+    Test that the runner rejects ambiguous data sources and empty shards.
+    """
+    with pytest.raises(ValueError):
+        PayrollRunner()
+    with pytest.raises(ValueError):
+        PayrollRunner(relations_manager, snapshot_path="employees.snap")
+    with pytest.raises(ValueError):
+        PayrollRunner(relations_manager, shard_size=0)
+
+
+def test_run_as_of(relations_manager):
+    """
+    Test that every worker evaluates salaries for the given date.
+    """
+    as_of = datetime.date(2012, 1, 1)
+    employee_manager = EmployeeManager(relations_manager)
+    expected = {e.id: employee_manager.calculate_salary(e, as_of=as_of) for e in relations_manager.get_all_employees()}
+
+    assert PayrollRunner(relations_manager, workers=2, shard_size=20).run_to_dict(as_of) == expected
@@ -0,0 +1,92 @@
+import datetime
+from dataclasses import dataclass, field
+import numpy as np
+from employee_manager import EmployeeManager, resolve_evaluation_date
+
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+# Upper bound on scenario x salary-group cells evaluated at once, to keep memory bounded.
+DEFAULT_MAX_CELLS = 4_000_000
+
+
+@dataclass(frozen=True)
+class Scenario:
+    yearly_bonus: int
+    leader_bonus_per_member: int
+    name: str = ""
+
+    @classmethod
+    def current(cls) -> "Scenario":
+        return cls(EmployeeManager.yearly_bonus, EmployeeManager.leader_bonus_per_member, "current")
+
+
+@dataclass
+class ScenarioResult:
+    scenario: Scenario
+    total: int
+    mean: float
+    std: float
+    min: int
+    max: int
+    percentiles: dict = field(default_factory=dict)
+
+
+def simulate(employee_manager: EmployeeManager, scenarios, employees=None, as_of: datetime.date = None,
+             percentiles=DEFAULT_PERCENTILES, max_cells: int = DEFAULT_MAX_CELLS) -> list:
+    # Evaluates every (yearly_bonus, leader_bonus_per_member) scenario over the whole
+    # workforce without touching the EmployeeManager class variables. Salaries are linear
+    # in the two bonuses, so employees with the same base salary, tenure and team size are
+    # grouped first and each scenario is evaluated once per group, weighted by its size.
+    scenarios = [s if isinstance(s, Scenario) else Scenario(*s) for s in scenarios]
+    if employees is None:
+        employees = employee_manager.relations_manager.get_all_employees()
+    columns = employee_manager.payroll_columns(employees)
+    if not len(columns):
+        raise ValueError("Cannot simulate a payroll without employees")
+
+    years_at_company = resolve_evaluation_date(as_of).year - columns.hire_years
+    groups, weights = np.unique(np.stack([columns.base_salaries, years_at_company, columns.team_members_counts], axis=1),
+                                axis=0, return_counts=True)
+    base_salaries, years, members = groups.T
+    count = weights.sum()
+
+    yearly_bonuses = np.array([s.yearly_bonus for s in scenarios], dtype=np.int64)
+    leader_bonuses = np.array([s.leader_bonus_per_member for s in scenarios], dtype=np.int64)
+
+    # Totals only need the column sums: O(K) once the sums are known.
+    totals = ((weights * base_salaries).sum() + yearly_bonuses * (weights * years).sum()
+              + leader_bonuses * (weights * members).sum())
+
+    results = []
+    chunk_size = max(1, max_cells // len(groups))
+    for start in range(0, len(scenarios), chunk_size):
+        stop = min(start + chunk_size, len(scenarios))
+        salaries = (base_salaries + yearly_bonuses[start:stop, None] * years
+                    + leader_bonuses[start:stop, None] * members)
+
+        means = totals[start:stop] / count
+        variances = (weights * salaries.astype(np.float64) ** 2).sum(axis=1) / count - means ** 2
+
+        # Weighted percentiles (inverted CDF): sort each scenario row and walk the cumulative weights.
+        order = np.argsort(salaries, axis=1, kind="stable")
+        sorted_salaries = np.take_along_axis(salaries, order, axis=1)
+        cumulative_weights = np.cumsum(weights[order], axis=1)
+        quantiles = {}
+        for percentile in percentiles:
+            threshold = percentile / 100 * count
+            index = np.minimum((cumulative_weights < threshold).sum(axis=1), len(groups) - 1)
+            quantiles[percentile] = np.take_along_axis(sorted_salaries, index[:, None], axis=1)[:, 0]
+
+        for row, scenario in enumerate(scenarios[start:stop]):
+            results.append(ScenarioResult(
+                scenario=scenario,
+                total=int(totals[start + row]),
+                mean=float(means[row]),
+                std=float(np.sqrt(max(variances[row], 0.0))),
+                min=int(sorted_salaries[row, 0]),
+                max=int(sorted_salaries[row, -1]),
+                percentiles={p: int(values[row]) for p, values in quantiles.items()},
+            ))
+
+    return results
@@ -0,0 +1,93 @@
+import datetime
+import numpy as np
+import pytest # type: ignore
+
+from employee_manager import EmployeeManager
+from org_generator import generate_org
+from payroll_simulation import Scenario, simulate
+from relations_manager import RelationsManager
+
+
+AS_OF = datetime.date(2025, 1, 1)
+
+
+@pytest.fixture
+def employee_manager():
+    """
+    Creates an EmployeeManager over a generated organisation of 2000 employees.
+
+    Returns:
+        EmployeeManager: An instance of the EmployeeManager class.
+    """
+    return EmployeeManager(generate_org(2_000, team_size=5, distribution="uniform", seed=4))
+
+
+def brute_force(employee_manager, scenario):
+    """
+    Computes the salaries of a scenario by temporarily changing the class variables.
+
+    Returns:
+        numpy.ndarray: The salaries of every employee under the scenario.
+    """
+    yearly_bonus, leader_bonus = EmployeeManager.yearly_bonus, EmployeeManager.leader_bonus_per_member
+    EmployeeManager.yearly_bonus, EmployeeManager.leader_bonus_per_member = scenario
+    try:
+        employees = employee_manager.relations_manager.get_all_employees()
+        return np.array(employee_manager.calculate_salaries(employees, as_of=AS_OF))
+    finally:
+        EmployeeManager.yearly_bonus, EmployeeManager.leader_bonus_per_member = yearly_bonus, leader_bonus
+
+
+def test_simulation_matches_brute_force(employee_manager):
+    """
+    Test that totals and distributions of every scenario match a brute force
+    payroll run with the bonus class variables changed, also when the
+    scenarios are evaluated in several chunks.
+    """
+    scenarios = [(0, 0), (100, 200), (150, 50), (30, 900)]
+
+    results = simulate(employee_manager, scenarios, as_of=AS_OF, percentiles=(0, 10, 50, 90, 100), max_cells=500)
+
+    for scenario, result in zip(scenarios, results):
+        salaries = brute_force(employee_manager, scenario)
+        assert result.scenario == Scenario(*scenario)
+        assert result.total == salaries.sum()
+        assert result.mean == pytest.approx(salaries.mean())
+        assert result.std == pytest.approx(salaries.std())
+        assert (result.min, result.max) == (salaries.min(), salaries.max())
+        for percentile, value in result.percentiles.items():
+            assert value == np.percentile(salaries, percentile, method="inverted_cdf")
+
+
+def test_current_scenario_matches_payroll():
+    """
+    Test that simulating the current class variables reproduces the real payroll
+    and leaves the class variables untouched.
+    """
+    relations_manager = RelationsManager()
+    employee_manager = EmployeeManager(relations_manager)
+
+    [result] = simulate(employee_manager, [Scenario.current()], as_of=AS_OF)
+
+    assert result.total == sum(employee_manager.calculate_salaries(relations_manager.get_all_employees(), as_of=AS_OF))
+    assert (EmployeeManager.yearly_bonus, EmployeeManager.leader_bonus_per_member) == (100, 200)
+
+
+def test_many_scenarios(employee_manager):
+    """
+    Test that a thousand scenarios are evaluated in one call.
+    """
+    scenarios = [(yearly_bonus, leader_bonus) for yearly_bonus in range(0, 500, 20) for leader_bonus in range(0, 1000, 25)]
+
+    results = simulate(employee_manager, scenarios, as_of=AS_OF)
+
+    assert len(results) == 1000
+    assert results[0].total < results[-1].total
+
+
+def test_simulation_without_employees():
+    """
+    Test that simulating an empty workforce raises ValueError.
+    """
+    with pytest.raises(ValueError):
+        simulate(EmployeeManager(RelationsManager([], {})), [(100, 200)])
@@ -1,9 +1,50 @@
 import datetime
 from employee import Employee
+from employee_table import EmployeeTable
+
+# The loaders, the snapshot format and the validator are imported where they are used:
+# opening a snapshot for a salary lookup needs neither CSV/JSON parsing nor validation.
+
+
+# Containers a copy shares with its original until one of them writes to it.
+COPY_ON_WRITE = frozenset(("employee_list", "teams", "_positions", "_member_ids", "_leaders_of", "_team_versions"))
+
+
+class _LeaderIndex:
+    # Member id -> frozenset of leader ids, split into pages so a copy shares every page
+    # it has not changed and a write copies a single page instead of the whole index.
+    PAGE_COUNT = 256
+
+    def __init__(self, pages=None):
+        self._pages = pages if pages is not None else [{} for _ in range(self.PAGE_COUNT)]
+        self._owned = set() if pages is not None else set(range(self.PAGE_COUNT))
+
+    def get(self, member_id: int, default=None):
+        return self._pages[hash(member_id) % self.PAGE_COUNT].get(member_id, default)
+
+    def __setitem__(self, member_id: int, leader_ids: frozenset) -> None:
+        page = hash(member_id) % self.PAGE_COUNT
+        if page not in self._owned:
+            self._pages[page] = dict(self._pages[page])
+            self._owned.add(page)
+        self._pages[page][member_id] = leader_ids
+
+    def copy(self) -> "_LeaderIndex":
+        self._owned = set()
+        return _LeaderIndex(list(self._pages))
 
 
 class RelationsManager:
-    def __init__(self):
+    read_only = False
+
+    def __init__(self, employee_list=None, teams=None):
+        if employee_list is not None:
+            # Any list-like storage works here, e.g. a compact EmployeeTable.
+            self.employee_list = employee_list
+            self.teams = teams if teams is not None else {}
+            self.reindex()
+            return
+
         self.employee_list = [
             Employee(id=1, first_name="John", last_name="Doe", base_salary=3000,
                      birth_date=datetime.date(1970, 1, 31), hire_date=datetime.date(1990, 10, 1)),
@@ -30,15 +71,290 @@ class RelationsManager:
             4: [5, 6]
         }
 
+        self.reindex()
+
+    @classmethod
+    def from_csv(cls, path, chunk_size: int = None, strict: bool = False) -> "RelationsManager":
+        import employee_loader
+        return cls._from_chunks(employee_loader.iter_csv_chunks(path, chunk_size or employee_loader.DEFAULT_CHUNK_SIZE),
+                                strict)
+
+    @classmethod
+    def from_jsonl(cls, path, chunk_size: int = None, strict: bool = False) -> "RelationsManager":
+        import employee_loader
+        return cls._from_chunks(employee_loader.iter_jsonl_chunks(path, chunk_size or employee_loader.DEFAULT_CHUNK_SIZE),
+                                strict)
+
+    @classmethod
+    def _from_chunks(cls, chunks, strict: bool = False) -> "RelationsManager":
+        # Parsed rows go straight into compact columns, one chunk at a time.
+        table = EmployeeTable()
+        teams = {}
+        for chunk in chunks:
+            for employee, leader_id in chunk:
+                table.append(employee)
+                if leader_id is not None:
+                    teams.setdefault(leader_id, []).append(employee.id)
+
+        relations_manager = cls(table, teams)
+        if strict and not relations_manager.validation_report.ok:
+            from team_validation import TeamIntegrityError
+            raise TeamIntegrityError(relations_manager.validation_report)
+        return relations_manager
+
+    @classmethod
+    def open_snapshot(cls, path) -> "RelationsManager":
+        # Columns, id index and teams are read-only views over the mapped file, so
+        # opening costs the same for any org size and forked workers share the pages.
+        import snapshot
+
+        table, teams, positions, flags = snapshot.load(path)
+        relations_manager = cls.__new__(cls)
+        relations_manager.employee_list = table
+        relations_manager.teams = teams
+        relations_manager._positions = positions
+        relations_manager._member_ids = teams
+        relations_manager._leaders_of = _LeaderIndex()
+        relations_manager._team_versions = {}
+        relations_manager._generation = 0
+        relations_manager._change_log = []
+        relations_manager._version = 0
+        relations_manager._shared = set()
+        relations_manager._owned_teams = None
+        # Validated when the snapshot was saved; opening must not scan the whole file.
+        relations_manager.validation_report = None
+        relations_manager._members_validated = bool(flags & snapshot.MEMBERS_VALIDATED)
+        relations_manager.read_only = True
+        return relations_manager
+
+    def save_snapshot(self, path) -> None:
+        import snapshot
+        snapshot.save(path, self.employee_list, self.teams, snapshot.MEMBERS_VALIDATED if self._members_validated else 0)
+
+    def copy(self) -> "RelationsManager":
+        # Copy-on-write: both versions share every container until one of them writes, and
+        # a write then copies only what it touches: a shallow copy of each dict or list it
+        # changes, the member lists of the teams it changes and one page of the leader index.
+        # The change log is shared too; only a version that falls behind a newer one copies
+        # its history. Change a copy through the methods below only: direct edits of teams
+        # or employee_list, or of Employee objects, show up in both versions.
+        self._check_writable()
+        relations_manager = self.__class__.__new__(self.__class__)
+        relations_manager.__dict__.update(self.__dict__)
+        for version in (self, relations_manager):
+            version._shared = set(COPY_ON_WRITE)
+            version._owned_teams = set()
+        return relations_manager
+
+    def _own(self, *names) -> None:
+        for name in names:
+            if name in self._shared:
+                self._shared.discard(name)
+                setattr(self, name, getattr(self, name).copy())
+
+    def _own_team(self, leader_id: int) -> None:
+        # _owned_teams is None when no other version shares any member list.
+        self._own("teams", "_member_ids", "_leaders_of")
+        if self._owned_teams is None or leader_id in self._owned_teams:
+            return
+        self._owned_teams.add(leader_id)
+        if leader_id in self.teams:
+            self.teams[leader_id] = list(self.teams[leader_id])
+        if leader_id in self._member_ids:
+            self._member_ids[leader_id] = dict(self._member_ids[leader_id])
+
+    def reindex(self) -> None:
+        # Rebuilds the lookup indexes; call it after mutating employee_list or teams directly.
+        # Maps ids to rows so table-backed storage never has to materialize every employee.
+        self._positions = {e.id: row for row, e in enumerate(self.employee_list)}
+        # Insertion-ordered dicts double as ordered sets: O(1) membership, team order kept.
+        self._member_ids = {leader_id: dict.fromkeys(member_ids) for leader_id, member_ids in self.teams.items()}
+        leaders_of = {}
+        for leader_id, member_ids in self._member_ids.items():
+            for member_id in member_ids:
+                leaders_of.setdefault(member_id, []).append(leader_id)
+        self._leaders_of = _LeaderIndex()
+        for member_id, leader_ids in leaders_of.items():
+            self._leaders_of[member_id] = frozenset(leader_ids)
+        # Only employee_list and teams (and their member lists) can still be shared with a copy.
+        self._shared = getattr(self, "_shared", set()) & {"employee_list", "teams"}
+        self._owned_teams = getattr(self, "_owned_teams", None)
+        self.validate()
+        # Versions let caches detect team changes; a reindex invalidates every team at once.
+        self._team_versions = {}
+        self._generation = getattr(self, "_generation", 0) + 1
+
+        # Entry i holds the ids whose salary the i-th mutation may have changed;
+        # None means the change is unknown and everyone has to be recalculated.
+        if not hasattr(self, "_change_log"):
+            self._change_log = []
+            self._version = 0
+        else:
+            self._append_change(None)
+
+    def validate(self, strict: bool = False) -> "ValidationReport":
+        # Checks the teams for unknown ids, duplicate memberships and leadership cycles in
+        # linear time. After a clean pass every member id is known to be an employee, so
+        # team lookups skip their per-member checks until a mutation could break that;
+        # mutations do not re-check for cycles or duplicates, call validate() again for that.
+        from team_validation import TeamIntegrityError, validate_teams
+
+        report = validate_teams(self._positions, self.teams)
+        self.validation_report = report
+        self._members_validated = report.ok
+        if strict and not report.ok:
+            raise TeamIntegrityError(report)
+        return report
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def changes_since(self, version: int):
+        # Returns the set of affected employee ids, or None if everything may have changed.
+        if not 0 <= version <= self.version:
+            raise ValueError(f"Unknown version {version}")
+        affected = set()
+        for employee_ids in self._change_log[version:self._version]:
+            if employee_ids is None:
+                return None
+            affected.update(employee_ids)
+
+        return affected
+
+    def _append_change(self, employee_ids) -> None:
+        if len(self._change_log) != self._version:
+            # A version sharing the log has appended past ours: keep our own history from here.
+            self._change_log = self._change_log[:self._version]
+        self._change_log.append(employee_ids)
+        self._version += 1
+
+    def _record_change(self, *employee_ids) -> None:
+        self._append_change(frozenset(employee_ids))
+
+    def team_version(self, leader_id: int) -> tuple:
+        return self._generation, self._team_versions.get(leader_id, 0)
+
+    def _touch_teams(self, leader_ids) -> None:
+        self._own("_team_versions")
+        for leader_id in leader_ids:
+            self._team_versions[leader_id] = self._team_versions.get(leader_id, 0) + 1
+
     def is_leader(self, employee) -> bool:
         return employee.id in self.teams
 
     def get_all_employees(self) -> list:
         return self.employee_list
 
+    def iter_employees(self):
+        yield from self.employee_list
+
+    def get_employee(self, employee_id: int) -> Employee:
+        row = self._positions.get(employee_id)
+        if row is not None:
+            return self.employee_list[row]
+
     def get_team_members(self, employee: Employee) -> list:
+        # Members in employee_list order, whatever order they joined the team in.
         if self.is_leader(employee):
-            member_ids = self.teams[employee.id]
-            members = [e.id for e in self.employee_list if e.id in member_ids]
+            member_ids = self._member_ids[employee.id]
+            if not self._members_validated:
+                member_ids = [member_id for member_id in member_ids if member_id in self._positions]
+            members = sorted(member_ids, key=self._positions.__getitem__)
 
             return members
+
+    def get_team_size(self, leader_id: int) -> int:
+        member_ids = self._member_ids.get(leader_id)
+        if member_ids is not None:
+            if self._members_validated:
+                return len(member_ids)
+            return sum(1 for member_id in member_ids if member_id in self._positions)
+
+    def get_team_sizes(self) -> dict:
+        return {leader_id: self.get_team_size(leader_id) for leader_id in self._member_ids}
+
+    def get_team_member_objects(self, leader: Employee) -> list:
+        if self.is_leader(leader):
+            return [self.employee_list[self._positions[member_id]] for member_id in self.get_team_members(leader)]
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise TypeError("This RelationsManager is read-only")
+
+    def add_employee(self, employee: Employee) -> None:
+        self._check_writable()
+        if employee.id in self._positions:
+            raise ValueError(f"Employee with id {employee.id} already exists")
+        self._own("_positions", "employee_list")
+        self._positions[employee.id] = len(self.employee_list)
+        self.employee_list.append(employee)
+        leader_ids = self._leaders_of.get(employee.id, ())
+        self._touch_teams(leader_ids)
+        self._record_change(employee.id, *leader_ids)
+
+    def update_employee(self, employee: Employee) -> None:
+        self._check_writable()
+        row = self._positions.get(employee.id)
+        if row is None:
+            raise KeyError(employee.id)
+        self._own("employee_list")
+        self.employee_list[row] = employee
+        self._record_change(employee.id)
+
+    def remove_employee(self, employee_id: int) -> None:
+        self._check_writable()
+        if employee_id not in self._positions:
+            raise KeyError(employee_id)
+        self._own("_positions", "employee_list")
+        row = self._positions.pop(employee_id)
+        del self.employee_list[row]
+        for later_row in range(row, len(self.employee_list)):
+            self._positions[self.employee_list[later_row].id] = later_row
+        leader_ids = self._leaders_of.get(employee_id, ())
+        if leader_ids:
+            self._members_validated = False
+        self._touch_teams(leader_ids)
+        self._record_change(employee_id, *leader_ids)
+
+    def add_team_member(self, leader_id: int, member_id: int) -> None:
+        self._check_writable()
+        if member_id in self._member_ids.get(leader_id, ()):
+            return
+        self._own_team(leader_id)
+        self._member_ids.setdefault(leader_id, {})[member_id] = None
+        if member_id not in self._positions:
+            self._members_validated = False
+        self.teams.setdefault(leader_id, []).append(member_id)
+        self._leaders_of[member_id] = self._leaders_of.get(member_id, frozenset()) | {leader_id}
+        self._touch_teams((leader_id,))
+        self._record_change(leader_id, member_id)
+
+    def remove_team_member(self, leader_id: int, member_id: int) -> None:
+        self._check_writable()
+        if member_id not in self._member_ids.get(leader_id, ()):
+            raise KeyError(member_id)
+        self._own_team(leader_id)
+        del self._member_ids[leader_id][member_id]
+        self.teams[leader_id].remove(member_id)
+        self._leaders_of[member_id] = self._leaders_of.get(member_id) - {leader_id}
+        self._touch_teams((leader_id,))
+        self._record_change(leader_id, member_id)
+
+    def move_team_member(self, member_id: int, new_leader_id: int) -> None:
+        # Leaves every current team and joins new_leader_id's, recorded as a single change.
+        self._check_writable()
+        old_leader_ids = set(self._leaders_of.get(member_id, ()))
+        for leader_id in old_leader_ids | {new_leader_id}:
+            self._own_team(leader_id)
+        for old_leader_id in old_leader_ids - {new_leader_id}:
+            del self._member_ids[old_leader_id][member_id]
+            self.teams[old_leader_id].remove(member_id)
+        if new_leader_id not in old_leader_ids:
+            self._member_ids.setdefault(new_leader_id, {})[member_id] = None
+            if member_id not in self._positions:
+                self._members_validated = False
+            self.teams.setdefault(new_leader_id, []).append(member_id)
+        self._leaders_of[member_id] = frozenset((new_leader_id,))
+        self._touch_teams(old_leader_ids | {new_leader_id})
+        self._record_change(member_id, new_leader_id, *old_leader_ids)
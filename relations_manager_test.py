@@ -82,3 +82,242 @@ def test_get_team_members(relations_manager):
     team_members_of_non_leader = relations_manager.get_team_members(non_leader) or []  
     assert team_members_of_non_leader == []  # Nem vezetőnek nincs csapata
 
+
+
+def test_get_team_members_follows_employee_list_order(relations_manager):
+    """
+    Test that team members come back in employee_list order, not in the order
+    they were listed in or joined the team, with and without validated teams.
+
+    Args:
+        relations_manager (RelationsManager): An instance of the RelationsManager class.
+    """
+    reordered = RelationsManager(relations_manager.get_all_employees(), {1: [3, 2], 4: [6, 5]})
+    assert reordered.get_team_members(reordered.get_employee(1)) == [2, 3]
+
+    reordered.remove_team_member(4, 5)
+    reordered.add_team_member(4, 5)
+    reordered.add_team_member(4, 999)
+    assert reordered.get_team_members(reordered.get_employee(4)) == [5, 6]
+
+
+def test_get_employee(relations_manager):
+    """
+    Test the id based `get_employee` lookup of the `RelationsManager` class.
+
+    Test cases:
+    1. A known id returns the matching Employee object.
+    2. An unknown id returns None.
+
+    Args:
+        relations_manager (RelationsManager): An instance of the RelationsManager class.
+    """
+    employee = relations_manager.get_employee(4)
+
+    assert employee is relations_manager.employee_list[3]  # Gretchen Watford (ID=4)
+    assert relations_manager.get_employee(999) is None
+
+
+def test_get_team_member_objects(relations_manager):
+    """
+    Test that `get_team_member_objects` resolves the member ids of a leader
+    to Employee objects and returns None for non-leaders, like `get_team_members`.
+
+    Args:
+        relations_manager (RelationsManager): An instance of the RelationsManager class.
+    """
+    leader = relations_manager.employee_list[3]  # Gretchen Watford (ID=4)
+    members = relations_manager.get_team_member_objects(leader)
+
+    assert [e.id for e in members] == [5, 6]
+    assert members[0].first_name == "Tomas"
+
+    non_leader = relations_manager.employee_list[1]
+    assert relations_manager.get_team_member_objects(non_leader) is None
+
+
+def test_team_mutations_keep_index_in_sync(relations_manager):
+    """
+    Test that employee and team mutations keep the lookup indexes up to date.
+
+    Test cases:
+    1. A newly added employee can be looked up and assigned to a team.
+    2. Adding the same member twice does not duplicate it.
+    3. A removed team member disappears from the team.
+    4. A removed employee is dropped from the team members, like unknown ids are.
+    5. Adding an employee with an existing id raises ValueError.
+
+    Args:
+        relations_manager (RelationsManager): An instance of the RelationsManager class.
+    """
+    import datetime
+
+    leader = relations_manager.get_employee(1)
+    new_employee = Employee(id=7, first_name="Ada", last_name="Lovelace", base_salary=2000,
+                            birth_date=datetime.date(1990, 1, 1), hire_date=datetime.date(2020, 1, 1))
+
+    relations_manager.add_employee(new_employee)
+    relations_manager.add_team_member(1, 7)
+    relations_manager.add_team_member(1, 7)
+    assert relations_manager.get_employee(7) is new_employee
+    assert relations_manager.get_team_members(leader) == [2, 3, 7]
+
+    relations_manager.remove_team_member(1, 2)
+    assert relations_manager.get_team_members(leader) == [3, 7]
+
+    relations_manager.remove_employee(7)
+    assert relations_manager.get_employee(7) is None
+    assert relations_manager.get_team_members(leader) == [3]
+
+    with pytest.raises(ValueError):
+        relations_manager.add_employee(relations_manager.get_employee(3))
+
+
+def test_reindex_after_direct_mutation(relations_manager):
+    """
+    Test that `reindex` picks up changes made directly to `teams`.
+
+    Args:
+        relations_manager (RelationsManager): An instance of the RelationsManager class.
+    """
+    relations_manager.teams[2] = [5]
+    relations_manager.reindex()
+
+    assert relations_manager.get_team_members(relations_manager.get_employee(2)) == [5]
+
+
+def test_get_team_sizes(relations_manager):
+    """
+    Test that `get_team_sizes` returns the member count of every leader,
+    counting only members that exist in the employee list.
+
+    Args:
+        relations_manager (RelationsManager): An instance of the RelationsManager class.
+    """
+    relations_manager.add_team_member(4, 999)
+
+    assert relations_manager.get_team_sizes() == {1: 2, 4: 2}
+    assert relations_manager.get_team_size(4) == 2
+    assert relations_manager.get_team_size(2) is None
+
+
+def test_change_log_records_affected_ids(relations_manager):
+    """
+    Test that every mutation records the employee ids whose salary it may affect.
+
+    Test cases:
+    1. A fresh manager has no changes since its current version.
+    2. Updating an employee affects only that employee.
+    3. Removing a team member affects the member and the leader.
+    4. Moving a member affects the member, the old and the new leader only.
+    5. A reindex after direct edits marks everything as changed (None).
+    6. Unknown versions raise ValueError.
+
+    Args:
+        relations_manager (RelationsManager): An instance of the RelationsManager class.
+    """
+    import dataclasses
+
+    start = relations_manager.version
+    assert relations_manager.changes_since(start) == set()
+
+    employee = relations_manager.get_employee(5)
+    relations_manager.update_employee(dataclasses.replace(employee, base_salary=2000))
+    assert relations_manager.changes_since(start) == {5}
+    assert relations_manager.get_employee(5).base_salary == 2000
+
+    after_update = relations_manager.version
+    relations_manager.move_team_member(2, 4)
+    assert relations_manager.changes_since(after_update) == {1, 2, 4}
+    assert relations_manager.teams == {1: [3], 4: [5, 6, 2]}
+    assert relations_manager.get_team_members(relations_manager.get_employee(4)) == [2, 5, 6]
+
+    after_move = relations_manager.version
+    relations_manager.remove_team_member(4, 6)
+    assert relations_manager.changes_since(after_move) == {4, 6}
+
+    after_remove = relations_manager.version
+    relations_manager.teams[3] = [6]
+    relations_manager.reindex()
+    assert relations_manager.changes_since(after_remove) is None
+
+    with pytest.raises(ValueError):
+        relations_manager.changes_since(relations_manager.version + 1)
+
+
+def test_copy_is_independent(relations_manager):
+    """
+    Test that a copy has its own teams and indexes, so changing it leaves the
+    original untouched.
+
+    Args:
+        relations_manager (RelationsManager): An instance of the RelationsManager class.
+    """
+    copy = relations_manager.copy()
+
+    copy.move_team_member(2, 4)
+    copy.remove_employee(6)
+
+    assert relations_manager.teams == {1: [2, 3], 4: [5, 6]}
+    assert relations_manager.get_employee(6) is not None
+    assert relations_manager.changes_since(0) == set()
+    assert copy.get_team_members(copy.get_employee(4)) == [2, 5]
+
+
+def test_validation_runs_on_load(relations_manager):
+    """
+    Test that building a RelationsManager validates its teams and that a clean
+    pass lets team lookups skip the per-member checks.
+
+    Test cases:
+    1. The default data validates cleanly.
+    2. Unknown ids, duplicate memberships and cycles are reported, and
+       strict validation raises TeamIntegrityError.
+    3. Lookups on invalid data still drop unknown member ids.
+
+    Args:
+        relations_manager (RelationsManager): An instance of the RelationsManager class.
+    """
+    from team_validation import TeamIntegrityError
+
+    assert relations_manager.validation_report.ok
+    assert relations_manager._members_validated
+
+    broken = RelationsManager(relations_manager.get_all_employees(), {1: [2, 999], 2: [1], 4: [2]})
+    report = broken.validation_report
+    assert report.dangling_members == [(1, 999)]
+    assert report.duplicate_memberships == {2: [1, 4]}
+    assert sorted(report.cycles[0]) == [1, 2]
+    assert broken.get_team_members(broken.get_employee(1)) == [2]
+    assert broken.get_team_size(1) == 1
+
+    with pytest.raises(TeamIntegrityError):
+        broken.validate(strict=True)
+
+
+def test_mutations_leave_fast_path_when_members_can_dangle(relations_manager):
+    """
+    Test that mutations which may leave unknown member ids switch team lookups
+    back to the checked path, and that validate() restores the fast path.
+
+    Args:
+        relations_manager (RelationsManager): An instance of the RelationsManager class.
+    """
+    leader = relations_manager.get_employee(1)
+
+    relations_manager.add_team_member(1, 6)
+    assert relations_manager._members_validated
+
+    relations_manager.remove_employee(2)
+    assert not relations_manager._members_validated
+    assert relations_manager.get_team_members(leader) == [3, 6]
+
+    relations_manager.remove_team_member(1, 2)
+    relations_manager.remove_team_member(4, 6)
+    assert relations_manager.validate().ok
+    assert relations_manager._members_validated
+    assert relations_manager.get_team_members(leader) == [3, 6]
+
+    relations_manager.add_team_member(4, 999)
+    assert not relations_manager._members_validated
+    assert relations_manager.get_team_sizes() == {1: 2, 4: 1}
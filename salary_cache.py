@@ -0,0 +1,45 @@
+from collections import OrderedDict
+
+
+class SalaryCache:
+    # LRU cache of computed salaries keyed by employee id. Every entry also stores the
+    # fingerprint of the inputs it was computed from; a lookup with a different
+    # fingerprint is a miss, so stale entries are never returned.
+    def __init__(self, maxsize: int = 100_000):
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def get(self, employee_id: int, fingerprint: tuple):
+        entry = self._entries.get(employee_id)
+        if entry is not None and entry[0] == fingerprint:
+            self._entries.move_to_end(employee_id)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        return None
+
+    def put(self, employee_id: int, fingerprint: tuple, salary: int) -> None:
+        self._entries[employee_id] = (fingerprint, salary)
+        self._entries.move_to_end(employee_id)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, employee_id: int) -> None:
+        self._entries.pop(employee_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+    def __len__(self) -> int:
+        return len(self._entries)
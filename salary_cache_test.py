@@ -0,0 +1,140 @@
+import datetime
+import pytest # type: ignore
+from unittest.mock import patch
+
+from employee_manager import EmployeeManager
+from relations_manager import RelationsManager
+from salary_cache import SalaryCache
+
+
+@pytest.fixture
+def relations_manager():
+    """
+    Creates and returns an instance of the RelationsManager class.
+
+    Returns:
+        RelationsManager: An instance of the RelationsManager class.
+    """
+    return RelationsManager()
+
+
+@pytest.fixture
+def employee_manager(relations_manager):
+    """
+    Creates an EmployeeManager with a salary cache enabled.
+
+    Returns:
+        EmployeeManager: An instance of the EmployeeManager class.
+    """
+    return EmployeeManager(relations_manager, salary_cache=SalaryCache(maxsize=3))
+
+
+def test_repeated_calls_hit_the_cache(employee_manager, relations_manager):
+    """
+    Test that a repeated salary lookup is served from the cache without
+    asking the RelationsManager for the team again.
+    """
+    leader = relations_manager.get_employee(1)
+    expected = EmployeeManager(relations_manager).calculate_salary(leader)
+
+    assert employee_manager.calculate_salary(leader) == expected
+    with patch.object(relations_manager, "get_team_members") as get_team_members:
+        assert employee_manager.calculate_salary(leader) == expected
+        get_team_members.assert_not_called()
+
+    assert employee_manager.salary_cache.stats()["hits"] == 1
+    assert employee_manager.salary_cache.stats()["misses"] == 1
+
+
+def test_employee_change_invalidates(employee_manager, relations_manager):
+    """
+    Test that changing an employee's base salary recomputes the salary.
+    """
+    employee = relations_manager.get_employee(2)
+    before = employee_manager.calculate_salary(employee)
+
+    employee.base_salary += 500
+
+    assert employee_manager.calculate_salary(employee) == before + 500
+
+
+def test_team_change_invalidates_only_the_leader(employee_manager, relations_manager):
+    """
+    Test that changing a team invalidates the leader of that team but not
+    the cached salaries of other leaders.
+    """
+    leader, other_leader = relations_manager.get_employee(1), relations_manager.get_employee(4)
+    before = employee_manager.calculate_salary(leader)
+    employee_manager.calculate_salary(other_leader)
+
+    relations_manager.add_team_member(1, 5)
+
+    assert employee_manager.calculate_salary(leader) == before + EmployeeManager.leader_bonus_per_member
+    employee_manager.calculate_salary(other_leader)
+    assert employee_manager.salary_cache.hits == 1
+
+
+def test_member_removal_invalidates_the_leader(employee_manager, relations_manager):
+    """
+    Test that removing an employee who is a team member invalidates the leader,
+    because the member no longer counts towards the leader bonus.
+    """
+    leader = relations_manager.get_employee(1)
+    before = employee_manager.calculate_salary(leader)
+
+    relations_manager.remove_employee(3)
+
+    assert employee_manager.calculate_salary(leader) == before - EmployeeManager.leader_bonus_per_member
+
+
+def test_reindex_invalidates_everything(employee_manager, relations_manager):
+    """
+    Test that direct edits of `teams` followed by reindex are picked up.
+    """
+    leader = relations_manager.get_employee(1)
+    before = employee_manager.calculate_salary(leader)
+
+    relations_manager.teams[1] = [2]
+    relations_manager.reindex()
+
+    assert employee_manager.calculate_salary(leader) == before - EmployeeManager.leader_bonus_per_member
+
+
+def test_bonus_and_year_changes_invalidate(employee_manager, relations_manager):
+    """
+    Test that changing the bonus class variables or the calendar year
+    recomputes the salary.
+    """
+    employee = relations_manager.get_employee(2)
+    employee_manager.calculate_salary(employee)
+
+    with patch.object(EmployeeManager, "yearly_bonus", 1000):
+        assert employee_manager.calculate_salary(employee) == EmployeeManager(relations_manager).calculate_salary(employee)
+
+    next_year = datetime.date(datetime.date.today().year + 1, 1, 1)
+    with patch("employee_manager.datetime") as mock_datetime:
+        mock_datetime.date.today.return_value = next_year
+        salary = employee_manager.calculate_salary(employee)
+
+    assert salary == employee.base_salary + (next_year.year - employee.hire_date.year) * EmployeeManager.yearly_bonus
+    assert employee_manager.salary_cache.hits == 0
+
+
+def test_lru_eviction():
+    """
+    Test that the cache keeps at most maxsize entries and evicts the least
+    recently used one.
+    """
+    cache = SalaryCache(maxsize=2)
+    cache.put(1, (), 100)
+    cache.put(2, (), 200)
+    cache.get(1, ())
+    cache.put(3, (), 300)
+
+    assert len(cache) == 2
+    assert cache.get(2, ()) is None
+    assert cache.get(1, ()) == 100
+    assert cache.evictions == 1
+
+    with pytest.raises(ValueError):
+        SalaryCache(maxsize=0)
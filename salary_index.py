@@ -0,0 +1,91 @@
+import datetime
+import numpy as np
+from employee_manager import EmployeeManager, resolve_evaluation_date
+
+
+class SalaryIndex:
+    # Sorted salary and team size columns over the relations data, answering range
+    # queries with two binary searches: O(log N + k) for k results. Every query first
+    # applies the RelationsManager changes made since the last one: only the touched
+    # employees and teams are recalculated and moved, unless the change log asks for a
+    # full rebuild (e.g. after reindex()).
+    #
+    # Salaries are evaluated on the date fixed at construction with the bonus rates at
+    # the time of calculation; call rebuild() after changing EmployeeManager's rates.
+    def __init__(self, employee_manager: EmployeeManager, as_of: datetime.date = None):
+        self.employee_manager = employee_manager
+        self.as_of = resolve_evaluation_date(as_of)
+        self.rebuild()
+
+    @property
+    def relations_manager(self):
+        return self.employee_manager.relations_manager
+
+    def rebuild(self) -> None:
+        self._version = self.relations_manager.version
+        components = self.employee_manager.salary_components(self.relations_manager.get_all_employees(),
+                                                             as_of=self.as_of)
+        salaries = components.salaries
+        order = np.argsort(salaries, kind="stable")
+        self._salaries, self._salary_ids = salaries[order], components.ids[order]
+
+        team_sizes = self.relations_manager.get_team_sizes()
+        leader_ids = np.fromiter(team_sizes.keys(), dtype=np.int64, count=len(team_sizes))
+        sizes = np.fromiter(team_sizes.values(), dtype=np.int64, count=len(team_sizes))
+        order = np.argsort(sizes, kind="stable")
+        self._team_sizes, self._leader_ids = sizes[order], leader_ids[order]
+
+    def refresh(self) -> None:
+        if self.relations_manager.version == self._version:
+            return
+        changed_ids = self.relations_manager.changes_since(self._version)
+        if changed_ids is None:
+            self.rebuild()
+            return
+        self._version = self.relations_manager.version
+
+        changed = np.fromiter(changed_ids, dtype=np.int64, count=len(changed_ids))
+        employees = [e for e in map(self.relations_manager.get_employee, changed_ids) if e is not None]
+        salaries = [self.employee_manager.calculate_salary(e, self.as_of) for e in employees]
+        self._salaries, self._salary_ids = self._replace(self._salaries, self._salary_ids, changed,
+                                                         salaries, [e.id for e in employees])
+
+        team_sizes = {leader_id: self.relations_manager.get_team_size(leader_id) for leader_id in changed_ids}
+        team_sizes = {leader_id: size for leader_id, size in team_sizes.items() if size is not None}
+        self._team_sizes, self._leader_ids = self._replace(self._team_sizes, self._leader_ids, changed,
+                                                           list(team_sizes.values()), list(team_sizes))
+
+    @staticmethod
+    def _replace(keys: np.ndarray, ids: np.ndarray, changed: np.ndarray, new_keys: list, new_ids: list) -> tuple:
+        # Drops every entry of the changed ids and inserts their new entries at their
+        # sorted positions: one vectorised pass over the column per refresh.
+        keep = ~np.isin(ids, changed)
+        keys, ids = keys[keep], ids[keep]
+        new_keys = np.array(new_keys, dtype=np.int64)
+        # np.insert keeps the given order among entries sharing an insertion point, so the
+        # new entries have to be sorted themselves.
+        order = np.argsort(new_keys, kind="stable")
+        new_keys, new_ids = new_keys[order], np.array(new_ids, dtype=np.int64)[order]
+        positions = np.searchsorted(keys, new_keys)
+
+        return np.insert(keys, positions, new_keys), np.insert(ids, positions, new_ids)
+
+    @staticmethod
+    def _range(keys: np.ndarray, ids: np.ndarray, low, high) -> list:
+        start = 0 if low is None else np.searchsorted(keys, low, side="left")
+        stop = len(keys) if high is None else np.searchsorted(keys, high, side="right")
+        return ids[start:stop].tolist()
+
+    def salary_range(self, low: int = None, high: int = None) -> list:
+        # Ids of the employees earning between low and high (inclusive), lowest salary first.
+        self.refresh()
+        return self._range(self._salaries, self._salary_ids, low, high)
+
+    def leaders_by_team_size(self, min_size: int = None, max_size: int = None) -> list:
+        # Ids of the leaders with min_size to max_size (inclusive) team members, smallest team first.
+        self.refresh()
+        return self._range(self._team_sizes, self._leader_ids, min_size, max_size)
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._salary_ids)
@@ -0,0 +1,153 @@
+import datetime
+import pytest # type: ignore
+
+from employee import Employee
+from employee_manager import EmployeeManager
+from org_generator import generate_org
+from salary_index import SalaryIndex
+
+
+AS_OF = datetime.date(2025, 3, 15)
+
+
+@pytest.fixture
+def employee_manager():
+    """
+    Creates an EmployeeManager over a generated organisation with uneven team sizes.
+
+    Returns:
+        EmployeeManager: The manager the index is built from.
+    """
+    return EmployeeManager(generate_org(2_000, team_size=10, distribution="pareto", seed=7))
+
+
+@pytest.fixture
+def index(employee_manager):
+    """
+    Creates a SalaryIndex evaluated on AS_OF.
+
+    Returns:
+        SalaryIndex: The index over `employee_manager`.
+    """
+    return SalaryIndex(employee_manager, AS_OF)
+
+
+def salaries_between(employee_manager, low, high):
+    """
+    Answers a salary range query by brute force.
+
+    Returns:
+        set: Ids of the employees earning between low and high (inclusive).
+    """
+    return {e.id for e in employee_manager.relations_manager.get_all_employees()
+            if low <= employee_manager.calculate_salary(e, AS_OF) <= high}
+
+
+def teams_between(employee_manager, low, high):
+    """
+    Answers a team size range query by brute force.
+
+    Returns:
+        set: Ids of the leaders with low to high team members (inclusive).
+    """
+    return {leader_id for leader_id, size in employee_manager.relations_manager.get_team_sizes().items()
+            if low <= size <= high}
+
+
+def assert_matches_brute_force(index, employee_manager):
+    """
+    Compares a spread of salary and team size range queries with brute force.
+    """
+    salaries = sorted(employee_manager.calculate_salary(e, AS_OF)
+                      for e in employee_manager.relations_manager.get_all_employees())
+    for low, high in ((salaries[0], salaries[-1]), (salaries[100], salaries[900]), (salaries[500], salaries[500])):
+        result = index.salary_range(low, high)
+        assert len(result) == len(set(result))
+        assert set(result) == salaries_between(employee_manager, low, high)
+
+    for low, high in ((0, 3), (5, 20), (21, 10_000)):
+        assert set(index.leaders_by_team_size(low, high)) == teams_between(employee_manager, low, high)
+
+
+def test_range_queries_match_brute_force(index, employee_manager):
+    """
+    Test that salary and team size range queries return the same employees as
+    looping over every employee, ordered by salary and open ended when a bound
+    is omitted.
+    """
+    assert_matches_brute_force(index, employee_manager)
+    assert len(index) == 2_000
+
+    ordered = index.salary_range()
+    salaries = [employee_manager.calculate_salary(employee_manager.relations_manager.get_employee(i), AS_OF)
+                for i in ordered]
+    assert salaries == sorted(salaries)
+    assert index.salary_range(high=salaries[0] - 1) == []
+    assert set(index.leaders_by_team_size(min_size=1)) == teams_between(employee_manager, 1, 10_000)
+
+
+def test_index_follows_incremental_changes(index, employee_manager, monkeypatch):
+    """
+    Test that the index picks up added, updated and removed employees and
+    team moves without a full rebuild.
+
+    Verify:
+        - Queries match brute force after every kind of change.
+        - rebuild() is not called for logged changes.
+    """
+    relations_manager = employee_manager.relations_manager
+    monkeypatch.setattr(index, "rebuild", lambda: pytest.fail("unexpected full rebuild"))
+
+    relations_manager.add_employee(Employee(id=10_000, first_name="Ada", last_name="Lovelace", base_salary=99_999,
+                                            birth_date=datetime.date(1980, 1, 1), hire_date=datetime.date(2010, 1, 1)))
+    assert index.salary_range(99_999) == [10_000]
+
+    leader_id = index.leaders_by_team_size(min_size=2)[-1]
+    member_id = relations_manager.get_team_members(relations_manager.get_employee(leader_id))[0]
+    relations_manager.move_team_member(member_id, 10_000)
+    relations_manager.update_employee(Employee(id=5, first_name="Tomas", last_name="Andre", base_salary=1,
+                                               birth_date=datetime.date(1995, 1, 1), hire_date=AS_OF))
+    relations_manager.remove_employee(6)
+
+    assert 10_000 in index.leaders_by_team_size(1, 1)
+    assert index.salary_range(high=1) == [5]
+    assert 6 not in index.salary_range()
+    assert len(index) == 2_000
+    assert_matches_brute_force(index, employee_manager)
+
+
+def test_index_rebuilds_after_reindex(index, employee_manager):
+    """
+    Test that direct edits followed by reindex() make the index rebuild itself.
+    """
+    relations_manager = employee_manager.relations_manager
+    leader_id = next(iter(relations_manager.teams))
+    relations_manager.teams[leader_id] = []
+    relations_manager.reindex()
+
+    assert leader_id in index.leaders_by_team_size(0, 0)
+    assert_matches_brute_force(index, employee_manager)
+
+
+def test_refreshed_entries_sharing_a_gap_stay_sorted():
+    """
+    Test that several refreshed entries landing between the same two existing
+    entries are inserted in sorted order, also when their new salaries and
+    team sizes come in descending id order.
+    """
+    import dataclasses
+    from relations_manager import RelationsManager
+
+    relations_manager = RelationsManager()
+    employee_manager = EmployeeManager(relations_manager)
+    index = SalaryIndex(employee_manager, datetime.date(2025, 1, 1))
+
+    relations_manager.update_employee(dataclasses.replace(relations_manager.get_employee(2), base_salary=2500))
+    relations_manager.update_employee(dataclasses.replace(relations_manager.get_employee(3), base_salary=3000))
+    relations_manager.add_team_member(1, 5)
+    relations_manager.add_team_member(1, 6)
+
+    assert index.salary_range(3900, 4100) == [3]
+    assert index.salary_range(4900, 5100) == [2]
+    assert index._salaries.tolist() == sorted(index._salaries.tolist())
+    assert index._team_sizes.tolist() == sorted(index._team_sizes.tolist())
@@ -0,0 +1,148 @@
+import array
+import bisect
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping
+from employee_table import EmployeeTable
+
+
+# File layout (all sections 8-byte aligned, native little-endian):
+#   header
+#   employee columns: ids q, first_names I, last_names I, birth_dates i, base_salaries q, hire_dates i
+#   id index:         sorted ids q, row of each sorted id q
+#   string pool:      offsets Q (name_count + 1), UTF-8 blob
+#   teams (CSR):      sorted leader ids q, member offsets Q (leader_count + 1), member ids q
+MAGIC = b"EMPSNAP\0"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sII5Q")
+# Header flags; files written before flags existed carry 0 here.
+MEMBERS_VALIDATED = 1
+EMPLOYEE_COLUMNS = (("ids", "q"), ("first_names", "I"), ("last_names", "I"),
+                    ("birth_dates", "i"), ("base_salaries", "q"), ("hire_dates", "i"))
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+class MappedStringPool:
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __getitem__(self, index: int) -> str:
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+class MappedIdIndex(Mapping):
+    # Read-only id -> row mapping answered by binary search over the sorted id section.
+    def __init__(self, sorted_ids: memoryview, rows: memoryview):
+        self._sorted_ids = sorted_ids
+        self._rows = rows
+
+    def __getitem__(self, employee_id: int) -> int:
+        i = bisect.bisect_left(self._sorted_ids, employee_id)
+        if i < len(self._sorted_ids) and self._sorted_ids[i] == employee_id:
+            return self._rows[i]
+        raise KeyError(employee_id)
+
+    def __iter__(self):
+        return iter(self._sorted_ids)
+
+    def __len__(self) -> int:
+        return len(self._sorted_ids)
+
+    @property
+    def rows(self) -> memoryview:
+        # Row of every employee, in ascending id order.
+        return self._rows
+
+
+class MappedTeams(Mapping):
+    # Read-only leader -> member ids mapping over the CSR team sections.
+    def __init__(self, leader_ids: memoryview, offsets: memoryview, member_ids: memoryview):
+        self._leader_ids = leader_ids
+        self._offsets = offsets
+        self._member_ids = member_ids
+
+    def __getitem__(self, leader_id: int) -> list:
+        i = bisect.bisect_left(self._leader_ids, leader_id)
+        if i < len(self._leader_ids) and self._leader_ids[i] == leader_id:
+            return self._member_ids[self._offsets[i]:self._offsets[i + 1]].tolist()
+        raise KeyError(leader_id)
+
+    def __iter__(self):
+        return iter(self._leader_ids)
+
+    def __len__(self) -> int:
+        return len(self._leader_ids)
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % 8)
+
+
+def save(path, employees, teams: Mapping, flags: int = 0) -> None:
+    table = employees if isinstance(employees, EmployeeTable) else EmployeeTable(employees)
+
+    order = sorted(range(len(table)), key=table.ids.__getitem__)
+    sorted_ids = array.array("q", (table.ids[row] for row in order))
+    rows = array.array("q", order)
+
+    encoded_names = [table.names[i].encode("utf-8") for i in range(len(table.names))]
+    name_offsets = array.array("Q", [0])
+    for name in encoded_names:
+        name_offsets.append(name_offsets[-1] + len(name))
+
+    leader_ids = array.array("q", sorted(teams))
+    member_offsets = array.array("Q", [0])
+    member_ids = array.array("q")
+    for leader_id in leader_ids:
+        member_ids.extend(teams[leader_id])
+        member_offsets.append(len(member_ids))
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(table), len(encoded_names),
+                               name_offsets[-1], len(leader_ids), len(member_ids)))
+        for column in (*table._columns(), sorted_ids, rows, name_offsets):
+            data = column.tobytes()
+            file.write(data + _padding(len(data)))
+        file.write(b"".join(encoded_names) + _padding(name_offsets[-1]))
+        for column in (leader_ids, member_offsets, member_ids):
+            file.write(column.tobytes())
+
+
+def load(path) -> tuple:
+    if sys.byteorder != "little":
+        raise SnapshotError("Snapshots can only be opened on little-endian machines")
+
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < HEADER.size:
+            raise SnapshotError(f"{path} is too small to be a snapshot")
+        buffer = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+    magic, version, flags, employee_count, name_count, names_size, leader_count, member_count = HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise SnapshotError(f"{path} is not a version {FORMAT_VERSION} employee snapshot")
+
+    offset = HEADER.size
+
+    def section(typecode: str, count: int) -> memoryview:
+        nonlocal offset
+        size = struct.calcsize(typecode) * count
+        view = buffer[offset:offset + size]
+        if len(view) != size:
+            raise SnapshotError(f"{path} is truncated")
+        offset += size + len(_padding(size))
+        return view.cast(typecode)
+
+    columns = {name: section(typecode, employee_count) for name, typecode in EMPLOYEE_COLUMNS}
+    index = MappedIdIndex(section("q", employee_count), section("q", employee_count))
+    names = MappedStringPool(section("Q", name_count + 1), section("B", names_size))
+    teams = MappedTeams(section("q", leader_count), section("Q", leader_count + 1), section("q", member_count))
+
+    return EmployeeTable.from_columns(names=names, **columns), teams, index, flags
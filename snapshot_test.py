@@ -0,0 +1,126 @@
+import mmap
+import pytest # type: ignore
+
+import snapshot
+from employee_manager import EmployeeManager
+from relations_manager import RelationsManager
+
+
+@pytest.fixture
+def relations_manager():
+    """
+    Creates and returns an instance of the RelationsManager class.
+
+    Returns:
+        RelationsManager: An instance of the RelationsManager class.
+    """
+    return RelationsManager()
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, relations_manager):
+    """
+    Saves the default RelationsManager data into a snapshot file.
+
+    Returns:
+        pathlib.Path: The path of the snapshot file.
+    """
+    path = tmp_path / "employees.snap"
+    relations_manager.save_snapshot(path)
+    return path
+
+
+def test_snapshot_round_trip(relations_manager, snapshot_path):
+    """
+    Test that a manager opened from a snapshot answers every query like the original.
+
+    Verify:
+        - Employees, teams, id lookups and team members match.
+        - Batch salaries computed from the snapshot match the original data.
+    """
+    opened = RelationsManager.open_snapshot(snapshot_path)
+
+    assert list(opened.iter_employees()) == relations_manager.get_all_employees()
+    assert dict(opened.teams) == relations_manager.teams
+    assert opened.get_employee(5) == relations_manager.get_employee(5)
+    assert opened.get_employee(999) is None
+    assert opened.is_leader(opened.get_employee(4)) is True
+    assert opened.get_team_members(opened.get_employee(1)) == [2, 3]
+    assert opened.get_team_sizes() == relations_manager.get_team_sizes()
+    assert (EmployeeManager(opened).calculate_salaries(opened.iter_employees())
+            == EmployeeManager(relations_manager).calculate_salaries(relations_manager.get_all_employees()))
+
+
+def test_snapshot_columns_are_zero_copy(snapshot_path):
+    """
+    Test that the employee columns of an opened snapshot are views over the
+    memory-mapped file rather than copies.
+    """
+    table = RelationsManager.open_snapshot(snapshot_path).get_all_employees()
+
+    assert isinstance(table.ids, memoryview)
+    assert isinstance(table.ids.obj, mmap.mmap)
+    assert table.base_salaries.obj is table.ids.obj
+
+
+def test_snapshot_is_read_only(snapshot_path):
+    """
+    Test that a snapshot backed manager refuses mutations.
+    """
+    opened = RelationsManager.open_snapshot(snapshot_path)
+
+    with pytest.raises(TypeError):
+        opened.add_team_member(1, 4)
+
+
+def test_empty_snapshot(tmp_path):
+    """
+    Test that a manager without employees or teams can be saved and opened.
+    """
+    path = tmp_path / "empty.snap"
+    RelationsManager([], {}).save_snapshot(path)
+
+    opened = RelationsManager.open_snapshot(path)
+
+    assert len(opened.get_all_employees()) == 0
+    assert len(opened.teams) == 0
+
+
+def test_open_invalid_snapshot(tmp_path):
+    """
+    Test that opening a file that is not a snapshot raises SnapshotError.
+    """
+    path = tmp_path / "not_a.snap"
+    path.write_bytes(b"id,first_name\n" * 10)
+
+    with pytest.raises(snapshot.SnapshotError):
+        RelationsManager.open_snapshot(path)
+
+
+def test_open_truncated_snapshot(tmp_path, snapshot_path):
+    """
+    Test that a snapshot cut short raises SnapshotError instead of reading garbage.
+    """
+    path = tmp_path / "truncated.snap"
+    path.write_bytes(snapshot_path.read_bytes()[:-16])
+
+    with pytest.raises(snapshot.SnapshotError):
+        RelationsManager.open_snapshot(path)
+
+
+def test_snapshot_keeps_validation_flag(tmp_path, relations_manager, snapshot_path):
+    """
+    Test that a snapshot saved from validated data opens on the fast lookup
+    path without re-validating, and that unvalidated data does not.
+    """
+    opened = RelationsManager.open_snapshot(snapshot_path)
+    assert opened._members_validated
+    assert opened.get_team_members(opened.get_employee(1)) == [2, 3]
+
+    relations_manager.add_team_member(1, 999)
+    path = tmp_path / "unvalidated.snap"
+    relations_manager.save_snapshot(path)
+
+    opened = RelationsManager.open_snapshot(path)
+    assert not opened._members_validated
+    assert opened.get_team_members(opened.get_employee(1)) == [2, 3]
@@ -0,0 +1,158 @@
+import contextlib
+import datetime
+import queue
+import sqlite3
+from employee import Employee
+from employee_loader import chunked
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    birth_date TEXT NOT NULL,
+    base_salary INTEGER NOT NULL,
+    hire_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leaders (
+    id INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS team_members (
+    leader_id INTEGER NOT NULL,
+    member_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (leader_id, member_id)
+);
+CREATE INDEX IF NOT EXISTS team_members_by_member ON team_members (member_id);
+"""
+
+EMPLOYEE_COLUMNS = "id, first_name, last_name, birth_date, base_salary, hire_date"
+
+DEFAULT_PAGE_SIZE = 1000
+
+
+def _employee_from_row(row) -> Employee:
+    return Employee(id=row[0], first_name=row[1], last_name=row[2], birth_date=datetime.date.fromisoformat(row[3]),
+                    base_salary=row[4], hire_date=datetime.date.fromisoformat(row[5]))
+
+
+class ConnectionPool:
+    def __init__(self, path, size: int = 4):
+        if size < 1:
+            raise ValueError("size must be positive")
+        self._connections = queue.LifoQueue()
+        for _ in range(size):
+            connection = sqlite3.connect(path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._connections.put(connection)
+        self.size = size
+
+    @contextlib.contextmanager
+    def connection(self):
+        # Blocks until a connection is free, so at most `size` queries run at once.
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self) -> None:
+        for _ in range(self.size):
+            self._connections.get().close()
+
+
+class SQLiteRelationsManager:
+    # RelationsManager interface on top of a SQLite database, for data sets that do not
+    # fit in Python lists. get_all_employees() streams pages instead of returning a list.
+    def __init__(self, path, pool_size: int = 4, page_size: int = DEFAULT_PAGE_SIZE):
+        self.path = path
+        self.page_size = page_size
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as connection:
+            connection.executescript(SCHEMA)
+
+    @classmethod
+    def from_relations_manager(cls, relations_manager, path, **kwargs) -> "SQLiteRelationsManager":
+        sqlite_manager = cls(path, **kwargs)
+        sqlite_manager.insert_employees(relations_manager.iter_employees())
+        sqlite_manager.insert_teams(relations_manager.teams)
+        return sqlite_manager
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def insert_employees(self, employees) -> None:
+        with self.pool.connection() as connection, connection:
+            for chunk in chunked(employees, self.page_size):
+                connection.executemany(
+                    f"INSERT INTO employees ({EMPLOYEE_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(e.id, e.first_name, e.last_name, e.birth_date.isoformat(), e.base_salary, e.hire_date.isoformat())
+                     for e in chunk])
+
+    def insert_teams(self, teams) -> None:
+        with self.pool.connection() as connection, connection:
+            connection.executemany("INSERT OR IGNORE INTO leaders (id) VALUES (?)", ((leader_id,) for leader_id in teams))
+            connection.executemany(
+                "INSERT OR IGNORE INTO team_members (leader_id, member_id, position) VALUES (?, ?, ?)",
+                ((leader_id, member_id, position)
+                 for leader_id, member_ids in teams.items() for position, member_id in enumerate(member_ids)))
+
+    def is_leader(self, employee) -> bool:
+        with self.pool.connection() as connection:
+            return connection.execute("SELECT 1 FROM leaders WHERE id = ?", (employee.id,)).fetchone() is not None
+
+    def get_all_employees(self, page_size: int = None):
+        # Keyset pagination: each page is one indexed range query, so memory stays at one page.
+        page_size = page_size or self.page_size
+        last_id = None
+        while True:
+            with self.pool.connection() as connection:
+                if last_id is None:
+                    rows = connection.execute(f"SELECT {EMPLOYEE_COLUMNS} FROM employees ORDER BY id LIMIT ?",
+                                              (page_size,)).fetchall()
+                else:
+                    rows = connection.execute(f"SELECT {EMPLOYEE_COLUMNS} FROM employees WHERE id > ? ORDER BY id LIMIT ?",
+                                              (last_id, page_size)).fetchall()
+            if not rows:
+                return
+            yield from map(_employee_from_row, rows)
+            last_id = rows[-1][0]
+
+    def iter_employees(self):
+        return self.get_all_employees()
+
+    def get_employee(self, employee_id: int) -> Employee:
+        with self.pool.connection() as connection:
+            row = connection.execute(f"SELECT {EMPLOYEE_COLUMNS} FROM employees WHERE id = ?", (employee_id,)).fetchone()
+        if row is not None:
+            return _employee_from_row(row)
+
+    def get_employees(self, employee_ids) -> dict:
+        # One query per page of ids instead of one round-trip per employee.
+        employees = {}
+        with self.pool.connection() as connection:
+            for chunk in chunked(employee_ids, self.page_size):
+                placeholders = ", ".join("?" * len(chunk))
+                for row in connection.execute(f"SELECT {EMPLOYEE_COLUMNS} FROM employees WHERE id IN ({placeholders})", chunk):
+                    employees[row[0]] = _employee_from_row(row)
+        return employees
+
+    def get_team_members(self, employee: Employee) -> list:
+        if self.is_leader(employee):
+            with self.pool.connection() as connection:
+                rows = connection.execute(
+                    "SELECT t.member_id FROM team_members t JOIN employees e ON e.id = t.member_id "
+                    "WHERE t.leader_id = ? ORDER BY e.id", (employee.id,)).fetchall()
+
+            return [row[0] for row in rows]
+
+    def get_team_sizes(self) -> dict:
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                "SELECT l.id, COUNT(e.id) FROM leaders l "
+                "LEFT JOIN team_members t ON t.leader_id = l.id "
+                "LEFT JOIN employees e ON e.id = t.member_id "
+                "GROUP BY l.id").fetchall()
+
+        return dict(rows)
@@ -0,0 +1,116 @@
+import types
+from concurrent.futures import ThreadPoolExecutor
+import pytest # type: ignore
+
+from employee_manager import EmployeeManager
+from relations_manager import RelationsManager
+from sqlite_relations_manager import ConnectionPool, SQLiteRelationsManager
+
+
+@pytest.fixture
+def relations_manager():
+    """
+    Creates and returns an instance of the RelationsManager class.
+
+    Returns:
+        RelationsManager: An instance of the RelationsManager class.
+    """
+    return RelationsManager()
+
+
+@pytest.fixture
+def sqlite_manager(tmp_path, relations_manager):
+    """
+    Creates a SQLiteRelationsManager holding the default employees and teams.
+
+    Yields:
+        SQLiteRelationsManager: A manager backed by a temporary database.
+    """
+    sqlite_manager = SQLiteRelationsManager.from_relations_manager(relations_manager, tmp_path / "hr.db", page_size=4)
+    yield sqlite_manager
+    sqlite_manager.close()
+
+
+def test_same_answers_as_relations_manager(sqlite_manager, relations_manager):
+    """
+    Test that the SQLite backend answers is_leader, get_team_members,
+    get_employee and get_team_sizes like the in-memory RelationsManager.
+    """
+    for employee in relations_manager.get_all_employees():
+        assert sqlite_manager.is_leader(employee) == relations_manager.is_leader(employee)
+        assert sqlite_manager.get_team_members(employee) == relations_manager.get_team_members(employee)
+        assert sqlite_manager.get_employee(employee.id) == employee
+
+    assert sqlite_manager.get_employee(999) is None
+    assert sqlite_manager.get_team_sizes() == relations_manager.get_team_sizes()
+    assert sqlite_manager.get_employees([2, 5, 999]) == {2: relations_manager.get_employee(2),
+                                                          5: relations_manager.get_employee(5)}
+
+
+def test_team_members_in_same_order_as_relations_manager(tmp_path, relations_manager):
+    """
+    Test that team members inserted out of id order come back in the same
+    order from both backends: the order of get_all_employees.
+    """
+    relations_manager = RelationsManager(relations_manager.get_all_employees(), {1: [3, 2]})
+    sqlite_manager = SQLiteRelationsManager.from_relations_manager(relations_manager, tmp_path / "hr.db")
+    try:
+        john = relations_manager.get_employee(1)
+        assert sqlite_manager.get_team_members(john) == relations_manager.get_team_members(john) == [2, 3]
+    finally:
+        sqlite_manager.close()
+
+
+def test_get_all_employees_is_paged(sqlite_manager, relations_manager):
+    """
+    Test that get_all_employees streams every employee in id order instead of
+    returning a list.
+    """
+    employees = sqlite_manager.get_all_employees(page_size=4)
+
+    assert isinstance(employees, types.GeneratorType)
+    assert list(employees) == relations_manager.get_all_employees()
+
+
+def test_unknown_members_and_empty_teams(sqlite_manager, relations_manager):
+    """
+    Test that members missing from the employees table are left out of teams
+    and that a leader without members has a team size of zero.
+    """
+    sqlite_manager.insert_teams({2: [], 1: [999]})
+
+    assert sqlite_manager.get_team_members(relations_manager.get_employee(1)) == [2, 3]
+    assert sqlite_manager.get_team_sizes() == {1: 2, 2: 0, 4: 2}
+
+
+def test_employee_manager_on_sqlite(sqlite_manager, relations_manager):
+    """
+    Test that EmployeeManager computes the same salaries on top of SQLite,
+    through both the scalar and the streamed batch path.
+    """
+    sqlite_employee_manager = EmployeeManager(sqlite_manager)
+    memory_employee_manager = EmployeeManager(relations_manager)
+    expected = [memory_employee_manager.calculate_salary(e) for e in relations_manager.get_all_employees()]
+
+    assert [sqlite_employee_manager.calculate_salary(e) for e in sqlite_manager.get_all_employees()] == expected
+    assert [s for _, s in sqlite_employee_manager.iter_salaries(sqlite_manager.get_all_employees())] == expected
+
+
+def test_concurrent_readers(sqlite_manager, relations_manager):
+    """
+    Test that several threads can query through the connection pool at once.
+    """
+    leader = relations_manager.get_employee(1)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: sqlite_manager.get_team_members(leader), range(200)))
+
+    assert results == [[2, 3]] * 200
+
+
+def test_pool_size_must_be_positive(tmp_path):
+    """
+    Test that an empty connection pool is rejected.
+    """
+    with pytest.raises(ValueError):
+        ConnectionPool(tmp_path / "hr.db", size=0)
@@ -0,0 +1,113 @@
+import itertools
+from dataclasses import dataclass, field
+
+
+class TeamIntegrityError(ValueError):
+    def __init__(self, report: "ValidationReport"):
+        super().__init__(str(report))
+        self.report = report
+
+
+@dataclass
+class ValidationReport:
+    dangling_leaders: list = field(default_factory=list)       # leader ids that are not employees
+    dangling_members: list = field(default_factory=list)       # (leader id, member id) pairs
+    duplicate_memberships: dict = field(default_factory=dict)  # member id -> leader ids, one per membership
+    cycles: list = field(default_factory=list)                 # groups of ids that lead each other in a loop
+
+    @property
+    def ok(self) -> bool:
+        return not (self.dangling_leaders or self.dangling_members or self.duplicate_memberships or self.cycles)
+
+    def __str__(self) -> str:
+        if self.ok:
+            return "Team data is consistent"
+        problems = []
+        if self.dangling_leaders:
+            problems.append(f"{len(self.dangling_leaders)} unknown leader ids {self.dangling_leaders[:5]}")
+        if self.dangling_members:
+            problems.append(f"{len(self.dangling_members)} unknown member ids {self.dangling_members[:5]}")
+        if self.duplicate_memberships:
+            problems.append(f"{len(self.duplicate_memberships)} duplicate memberships "
+                            f"{dict(list(self.duplicate_memberships.items())[:5])}")
+        if self.cycles:
+            problems.append(f"{len(self.cycles)} leadership cycles {self.cycles[:5]}")
+        return "Invalid team data: " + "; ".join(problems)
+
+
+def validate_teams(employee_ids, teams) -> ValidationReport:
+    # Linear in employees + memberships. Clean, flat team data is checked with set
+    # operations only; the per-membership walk below runs only when something is shared,
+    # nested or unknown. employee_ids needs fast membership tests (a set or the id index).
+    report = ValidationReport()
+    all_member_ids = list(itertools.chain.from_iterable(teams.values()))
+    member_set = set(all_member_ids)
+    unknown = member_set.difference(employee_ids)
+    nested = member_set.intersection(teams)
+
+    report.dangling_leaders = [leader_id for leader_id in teams if leader_id not in employee_ids]
+    if unknown:
+        report.dangling_members = [(leader_id, member_id) for leader_id, member_ids in teams.items()
+                                   if not unknown.isdisjoint(member_ids)
+                                   for member_id in member_ids if member_id in unknown]
+    if not nested and len(member_set) == len(all_member_ids):
+        return report
+
+    leaders_of = {}
+    for leader_id, member_ids in teams.items():
+        for member_id in member_ids:
+            leaders_of.setdefault(member_id, []).append(leader_id)
+    report.duplicate_memberships = {member_id: leader_ids for member_id, leader_ids in leaders_of.items()
+                                    if len(leader_ids) > 1}
+
+    # Only leaders that are members themselves can sit on a cycle, so cycles are looked
+    # for on the leader -> nested leader edges alone.
+    nested_members = {}
+    for member_id in nested:
+        for leader_id in leaders_of[member_id]:
+            nested_members.setdefault(leader_id, []).append(member_id)
+    report.cycles = _cyclic_groups(nested, nested_members)
+
+    return report
+
+
+def _cyclic_groups(nodes: set, edges: dict) -> list:
+    # Strongly connected components with a cycle (Tarjan's algorithm, iterative), in
+    # linear time over the given leader -> member edges.
+    index_of, low, stack, on_stack, groups = {}, {}, [], set(), []
+    for root in nodes:
+        if root in index_of:
+            continue
+        work = [(root, iter(edges.get(root, ())))]
+        index_of[root] = low[root] = len(index_of)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in nodes:
+                    continue
+                if child not in index_of:
+                    index_of[child] = low[child] = len(index_of)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(edges.get(child, ()))))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index_of[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index_of[node]:
+                    group = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        group.append(member)
+                        if member == node:
+                            break
+                    if len(group) > 1 or node in edges.get(node, ()):
+                        groups.append(group[::-1])
+    return groups
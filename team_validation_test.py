@@ -0,0 +1,54 @@
+import pytest # type: ignore
+
+from team_validation import TeamIntegrityError, ValidationReport, validate_teams
+
+
+def test_clean_teams_pass():
+    """
+    Test that consistent nested teams produce an empty, ok report.
+    """
+    report = validate_teams({1, 2, 3, 4, 5}, {1: [2, 3], 3: [4, 5]})
+
+    assert report.ok
+    assert report == ValidationReport()
+
+
+def test_reports_every_kind_of_problem():
+    """
+    Test that one pass reports unknown leaders and members, employees listed in
+    more than one team (or twice in one team) and leadership cycles.
+    """
+    teams = {1: [2, 3], 2: [1, 4], 4: [4], 5: [9, 3], 7: [6, 6]}
+    report = validate_teams({1, 2, 3, 4, 5, 6}, teams)
+
+    assert not report.ok
+    assert report.dangling_leaders == [7]
+    assert report.dangling_members == [(5, 9)]
+    assert report.duplicate_memberships == {3: [1, 5], 4: [2, 4], 6: [7, 7]}
+    assert sorted(sorted(cycle) for cycle in report.cycles) == [[1, 2], [4]]
+    assert "leadership cycles" in str(report)
+
+
+def test_long_chains_and_cycles_do_not_recurse():
+    """
+    Test that deep hierarchies are validated iteratively, finding the single
+    cycle of a 100 000 leader ring.
+    """
+    count = 100_000
+    chain = validate_teams(range(count), {i: [i + 1] for i in range(count - 1)})
+    ring = validate_teams(range(count), {i: [(i + 1) % count] for i in range(count)})
+
+    assert chain.ok
+    assert len(ring.cycles) == 1 and sorted(ring.cycles[0]) == list(range(count))
+
+
+def test_integrity_error_carries_report():
+    """
+    Test that TeamIntegrityError is a ValueError exposing the report it describes.
+    """
+    report = validate_teams({1}, {1: [2]})
+
+    with pytest.raises(ValueError) as error:
+        raise TeamIntegrityError(report)
+    assert error.value.report is report
+    assert "unknown member ids" in str(error.value)